@@ -10,6 +10,10 @@ class Repository(ABC):
     def get(self, obj_id):
         pass
 
+    @abstractmethod
+    def get_many(self, obj_ids):
+        pass
+
     @abstractmethod
     def get_all(self):
         pass
@@ -37,6 +41,11 @@ class InMemoryRepository(Repository):
     def get(self, obj_id):
         return self._storage.get(obj_id)
 
+    def get_many(self, obj_ids):
+        """Return {id: obj} for the ids found, unknown ids are left out."""
+        return {obj_id: self._storage[obj_id]
+                for obj_id in obj_ids if obj_id in self._storage}
+
     def get_all(self):
         return list(self._storage.values())
 
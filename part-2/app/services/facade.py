@@ -103,6 +103,17 @@ class HBnBFacade:
         self.amenity_repo.add(amenity)
         return amenity
 
+    def _get_amenities(self, amenity_ids):
+        """Resolve amenity ids in one lookup, raise ValueError on unknown ids."""
+        if not isinstance(amenity_ids, list) or not all(isinstance(a, str) for a in amenity_ids):
+            raise ValueError("Invalid 'amenities': must be a list of IDs.")
+        amenity_ids = list(dict.fromkeys(amenity_ids))
+        found = self.amenity_repo.get_many(amenity_ids)
+        unknown = [a for a in amenity_ids if a not in found]
+        if unknown:
+            raise ValueError(f"Amenities not found: {', '.join(unknown)}")
+        return [found[a] for a in amenity_ids]
+
     def create_place(self, place_data):
         if place_data["price"] < 0:
             raise ValueError("Price must be a non-negative value.")
@@ -126,12 +137,7 @@ class HBnBFacade:
         place_obj.amenities = [] if not hasattr(place_obj, "amenities") else place_obj.amenities
 
         if "amenities" in place_data:
-            amenities = []
-            for amenity_id in place_data["amenities"]:
-                amenity_obj = self.amenity_repo.get(amenity_id)
-                if amenity_obj:
-                    amenities.append(amenity_obj)
-            place_obj.amenities = amenities
+            place_obj.amenities = self._get_amenities(place_data["amenities"])
 
         self.place_repo.add(place_obj)
         return place_obj
@@ -160,16 +166,11 @@ class HBnBFacade:
             new_owner = self.user_repo.get(data["owner_id"])
             if not new_owner:
                 raise ValueError("Owner not found.")
-        place.owner = new_owner
-        data.pop("owner_id")
+            place.owner = new_owner
+            data.pop("owner_id")
 
         if "amenities" in data:
-            new_amenities = []
-            for amenity_id in data["amenities"]:
-                amenity_obj = self.amenity_repo.get(amenity_id)
-                if amenity_obj:
-                    new_amenities.append(amenity_obj)
-            place.amenities = new_amenities
+            place.amenities = self._get_amenities(data["amenities"])
             data.pop("amenities")
 
         place.update(data)
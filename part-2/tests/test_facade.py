@@ -219,6 +219,23 @@ class TestHBnBFacade(unittest.TestCase):
             self.facade.create_place(place_data)
         self.assertIn("Owner not found", str(ctx.exception))
 
+    def test_create_place_unknown_amenity(self):
+        """Test Place with an amenity id that does not exist"""
+        wifi = self.facade.create_amenity({"name": "Wi-Fi"})
+        place_data = {
+            "title": "Unknown Amenity",
+            "description": "Amenity not found",
+            "price": 50.0,
+            "latitude": 48.8566,
+            "longitude": 2.3522,
+            "owner_id": self.user.id,
+            "amenities": [wifi.id, "non-existent-id"]
+        }
+        with self.assertRaises(ValueError) as ctx:
+            self.facade.create_place(place_data)
+        self.assertIn("non-existent-id", str(ctx.exception))
+        self.assertNotIn(wifi.id, str(ctx.exception))
+
     def test_get_place_not_found(self):
         """Test get_place with nonexistent id"""
         with self.assertRaises(ValueError) as ctx:
@@ -288,6 +305,10 @@ class TestHBnBFacade(unittest.TestCase):
         self.assertIn(wifi, updated_place.amenities)
         self.assertIn(pool, updated_place.amenities)
 
+        for amenities in ([1], [[wifi.id]], wifi.id):
+            with self.assertRaises(ValueError):
+                self.facade.update_place(place.id, {"amenities": amenities})
+
     # =========================
     # 4) TESTS FOR REVIEWS
     # =========================
@@ -13,13 +13,26 @@ db = SQLAlchemy()
 def create_app(config_name="development"):
 
     app = Flask(__name__)
-    app.config.from_object(config[config_name])
+    app.config.from_object(config.get(config_name, config_name))
     app.url_map.strict_slashes = False
+    CORS(
+        app,
+        origins=app.config.get('CORS_ORIGINS', []),
+        supports_credentials=True,
+        allow_headers=["Content-Type", "Authorization"],
+        expose_headers=["Authorization", "X-Query-Count", "Server-Timing"]
+    )
+
+    from app.persistence import ids
+    ids.configure(app.config)
 
     bcrypt.init_app(app)
     jwt.init_app(app)
     db.init_app(app)
 
+    from app.instrumentation import register_metrics, register_query_stats
+    register_query_stats(app)
+
     authorizations = {
         'Bearer': {
             'type': 'apiKey',
@@ -41,11 +54,34 @@ def create_app(config_name="development"):
     from app.api.v1.reviews   import api as reviews_ns
     from app.api.v1.amenities import api as amenities_ns
     from app.api.v1.auth      import api as auth_ns
+    from app.api.v1.cache     import api as cache_ns
 
     api.add_namespace(users_ns,     path='/api/v1/users')
     api.add_namespace(places_ns,    path='/api/v1/places')
     api.add_namespace(reviews_ns,   path='/api/v1/reviews')
     api.add_namespace(amenities_ns, path='/api/v1/amenities')
     api.add_namespace(auth_ns,      path='/api/v1/auth')
+    api.add_namespace(cache_ns,     path='/api/v1/cache')
+
+    from app.services import facade
+    from app.services.cache import create_cache
+    facade.cache = create_cache(app.config)
+    facade.principals = create_cache(app.config, 'AUTH_CACHE')
+    from app.services.hashing import create_hash_executor
+    # The facade outlives the app: stop the threads of the previous executor
+    previous, facade.hasher = facade.hasher, create_hash_executor(app.config)
+    previous.shutdown()
+    from app.services.blocklist import create_blocklist
+    facade.blocklist = create_blocklist(app.config)
+
+    @jwt.token_in_blocklist_loader
+    def token_is_revoked(jwt_header, jwt_payload):
+        return facade.is_token_revoked(jwt_payload['jti'])
+
+    if app.config.get('METRICS_ENABLED', True):
+        register_metrics(app)
+
+    from app.commands import register_commands
+    register_commands(app)
 
     return app
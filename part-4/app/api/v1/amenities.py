@@ -1,6 +1,10 @@
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask import request
+from flask_jwt_extended import jwt_required
 from app.services import facade
+from app.api.v1.identity import current_principal
+from app.api.v1.conditional import conditional
+from app.services.serializers import amenity_serializer
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -19,55 +23,89 @@ class AmenityList(Resource):
         Create a new amenity.
         Any authenticated user can do this.
     """
-        current_user = get_jwt_identity()
-        user = facade.get_user(current_user['id'])
+        user = current_principal()
         if not user:
             return {'message': 'User not found'}, 400
 
         amenity_data = api.payload
-        amenity_data["owner_id"] = user.id
+        amenity_data["owner_id"] = user['id']
 
         try:
             new_amenity = facade.create_amenity(amenity_data)
-            return {
-                'id': new_amenity.id,
-                'name': new_amenity.name
-            }, 201
+            return amenity_serializer.dump(new_amenity), 201
         except ValueError as e:
             return {'message': str(e)}, 400
 
+    @api.doc(params={'fields': 'Comma-separated fields to return (default: all)'})
     @api.response(200, 'List of amenities retrieved successfully')
+    @api.response(304, 'Amenities not modified')
+    @api.response(400, 'Unknown field')
     def get(self):
         """
         Retrieve all amenities.
         This endpoint is open to everyone.
         """
+        try:
+            fields = amenity_serializer.parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return {'message': str(e)}, 400
+
+        headers, not_modified = conditional(facade.get_version('amenity'), last_modified=False)
+        if not_modified:
+            return not_modified
+
         amenities = facade.get_all_amenities()
-        return [
-            {
-                'id': a.id,
-                'name': a.name
-            }
-            for a in amenities
-        ], 200
+        return amenity_serializer.dump_many(amenities, fields), 200, headers
+
+@api.route('/bulk')
+class AmenityBulk(Resource):
+    @api.expect([amenity_model])
+    @api.response(201, 'All amenities successfully created')
+    @api.response(207, 'Some amenities were rejected')
+    @api.response(400, 'Invalid input data')
+    @jwt_required()
+    def post(self):
+        """
+        Create many amenities in a single transaction.
+        Any authenticated user can do this.
+        """
+        user = current_principal()
+        if not user:
+            return {'message': 'User not found'}, 400
+
+        try:
+            created, errors = facade.create_amenities_bulk(request.json, owner_id=user['id'])
+        except ValueError as e:
+            return {'message': str(e)}, 400
+        status = 201 if not errors else (207 if created else 400)
+        return {'created': created, 'errors': errors}, status
 
 @api.route('/<string:amenity_id>')
 @api.param('amenity_id', 'The Amenity identifier')
 class AmenityResource(Resource):
+    @api.doc(params={'fields': 'Comma-separated fields to return (default: all)'})
     @api.response(200, 'Amenity details retrieved successfully')
+    @api.response(304, 'Amenity not modified')
+    @api.response(400, 'Unknown field')
     @api.response(404, 'Amenity not found')
     def get(self, amenity_id):
         """
         Get details of an amenity by its ID.
         Open to everyone.
         """
-        amenity = facade.get_amenity(amenity_id)
-        if not amenity:
+        try:
+            fields = amenity_serializer.parse_fields(request.args.get('fields'))
+        except ValueError as e:
+            return {'message': str(e)}, 400
+
+        entry = facade.get_entry('amenity', amenity_id, fields)
+        if entry is None:
             return {'error': 'Amenity not found'}, 404
-        return {
-            'id': amenity.id,
-            'name': amenity.name
-        }, 200
+        version, amenity = entry
+        headers, not_modified = conditional(version)
+        if not_modified:
+            return not_modified
+        return amenity, 200, headers
 
     @api.expect(amenity_model)
     @api.response(200, 'Amenity updated successfully')
@@ -79,8 +117,7 @@ class AmenityResource(Resource):
         Update an amenity's information.
         Any authenticated user can do this.
         """
-        current_user = get_jwt_identity()
-        user = facade.get_user(current_user['id'])
+        user = current_principal()
         if not user:
             return {'message': 'User not found'}, 400
 
@@ -89,10 +126,7 @@ class AmenityResource(Resource):
             updated_amenity = facade.update_amenity(amenity_id, amenity_data)
             if not updated_amenity:
                 return {'error': 'Amenity not found'}, 404
-            return {
-                'id': updated_amenity.id,
-                'name': updated_amenity.name
-            }, 200
+            return amenity_serializer.dump(updated_amenity), 200
         except ValueError as e:
             return {'message': str(e)}, 400
 
@@ -105,8 +139,7 @@ class AmenityResource(Resource):
         Delete an amenity by ID.
         The owner of the amenity or an admin can delete it.
         """
-        current_user = get_jwt_identity()  # ex: {"id": "...", "is_admin": True/False}
-        user = facade.get_user(current_user["id"])
+        user = current_principal()  # ex: {"id": "...", "is_admin": True/False}
         if not user:
             return {"error": "User not found"}, 400
 
@@ -117,7 +150,7 @@ class AmenityResource(Resource):
 
         # Vérifier si l'utilisateur est admin ou propriétaire de l'amenity
         # => Pour cela, Amenity doit avoir un champ amenity_obj.owner_id ou un attribut amenity_obj.owner
-        if not (user.is_admin or amenity_obj.owner_id == user.id):
+        if not (user['is_admin'] or amenity_obj.owner_id == user['id']):
             return {"error": "Unauthorized action"}, 403
 
         success = facade.delete_amenity(amenity_id)
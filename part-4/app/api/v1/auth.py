@@ -1,6 +1,14 @@
+from datetime import datetime
+
+from flask import current_app, request
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import (create_access_token, create_refresh_token,
+                                decode_token, get_jwt, get_jwt_identity,
+                                jwt_required)
+from flask_jwt_extended.exceptions import JWTExtendedException
+from jwt.exceptions import PyJWTError
 from app.services import facade
+from app.services.hashing import ExecutorBusy
 
 api = Namespace('auth', description='Authentication operations')
 
@@ -10,29 +18,98 @@ login_model = api.model('Login', {
     'password': fields.String(required=True, description='User password')
 })
 
+logout_model = api.model('Logout', {
+    'refresh_token': fields.String(description='Refresh token to revoke as well')
+})
+
+
+def access_token_response(principal):
+    """New access token for {'id', 'is_admin'}."""
+    expires = current_app.config['JWT_ACCESS_TOKEN_EXPIRES']
+    return {
+        'access_token': create_access_token(identity=principal),
+        'token_type': 'Bearer',  # Indique le type de token
+        'expires_in': int(expires.total_seconds())
+    }
+
+
+def revoke(payload):
+    """Revoke a decoded token until its own expiry."""
+    facade.revoke_token(payload['jti'], datetime.utcfromtimestamp(payload['exp']))
+
 
 @api.route('/login')
 class Login(Resource):
     @api.expect(login_model, validate=True)
     @api.response(200, 'Login successful')
     @api.response(401, 'Invalid credentials')
+    @api.response(503, 'Too many concurrent logins')
     def post(self):
         """
         User login.
+        Returns a short-lived access token and a refresh token for /refresh.
         """
         login_data = api.payload
-        user = facade.get_user_by_email(login_data['email'])
-        if user and user.verify_password(login_data['password']):
-            access_token = create_access_token(
-                identity={'id': user.id, 'is_admin': user.is_admin})
-            return {
-                'access_token': access_token,
-                'token_type': 'Bearer',  # Indique le type de token
-                'expires_in': 3600  # Expiration du token (optionnel)
-            }, 200
+        try:
+            user = facade.authenticate(login_data['email'], login_data['password'])
+        except ExecutorBusy as e:
+            return {'message': str(e)}, 503, {'Retry-After': '1'}
+        if user:
+            principal = {'id': user.id, 'is_admin': user.is_admin}
+            response = access_token_response(principal)
+            response['refresh_token'] = create_refresh_token(identity=principal)
+            return response, 200
         return {'message': 'Invalid credentials'}, 401
 
 
+@api.route('/refresh')
+class Refresh(Resource):
+    @api.doc(security='Bearer')
+    @api.response(200, 'New access token issued')
+    @api.response(401, 'Invalid, expired or revoked refresh token')
+    @jwt_required(refresh=True)
+    def post(self):
+        """
+        Exchange the refresh token (Authorization header) for a new access
+        token, without checking the password again.
+        """
+        principal = facade.get_principal(get_jwt_identity()['id'])
+        if not principal:
+            return {'message': 'User not found'}, 401
+        return access_token_response(principal), 200
+
+
+@api.route('/logout')
+class Logout(Resource):
+    @api.doc(security='Bearer')
+    @api.expect(logout_model)
+    @api.response(200, 'Tokens revoked')
+    @api.response(400, 'Invalid refresh_token')
+    @jwt_required(verify_type=False)
+    def post(self):
+        """
+        Revoke the token of the Authorization header and, if given, the
+        refresh_token of the body.
+        """
+        refresh_token = (request.get_json(silent=True) or {}).get('refresh_token')
+        refresh_payload = None
+        if refresh_token:
+            try:
+                refresh_payload = decode_token(refresh_token)
+            except (JWTExtendedException, PyJWTError):
+                return {'message': 'Invalid refresh_token'}, 400
+            # Only a refresh token of the caller's own session can be revoked
+            owner = refresh_payload.get(current_app.config['JWT_IDENTITY_CLAIM'])
+            if (refresh_payload.get('type') != 'refresh' or not isinstance(owner, dict)
+                    or owner.get('id') != get_jwt_identity()['id']):
+                return {'message': 'Invalid refresh_token'}, 400
+
+        revoke(get_jwt())
+        if refresh_payload:
+            revoke(refresh_payload)
+        return {'message': 'Successfully logged out'}, 200
+
+
 @api.route('/protected')
 class ProtectedResource(Resource):
     @api.doc(security='Bearer')
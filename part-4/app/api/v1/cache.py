@@ -0,0 +1,20 @@
+from flask_restx import Namespace, Resource
+from flask_jwt_extended import jwt_required, get_jwt_identity
+from app.services import facade
+
+api = Namespace('cache', description='Cache statistics')
+
+
+@api.route('/stats')
+class CacheStats(Resource):
+    @api.response(200, 'Cache counters retrieved successfully')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def get(self):
+        """
+        Hit/miss counters of the entity cache of this worker.
+        """
+        current_user = get_jwt_identity()
+        if not current_user.get('is_admin'):
+            return {'error': 'Admin privileges required'}, 403
+        return facade.cache.stats(), 200
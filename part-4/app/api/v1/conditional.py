@@ -0,0 +1,59 @@
+"""
+HTTP conditional GET (ETag / Last-Modified / 304 Not Modified).
+
+A resource version is the tuple returned by HBnBFacade.get_version():
+row count and updated_at timestamps, read with aggregate queries.
+Entities are validated with the version their cache entry was stored
+with (HBnBFacade.get_entry()), so a revalidation served from the cache
+costs no query and sends no body.
+
+Collections whose version would aggregate over every matching row (and
+their embedded owners and amenities) are validated by payload_version()
+of the body actually served instead: a 304 then only saves the
+transfer, but a page costs no more than its own query.
+"""
+import hashlib
+from datetime import datetime, timezone
+
+from flask import Response, request
+from werkzeug.http import http_date, quote_etag
+
+
+def conditional(version, last_modified=True):
+    """
+    Return (headers, response): the validator headers to send with the
+    200, and a 304 response when the request's If-None-Match or
+    If-Modified-Since already matches the version (None otherwise).
+    A None version (representation not covered by it) sends no validators.
+    Collections pass last_modified=False: deleting a row that is not the
+    newest one changes their row count, not their latest timestamp, so
+    only the ETag can tell.
+    """
+    if version is None:
+        return {}, None
+    etag = hashlib.sha1(repr(version).encode()).hexdigest()
+    headers = {'ETag': quote_etag(etag)}
+
+    timestamps = [v for v in version if isinstance(v, datetime)] if last_modified else []
+    last_modified = None
+    if timestamps:
+        # updated_at is stored in naive UTC; HTTP dates have second precision
+        last_modified = max(timestamps).replace(microsecond=0, tzinfo=timezone.utc)
+        headers['Last-Modified'] = http_date(last_modified)
+
+    # If-None-Match takes precedence over If-Modified-Since (RFC 9110 13.2.2)
+    if request.if_none_match:
+        not_modified = request.if_none_match.contains_weak(etag)
+    elif request.if_modified_since and last_modified:
+        not_modified = last_modified <= request.if_modified_since
+    else:
+        not_modified = False
+
+    if not_modified:
+        return headers, Response(status=304, headers=headers)
+    return headers, None
+
+
+def payload_version(payload):
+    """Version of an already built response body: a digest of the body itself."""
+    return (hashlib.sha1(repr(payload).encode()).hexdigest(),)
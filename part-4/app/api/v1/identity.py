@@ -0,0 +1,12 @@
+from flask_jwt_extended import get_jwt_identity
+from app.services import facade
+
+
+def current_principal():
+    """
+    {'id', 'is_admin'} of the user behind the JWT, or None if the account
+    no longer exists. Served by the facade's principals cache instead of
+    a SELECT per request; deletes and role changes are seen right away
+    on this worker and within AUTH_CACHE_TTL_SECONDS on the others.
+    """
+    return facade.get_principal(get_jwt_identity()['id'])
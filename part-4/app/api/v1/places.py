@@ -1,7 +1,12 @@
+import math
 from flask_restx import Namespace, Resource, fields
 from flask import request
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from flask_jwt_extended import jwt_required
 from app.services import facade
+from app.api.v1.identity import current_principal
+from app.api.v1.streaming import ndjson_response, wants_ndjson
+from app.services.serializers import place_serializer, review_serializer
+from app.api.v1.conditional import conditional, payload_version
 
 api = Namespace('places', description='Public Place operations')
 
@@ -27,6 +32,55 @@ place_model = api.model('Place', {
     'amenities': fields.List(fields.String, required=True, description="List of amenities ID's")
 })
 
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+list_parser = api.parser()
+list_parser.add_argument('limit', type=int, location='args',
+                         help=f'Page size (max {MAX_PAGE_SIZE})')
+list_parser.add_argument('cursor', type=str, location='args',
+                         help='next_cursor returned by the previous page')
+list_parser.add_argument('min_price', type=float, location='args',
+                         help='Minimum price per night')
+list_parser.add_argument('max_price', type=float, location='args',
+                         help='Maximum price per night')
+list_parser.add_argument('amenities', type=str, location='args',
+                         help='Comma-separated amenity IDs, all required')
+for bound in ('min_lat', 'max_lat', 'min_lon', 'max_lon'):
+    list_parser.add_argument(bound, type=float, location='args',
+                             help='Bounding box limit')
+list_parser.add_argument('sort', type=str, location='args',
+                         help="'average_rating' (lowest first) or '-average_rating' (best first)")
+list_parser.add_argument('fields', type=str, location='args',
+                         help='Comma-separated fields to return (default: all)')
+list_parser.add_argument('include', type=str, location='args',
+                         help="Embedded resources to return: 'owner', 'amenities'")
+list_parser.add_argument('format', type=str, location='args',
+                         help="'ndjson' streams every matching place, one per line")
+
+FLOAT_FILTERS = ('min_price', 'max_price', 'min_lat', 'max_lat', 'min_lon', 'max_lon')
+
+
+def parse_place_filters(args):
+    """
+    Build the PlaceRepository filters from the query string.
+    Raises ValueError on malformed values.
+    """
+    filters = {}
+    for name in FLOAT_FILTERS:
+        if name in args:
+            try:
+                value = float(args[name])
+            except ValueError:
+                value = math.nan
+            # nan/inf parse as floats but would silently match nothing
+            if not math.isfinite(value):
+                raise ValueError(f"Invalid '{name}': must be a number.")
+            filters[name] = value
+    if 'amenities' in args:
+        filters['amenities'] = [a for a in args['amenities'].split(',') if a]
+    return filters
+
 
 @api.route('/')
 class PlaceList(Resource):
@@ -38,89 +92,188 @@ class PlaceList(Resource):
         """
         Create a new place.
         """
-        current_user = get_jwt_identity()
-        user = facade.get_user(current_user['id'])
+        user = current_principal()
         if not user:
             return {"message": "User not found"}, 400
 
         place_data = request.json
         try:
             place_obj = facade.create_place(place_data)
-            return {
-                "id": place_obj.id,
-                "title": place_obj.title,
-                "description": place_obj.description,
-                "price": place_obj.price,
-                "latitude": place_obj.latitude,
-                "longitude": place_obj.longitude,
-                "owner_id": place_obj.owner.id,
-                "owner": {
-                    "id": place_obj.owner.id,
-                    "first_name": place_obj.owner.first_name,
-                    "last_name": place_obj.owner.last_name,
-                    "email": place_obj.owner.email
-                },
-                "amenities": [{"id": a.id, "name": a.name} for a in place_obj.amenities]
-            }, 201
+            return place_serializer.dump(place_obj), 201
         except ValueError as e:
             return {"message": str(e)}, 400
 
+    @api.expect(list_parser)
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(304, 'Places not modified')
+    @api.response(400, 'Invalid pagination parameters')
+    def get(self):
+        """
+        Retrieve a list of places, including owner and amenities information.
+        Optional filters: price range, required amenities, bounding box.
+        Optional sort: average_rating or -average_rating.
+        Optional fields / include: sparse fieldset, e.g. fields=id,title,price
+        selects just those columns and loads no relationship.
+        With 'limit' and/or 'cursor', returns one page and its next_cursor.
+        With format=ndjson (or Accept: application/x-ndjson), streams every
+        matching place, one JSON object per line; limit/cursor are ignored.
+        """
+        args = request.args
+        try:
+            filters = parse_place_filters(args)
+            fields = place_serializer.parse_fields(args.get('fields'), args.get('include'))
+        except ValueError as e:
+            return {"message": str(e)}, 400
+
+        sort = args.get('sort')
+
+        if wants_ndjson():
+            try:
+                places = facade.iter_places(filters, sort, fields)
+            except ValueError as e:
+                return {"message": str(e)}, 400
+            return ndjson_response(places, place_serializer, fields)
+
+        if 'limit' not in args and 'cursor' not in args:
+            try:
+                places = facade.get_all_places(filters, sort, fields)
+            except ValueError as e:
+                return {"message": str(e)}, 400
+            body = place_serializer.dump_many(places, fields)
+        else:
+            try:
+                limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+            except ValueError:
+                return {"message": "Invalid 'limit': must be an integer."}, 400
+            if not (1 <= limit <= MAX_PAGE_SIZE):
+                return {"message": f"Invalid 'limit': must be between 1 and {MAX_PAGE_SIZE}."}, 400
+
+            try:
+                places, next_cursor = facade.get_places_page(
+                    limit, args.get('cursor'), filters, sort, fields)
+            except ValueError as e:
+                return {"message": str(e)}, 400
+            body = {
+                "places": place_serializer.dump_many(places, fields),
+                "next_cursor": next_cursor
+            }
+
+        # Validated by the rows served, not by aggregates over every match
+        headers, not_modified = conditional(payload_version(body))
+        if not_modified:
+            return not_modified
+        return body, 200, headers
+
+
+bulk_result_model = api.model('BulkResult', {
+    'created': fields.List(fields.Raw, description='[{index, id}] of the created items'),
+    'errors': fields.List(fields.Raw, description='[{index, message}] of the rejected items')
+})
+
+
+@api.route('/bulk')
+class PlaceBulk(Resource):
+    @api.expect([place_model])
+    @api.response(201, 'All places successfully created', bulk_result_model)
+    @api.response(207, 'Some places were rejected', bulk_result_model)
+    @api.response(400, 'Invalid input data')
+    @jwt_required()
+    def post(self):
+        """
+        Create many places in a single transaction.
+        owner_id defaults to the current user.
+        """
+        user = current_principal()
+        if not user:
+            return {"message": "User not found"}, 400
+
+        items = request.json
+        if isinstance(items, list):
+            for item in items:
+                if isinstance(item, dict):
+                    item.setdefault("owner_id", user['id'])
+        try:
+            created, errors = facade.create_places_bulk(items)
+        except ValueError as e:
+            return {"message": str(e)}, 400
+        status = 201 if not errors else (207 if created else 400)
+        return {"created": created, "errors": errors}, status
+
+
+nearby_parser = api.parser()
+nearby_parser.add_argument('lat', type=float, required=True, location='args',
+                           help='Latitude of the center')
+nearby_parser.add_argument('lon', type=float, required=True, location='args',
+                           help='Longitude of the center')
+nearby_parser.add_argument('radius_km', type=float, required=True, location='args',
+                           help='Search radius in kilometers')
+nearby_parser.add_argument('limit', type=int, location='args',
+                           help=f'Maximum number of places (max {MAX_PAGE_SIZE})')
+
+
+@api.route('/nearby')
+class PlaceNearby(Resource):
+    @api.expect(nearby_parser)
+    @api.response(200, 'Places around the point, nearest first')
+    @api.response(400, 'Invalid search parameters')
     def get(self):
         """
-        Retrieve a list of all places, including owner and amenities information.
-        """
-        places = facade.get_all_places()
-        result = []
-        for p in places:
-            result.append({
-                "id": p.id,
-                "title": p.title,
-                "description": p.description,
-                "price": p.price,
-                "latitude": p.latitude,
-                "longitude": p.longitude,
-                "owner_id": p.owner.id,
-                "owner": {
-                    "id": p.owner.id,
-                    "first_name": p.owner.first_name,
-                    "last_name": p.owner.last_name,
-                    "email": p.owner.email
-                },
-                "amenities": [{"id": a.id, "name": a.name} for a in p.amenities]
-            })
-        return result, 200
+        Retrieve places within radius_km of (lat, lon), sorted by distance.
+        """
+        args = request.args
+        try:
+            lat = float(args['lat'])
+            lon = float(args['lon'])
+            radius_km = float(args['radius_km'])
+            limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+        except KeyError as e:
+            return {"message": f"Missing required parameter: {e.args[0]}"}, 400
+        except ValueError:
+            return {"message": "Invalid 'lat', 'lon', 'radius_km' or 'limit'."}, 400
+        if not (1 <= limit <= MAX_PAGE_SIZE):
+            return {"message": f"Invalid 'limit': must be between 1 and {MAX_PAGE_SIZE}."}, 400
+
+        try:
+            results = facade.get_places_nearby(lat, lon, radius_km, limit)
+        except ValueError as e:
+            return {"message": str(e)}, 400
+
+        places = []
+        for place, distance in results:
+            data = place_serializer.dump(place)
+            data["distance_km"] = round(distance, 3)
+            places.append(data)
+        return places, 200
 
 
 @api.route('/<string:place_id>')
 @api.param('place_id', 'The Place identifier')
 class PlaceResource(Resource):
+    @api.doc(params={'fields': 'Comma-separated fields to return (default: all)',
+                     'include': 'Embedded resources to return'})
     @api.response(200, 'Place details retrieved successfully')
+    @api.response(304, 'Place not modified')
+    @api.response(400, 'Unknown field')
     @api.response(404, 'Place not found')
     def get(self, place_id):
         """
         Retrieve details of a place by its ID.
+        Supports If-None-Match / If-Modified-Since.
         """
-        p = facade.get_place(place_id)
-        if not p:
-            return {"message": "Place not found"}, 404
+        try:
+            fields = place_serializer.parse_fields(
+                request.args.get('fields'), request.args.get('include'))
+        except ValueError as e:
+            return {"message": str(e)}, 400
 
-        return {
-            "id": p.id,
-            "title": p.title,
-            "description": p.description,
-            "price": p.price,
-            "latitude": p.latitude,
-            "longitude": p.longitude,
-            "owner_id": p.owner.id,
-            "owner": {
-                "id": p.owner.id,
-                "first_name": p.owner.first_name,
-                "last_name": p.owner.last_name,
-                "email": p.owner.email
-            },
-            "amenities": [{"id": a.id, "name": a.name} for a in p.amenities]
-        }, 200
+        entry = facade.get_entry('place', place_id, fields)
+        if entry is None:
+            return {"message": "Place not found"}, 404
+        version, place = entry
+        headers, not_modified = conditional(version)
+        if not_modified:
+            return not_modified
+        return place, 200, headers
 
     @api.expect(place_model)
     @api.response(200, 'Place updated successfully')
@@ -131,8 +284,7 @@ class PlaceResource(Resource):
         """
         Update a place's information.
         """
-        current_user = get_jwt_identity()
-        user = facade.get_user(current_user['id'])
+        user = current_principal()
         if not user:
             return {"message": "User not found"}, 400
 
@@ -141,22 +293,7 @@ class PlaceResource(Resource):
             updated = facade.update_place(place_id, place_data)
             if not updated:
                 return {"message": "Place not found"}, 404
-            return {
-                "id": updated.id,
-                "title": updated.title,
-                "description": updated.description,
-                "price": updated.price,
-                "latitude": updated.latitude,
-                "longitude": updated.longitude,
-                "owner_id": updated.owner.id,
-                "owner": {
-                    "id": updated.owner.id,
-                    "first_name": updated.owner.first_name,
-                    "last_name": updated.owner.last_name,
-                    "email": updated.owner.email
-                },
-                "amenities": [{"id": a.id, "name": a.name} for a in updated.amenities]
-            }, 200
+            return place_serializer.dump(updated), 200
         except ValueError as e:
             return {"message": str(e)}, 400
         except Exception as e:
@@ -171,9 +308,7 @@ class PlaceResource(Resource):
         Delete a place by ID.
         The owner of the place or an admin can delete it.
         """
-        current_user = get_jwt_identity(
-        )  # renvoie un dict, ex: {'id': '...', 'is_admin': True/False}
-        user = facade.get_user(current_user['id'])
+        user = current_principal()  # ex: {'id': '...', 'is_admin': True/False}
         if not user:
             return {"error": "User not found"}, 400
 
@@ -183,7 +318,7 @@ class PlaceResource(Resource):
             return {"message": "Place not found"}, 404
 
         # Vérifie si l'utilisateur est admin ou le propriétaire de la place
-        if not (user.is_admin or (place_obj.owner.id == current_user['id'])):
+        if not (user['is_admin'] or place_obj.owner_id == user['id']):
             return {"error": "Unauthorized action"}, 403
 
         success = facade.delete_place(place_id)
@@ -191,3 +326,34 @@ class PlaceResource(Resource):
             return {"message": "Place deleted successfully"}, 200
         else:
             return {"message": "Place not found"}, 404
+
+
+@api.route('/<string:place_id>/reviews')
+@api.param('place_id', 'The Place identifier')
+class PlaceReviewList(Resource):
+    @api.doc(params={'fields': 'Comma-separated fields to return (default: all)',
+                     'include': 'Embedded resources to return'})
+    @api.response(200, 'List of reviews for the place retrieved successfully')
+    @api.response(304, 'Reviews not modified')
+    @api.response(400, 'Unknown field')
+    @api.response(404, 'Place not found')
+    def get(self, place_id):
+        """
+        Retrieve all reviews of a place.
+        """
+        try:
+            fields = review_serializer.parse_fields(
+                request.args.get('fields'), request.args.get('include'))
+        except ValueError as e:
+            return {"message": str(e)}, 400
+
+        if facade.get_version('place', place_id) is None:
+            return {"message": "Place not found"}, 404
+        version = facade.get_version('review', filters={'place_id': place_id})
+        headers, not_modified = conditional(
+            version if review_serializer.covers(fields) else None, last_modified=False)
+        if not_modified:
+            return not_modified
+
+        reviews = facade.get_reviews_by_place(place_id, fields)
+        return review_serializer.dump_many(reviews, fields), 200, headers
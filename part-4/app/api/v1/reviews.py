@@ -2,6 +2,9 @@ from flask_restx import Namespace, Resource, fields
 from flask import request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services import facade
+from app.api.v1.conditional import conditional
+from app.services.serializers import review_serializer
+from app.api.v1.streaming import ndjson_response, wants_ndjson
 
 api = Namespace('reviews', description='Review operations')
 
@@ -28,52 +31,95 @@ class ReviewList(Resource):
 
         try:
             review_obj = facade.create_review(data)
-            return {
-                "id": review_obj.id,
-                "text": review_obj.text,
-                "rating": review_obj.rating,
-                "user_id": review_obj.user.id,
-                "place_id": review_obj.place.id
-            }, 201
+            return review_serializer.dump(review_obj), 201
         except Exception as e:
             return {'message': str(e)}, 400
 
+    @api.doc(params={'fields': 'Comma-separated fields to return (default: all)',
+                     'include': "Embedded resources to return: 'user', 'place'",
+                     'format': "'ndjson' streams the reviews, one per line"})
     @api.response(200, 'List of reviews retrieved successfully')
+    @api.response(304, 'Reviews not modified')
+    @api.response(400, 'Unknown field')
     def get(self):
         """
         Retrieve a list of all reviews.
+        With format=ndjson (or Accept: application/x-ndjson), streams them
+        one JSON object per line instead of building the whole list.
         """
-        reviews = facade.get_all_reviews()
-        return [
-            {
-                "id": r.id,
-                "text": r.text,
-                "rating": r.rating,
-                "user_id": r.user.id,
-                "place_id": r.place.id
-            }
-            for r in reviews
-        ], 200
+        try:
+            fields = review_serializer.parse_fields(
+                request.args.get('fields'), request.args.get('include'))
+        except ValueError as e:
+            return {'message': str(e)}, 400
+
+        if wants_ndjson():
+            return ndjson_response(facade.iter_reviews(fields), review_serializer, fields)
+
+        # Embedded users/places are not part of the review version
+        headers, not_modified = conditional(
+            facade.get_version('review') if review_serializer.covers(fields) else None,
+            last_modified=False)
+        if not_modified:
+            return not_modified
+
+        reviews = facade.get_all_reviews(fields)
+        return review_serializer.dump_many(reviews, fields), 200, headers
+
+
+@api.route('/bulk')
+class ReviewBulk(Resource):
+    @api.expect([review_model])
+    @api.response(201, 'All reviews successfully created')
+    @api.response(207, 'Some reviews were rejected')
+    @api.response(400, 'Invalid input data')
+    @jwt_required()
+    def post(self):
+        """
+        Create many reviews in a single transaction.
+        The current user is the author of every review.
+        """
+        current_user = get_jwt_identity()
+        items = request.json
+        if isinstance(items, list):
+            for item in items:
+                if isinstance(item, dict):
+                    item['user_id'] = current_user["id"]
+        try:
+            created, errors = facade.create_reviews_bulk(items)
+        except ValueError as e:
+            return {'message': str(e)}, 400
+        status = 201 if not errors else (207 if created else 400)
+        return {'created': created, 'errors': errors}, status
 
 
 @api.route('/<review_id>')
 class ReviewResource(Resource):
+    @api.doc(params={'fields': 'Comma-separated fields to return (default: all)',
+                     'include': "Embedded resources to return: 'user', 'place'"})
     @api.response(200, 'Review details retrieved successfully')
+    @api.response(304, 'Review not modified')
+    @api.response(400, 'Unknown field')
     @api.response(404, 'Review not found')
     def get(self, review_id):
         """
         Retrieve review details by ID.
         """
-        review_obj = facade.get_review(review_id)
-        if review_obj:
-            return {
-                "id": review_obj.id,
-                "text": review_obj.text,
-                "rating": review_obj.rating,
-                "user_id": review_obj.user.id,
-                "place_id": review_obj.place.id
-            }, 200
-        return {'message': 'Review not found'}, 404
+        try:
+            fields = review_serializer.parse_fields(
+                request.args.get('fields'), request.args.get('include'))
+        except ValueError as e:
+            return {'message': str(e)}, 400
+
+        entry = facade.get_entry('review', review_id, fields)
+        if entry is None:
+            return {'message': 'Review not found'}, 404
+        # Embedded user and place are not part of the review version (None)
+        version, review = entry
+        headers, not_modified = conditional(version)
+        if not_modified:
+            return not_modified
+        return review, 200, headers
 
     @api.expect(review_model)
     @api.response(200, 'Review updated successfully')
@@ -97,13 +143,7 @@ class ReviewResource(Resource):
         try:
             review_obj = facade.update_review(review_id, data)
             if review_obj:
-                return {
-                    "id": review_obj.id,
-                    "text": review_obj.text,
-                    "rating": review_obj.rating,
-                    "user_id": review_obj.user.id,
-                    "place_id": review_obj.place.id
-                }, 200
+                return review_serializer.dump(review_obj), 200
             else:
                 return {'message': 'Review not found'}, 404
         except Exception as e:
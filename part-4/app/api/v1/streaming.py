@@ -0,0 +1,38 @@
+"""
+Streaming collection exports as NDJSON (one JSON object per line).
+
+Rows are serialized as the database cursor produces them and written in
+small chunks, so exporting a whole table does not build the payload, or
+the list of instances, in memory.
+"""
+import json
+
+from flask import Response, request, stream_with_context
+
+NDJSON = 'application/x-ndjson'
+# Lines per chunk written to the socket
+CHUNK_LINES = 100
+
+
+def wants_ndjson():
+    """True for ?format=ndjson or an Accept header preferring NDJSON."""
+    if request.args.get('format') == 'ndjson':
+        return True
+    return request.accept_mimetypes.best == NDJSON
+
+
+def ndjson_response(rows, serializer, fields=None):
+    """Stream serializer.dump() of each row, one line per row."""
+    fieldset = serializer.fieldset(fields)
+
+    def generate():
+        lines = []
+        for obj in rows:
+            lines.append(json.dumps({name: get(obj) for name, get in fieldset}))
+            if len(lines) >= CHUNK_LINES:
+                yield '\n'.join(lines) + '\n'
+                lines = []
+        if lines:
+            yield '\n'.join(lines) + '\n'
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON)
@@ -1,6 +1,9 @@
+from flask import request
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.services import facade
+from app.api.v1.conditional import conditional
+from app.services.serializers import user_serializer
 from config import DevelopmentConfig
 
 api = Namespace('users', description='User operations')
@@ -33,17 +36,14 @@ class UserList(Resource):
 
         try:
             new_user = facade.create_user(user_data)
-            return {
-                'id': new_user.id,
-                'first_name': new_user.first_name,
-                'last_name': new_user.last_name,
-                'email': new_user.email,
-                'is_admin': new_user.is_admin
-            }, 201
+            return user_serializer.dump(new_user), 201
         except Exception as e:
             return {'error': str(e)}, 400
 
+    @api.doc(params={'fields': 'Comma-separated fields to return (default: all)',
+                     'include': "Embedded resources to return: 'places'"})
     @api.response(200, 'List of users retrieved successfully')
+    @api.response(400, 'Unknown field')
     @jwt_required()
     def get(self):
         """
@@ -53,28 +53,42 @@ class UserList(Resource):
         if not current_user.get('is_admin'):
             return {'error': 'Admin privileges required'}, 403
 
-        users = facade.get_all_users()
+        try:
+            fields = user_serializer.parse_fields(
+                request.args.get('fields'), request.args.get('include'))
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        users = facade.get_all_users(fields)
         return users, 200
 
 
 @api.route('/<user_id>')
 class UserResource(Resource):
+    @api.doc(params={'fields': 'Comma-separated fields to return (default: all)',
+                     'include': "Embedded resources to return: 'places'"})
     @api.response(200, 'User details retrieved successfully')
+    @api.response(304, 'User not modified')
+    @api.response(400, 'Unknown field')
     @api.response(404, 'User not found')
     def get(self, user_id):
         """
         Retrieve user details by ID.
         """
-        user = facade.get_user(user_id)
-        if not user:
+        try:
+            fields = user_serializer.parse_fields(
+                request.args.get('fields'), request.args.get('include'))
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        entry = facade.get_entry('user', user_id, fields)
+        if entry is None:
             return {'error': 'User not found'}, 404
-        return {
-            'id': user.id,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'email': user.email,
-            'is_admin': user.is_admin
-        }, 200
+        # Embedded places are not part of the user version (None)
+        version, user = entry
+        headers, not_modified = conditional(version)
+        if not_modified:
+            return not_modified
+        return user, 200, headers
 
     @api.expect(user_model)
     @api.response(200, 'User updated successfully')
@@ -96,12 +110,7 @@ class UserResource(Resource):
             updated_user = facade.update_user(user_id, user_data)
             if not updated_user:
                 return {'error': 'User not found'}, 404
-            return {
-                'id': updated_user.id,
-                'first_name': updated_user.first_name,
-                'last_name': updated_user.last_name,
-                'email': updated_user.email
-            }, 200
+            return user_serializer.dump(updated_user), 200
         except Exception as e:
             return {'error': str(e)}, 400
 
@@ -0,0 +1,85 @@
+import logging
+import random
+import time
+
+import click
+from flask import Flask
+
+
+def register_commands(app: Flask):
+    """Attach the maintenance commands to the `flask` CLI."""
+
+    @app.cli.command('recompute-ratings')
+    def recompute_ratings():
+        """Rebuild review_count and rating_sum of every place from the reviews."""
+        from app.services import facade
+        count = facade.recompute_place_ratings()
+        click.echo(f"Recomputed rating aggregates of {count} places.")
+
+    @app.cli.command('purge-revoked-tokens')
+    def purge_revoked_tokens():
+        """Delete the revocations of tokens that have expired anyway."""
+        from app.services import facade
+        count = facade.purge_revoked_tokens()
+        click.echo(f"Purged {count} expired revoked tokens.")
+
+    @app.cli.command('db-upgrade')
+    def db_upgrade():
+        """Create missing tables and run the pending schema migrations."""
+        from app.persistence import migrations
+        ran = migrations.upgrade()
+        click.echo(f"Applied migrations: {', '.join(map(str, ran))}." if ran
+                   else "Database schema is up to date.")
+
+    @app.cli.command('db-status')
+    def db_status():
+        """List the schema migrations and when they were applied."""
+        from app.persistence import migrations
+        for version, name, applied_at in migrations.status():
+            click.echo(f"{version:04d} {name}: {applied_at or 'pending'}")
+
+    @app.cli.command('seed')
+    @click.option('--places', default=1000, show_default=True, type=click.IntRange(min=0),
+                  help='Places to create.')
+    @click.option('--users', type=click.IntRange(min=0),
+                  help='Users to create (default: places / 10).')
+    @click.option('--amenities', default=30, show_default=True, type=click.IntRange(min=0),
+                  help='Amenities to create.')
+    @click.option('--amenities-per-place', default=3, show_default=True,
+                  type=click.IntRange(min=0))
+    @click.option('--reviews-per-place', default=3, show_default=True,
+                  type=click.IntRange(min=0))
+    @click.option('--password', default='password', show_default=True,
+                  help='Password of every generated user.')
+    @click.option('--seed', 'random_seed', type=int, help='Random seed, for repeatable data.')
+    @click.option('--batch-size', default=10000, show_default=True, type=click.IntRange(min=1),
+                  help='Rows per insert and transaction.')
+    def seed(places, users, amenities, amenities_per_place, reviews_per_place,
+             password, random_seed, batch_size):
+        """Fill the database with a synthetic dataset of the given size."""
+        if places and users == 0:
+            raise click.BadParameter("places need at least one user to own them.",
+                                     param_hint="'--users'")
+        from app.persistence import migrations
+        from app.services import facade
+        from app.services.seed import Seeder
+        migrations.upgrade()
+
+        def progress(table, done, total):
+            if done == total or done % (batch_size * 10) == 0:
+                click.echo(f"  {table}: {done}/{total}")
+
+        started = time.perf_counter()
+        seeder = Seeder(facade, password, random.Random(random_seed), batch_size)
+        # Batch inserts are slow statements by design
+        sql_logger = logging.getLogger('app.sql')
+        level = sql_logger.level
+        sql_logger.setLevel(logging.ERROR)
+        try:
+            counts = seeder.run(places, users, amenities, amenities_per_place,
+                                reviews_per_place, progress)
+        finally:
+            sql_logger.setLevel(level)
+        click.echo(f"Seeded {sum(counts.values())} rows in "
+                   f"{time.perf_counter() - started:.1f}s: "
+                   + ", ".join(f"{n} {table}" for table, n in counts.items()) + ".")
@@ -0,0 +1,147 @@
+"""
+Per-request SQL instrumentation and the /metrics endpoint.
+
+Cursor execution events of the app's engines count the statements run
+while serving a request and the time spent in them. Every response then
+carries:
+
+    X-Query-Count: 3
+    Server-Timing: db;dur=1.8;desc="3 queries", app;dur=7.4
+
+and a statement slower than SLOW_QUERY_MS is logged on the 'app.sql'
+logger with the endpoint that ran it. Streamed responses send their
+headers before the rows are fetched, so only the queries run up to then
+are counted in the headers.
+
+register_metrics() feeds app/services/metrics.py: requests per route,
+latency, requests in flight, pool checkout time and cache counters.
+"""
+import logging
+import time
+
+from flask import Flask, Response, g, has_request_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger('app.sql')
+
+# Key in Connection.info of the start times of the running statements
+_STARTED_KEY = 'query_stats_started'
+
+
+def register_query_stats(app: Flask):
+    """Instrument the engines of app and add the headers to its responses."""
+    from app import db
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_STARTED_KEY, []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (time.perf_counter() - conn.info[_STARTED_KEY].pop()) * 1000
+        if not has_request_context():
+            endpoint = None
+        else:
+            endpoint = f"{request.method} {request.path}"
+            g.query_count = g.get('query_count', 0) + 1
+            g.query_ms = g.get('query_ms', 0.0) + elapsed_ms
+        slow_ms = app.config.get('SLOW_QUERY_MS')
+        if slow_ms is not None and elapsed_ms >= slow_ms:
+            logger.warning("Slow query (%.1f ms) in %s: %s",
+                           elapsed_ms, endpoint or 'no request', statement)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+            event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+
+    @app.before_request
+    def reset_query_stats():
+        # g outlives the request when an app context was already pushed
+        g.query_count = 0
+        g.query_ms = 0.0
+        g.request_started = time.perf_counter()
+
+    if not app.config.get('QUERY_STATS_HEADERS', True):
+        return
+
+    @app.after_request
+    def add_query_headers(response):
+        count = g.get('query_count', 0)
+        db_ms = g.get('query_ms', 0.0)
+        app_ms = (time.perf_counter() - g.get('request_started', time.perf_counter())) * 1000
+        response.headers['X-Query-Count'] = str(count)
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={db_ms:.1f};desc="{count} queries", app;dur={app_ms:.1f}')
+        return response
+
+
+def _time_pool_checkout(engine):
+    """Observe DB_POOL_CHECKOUT around engine.pool.connect()."""
+    from app.services.metrics import DB_POOL_CHECKOUT
+    connect = engine.pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            DB_POOL_CHECKOUT.observe(time.perf_counter() - started)
+
+    engine.pool.connect = timed_connect
+
+
+def _cache_samples():
+    from app.services import facade
+    hits, misses = {}, {}
+    for name, cache in (('entity', facade.cache), ('principals', facade.principals)):
+        stats = cache.stats()
+        hits[f'hbnb_cache_hits_total{{cache="{name}"}}'] = stats['hits']
+        misses[f'hbnb_cache_misses_total{{cache="{name}"}}'] = stats['misses']
+    return [('hbnb_cache_hits_total', 'counter', 'Cache lookups served from the cache', hits),
+            ('hbnb_cache_misses_total', 'counter', 'Cache lookups that missed', misses)]
+
+
+def register_metrics(app: Flask):
+    """Record the request metrics of app and serve them on /metrics."""
+    from app import db
+    from app.services.metrics import (HTTP_IN_FLIGHT, HTTP_LATENCY, HTTP_REQUESTS,
+                                      add_hit_ratios, registry, render)
+
+    registry.configure(app.config)
+    registry.set_collector('cache', _cache_samples)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            _time_pool_checkout(engine)
+            # dispose() replaces the pool, e.g. in a forked worker
+            event.listen(engine, 'engine_disposed', _time_pool_checkout)
+
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_started = time.perf_counter()
+        HTTP_IN_FLIGHT.inc()
+
+    @app.after_request
+    def record_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def record_request_metrics(exc):
+        # Runs after a streamed body is sent, on errors too
+        if 'metrics_started' not in g:
+            return
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        status = 500 if exc is not None else g.get('metrics_status', 500)
+        HTTP_IN_FLIGHT.dec()
+        HTTP_REQUESTS.inc(request.method, route, str(status))
+        HTTP_LATENCY.observe(time.perf_counter() - g.pop('metrics_started'),
+                             request.method, route)
+        registry.maybe_flush()
+
+    def metrics():
+        """Prometheus scrape endpoint."""
+        return Response(render(add_hit_ratios(registry.collect())),
+                        mimetype='text/plain; version=0.0.4')
+
+    app.add_url_rule('/metrics', 'metrics', metrics)
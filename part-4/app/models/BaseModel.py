@@ -1,13 +1,12 @@
 from app import db
-import uuid
+from app.persistence.ids import UUIDString, new_id
 from datetime import datetime
 
 
 class BaseModel(db.Model):
     __abstract__ = True  # This ensures SQLAlchemy does not create a table for BaseModel
 
-    id = db.Column(db.String(36), primary_key=True,
-                   default=lambda: str(uuid.uuid4()))
+    id = db.Column(UUIDString, primary_key=True, default=new_id)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -21,7 +20,8 @@ class BaseModel(db.Model):
 
     def save(self):
         """Update the 'updated_at' timestamp when the object is modified."""
-        self.updated_at = datetime.now()
+        # Naive UTC, like the column default and onupdate
+        self.updated_at = datetime.utcnow()
 
     def update(self, data: dict):
         """
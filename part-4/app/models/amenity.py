@@ -1,12 +1,14 @@
 from app import db
 from app.models.BaseModel import BaseModel
+from app.persistence.ids import UUIDString
 
 
 class Amenity(BaseModel):
     __tablename__ = 'amenities'
 
     name = db.Column(db.String(50), nullable=False)
-    owner_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=True)
+    owner_id = db.Column(UUIDString, db.ForeignKey('users.id'), nullable=True,
+                         index=True)
     owner = db.relationship('User', backref='amenities', lazy=True)
 
     def __init__(self, name, owner_id=None):
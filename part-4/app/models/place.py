@@ -1,30 +1,50 @@
+from sqlalchemy import case, event
+from sqlalchemy.ext.hybrid import hybrid_property
 from app import db
 from app.models.BaseModel import BaseModel
+from app.persistence import geo
+from app.persistence.ids import UUIDString
 
 # Association table for many-to-many relationship between Place and Amenity
 place_amenity = db.Table('place_amenity',
-    db.Column('place_id', db.String(36), db.ForeignKey('places.id'), primary_key=True),
-    db.Column('amenity_id', db.String(36), db.ForeignKey('amenities.id'), primary_key=True)
+    db.Column('place_id', UUIDString, db.ForeignKey('places.id'), primary_key=True),
+    db.Column('amenity_id', UUIDString, db.ForeignKey('amenities.id'), primary_key=True),
+    # The primary key only covers lookups by place_id first
+    db.Index('ix_place_amenity_amenity_id', 'amenity_id')
 )
 
 
 class Place(BaseModel):
     __tablename__ = 'places'
+    __table_args__ = (
+        # Keyset pagination walks places in (created_at, id) order
+        db.Index('ix_places_created_at_id', 'created_at', 'id'),
+        # Price range and bounding box filters
+        db.Index('ix_places_price', 'price'),
+        db.Index('ix_places_latitude_longitude', 'latitude', 'longitude'),
+    )
 
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.String(500), nullable=True)
     price = db.Column(db.Float, nullable=False)
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
+    # Geohash of (latitude, longitude), kept in sync by the mapper events below
+    geohash = db.Column(db.String(12), nullable=True, index=True)
+
+    # Agrégats des reviews, maintenus par la facade à chaque écriture de review
+    review_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
 
     # Clé étrangère vers la table users
-    owner_id = db.Column(db.String, db.ForeignKey('users.id'), nullable=False)
+    owner_id = db.Column(UUIDString, db.ForeignKey('users.id'), nullable=False,
+                         index=True)
 
     # Relation directe : permet de faire place.owner pour accéder à l'objet User
     owner = db.relationship('User', backref='places', lazy=True)
 
     # Relation vers Review et Amenity
-    reviews = db.relationship('Review', backref='place', lazy=True)
+    reviews = db.relationship('Review', backref='place', lazy=True, cascade='all, delete')
     amenities = db.relationship(
         'Amenity',
         secondary=place_amenity,
@@ -41,6 +61,9 @@ class Place(BaseModel):
       - price: Float, must be >= 0
       - latitude: must be in [-90, 90]
       - longitude: must be in [-180, 180]
+      - geohash: derived from latitude/longitude, used by radius searches
+      - review_count, rating_sum: denormalized review aggregates
+      - average_rating: rating_sum / review_count, None without reviews
       - owner_id: foreign key to the users table
       - owner: User object (relationship)
       - reviews: List of associated reviews
@@ -85,6 +108,22 @@ class Place(BaseModel):
         self.longitude = longitude
         self.owner_id = owner.id  # l'ID de l'utilisateur
         # SQLAlchemy gérera automatiquement self.owner grâce à la relation
+        self.review_count = 0
+        self.rating_sum = 0
+
+    @hybrid_property
+    def average_rating(self):
+        """Average rating of the place, None when it has no review."""
+        if not self.review_count:
+            return None
+        return self.rating_sum / self.review_count
+
+    @average_rating.expression
+    def average_rating(cls):
+        return case(
+            (cls.review_count > 0, cls.rating_sum * 1.0 / cls.review_count),
+            else_=None
+        )
 
     def add_review(self, review):
         """Adds a Review to the Place."""
@@ -100,3 +139,10 @@ class Place(BaseModel):
             raise TypeError("Expected 'amenity' to be an instance of Amenity.")
         if amenity not in self.amenities:
             self.amenities.append(amenity)
+
+
+@event.listens_for(Place, 'before_insert')
+@event.listens_for(Place, 'before_update')
+def sync_geohash(mapper, connection, target):
+    """Recompute the geohash whenever a place is written."""
+    target.geohash = geo.encode(target.latitude, target.longitude)
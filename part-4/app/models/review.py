@@ -1,5 +1,6 @@
 from app import db
 from app.models.BaseModel import BaseModel
+from app.persistence.ids import UUIDString
 
 
 class Review(BaseModel):
@@ -7,9 +8,10 @@ class Review(BaseModel):
 
     text = db.Column(db.String(500), nullable=False)
     rating = db.Column(db.Integer, nullable=False)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    place_id = db.Column(db.Integer, db.ForeignKey(
-        'places.id'), nullable=False)
+    user_id = db.Column(UUIDString, db.ForeignKey('users.id'), nullable=False,
+                        index=True)
+    place_id = db.Column(UUIDString, db.ForeignKey(
+        'places.id'), nullable=False, index=True)
     """
     Review class.
     Attributes:
@@ -0,0 +1,17 @@
+from datetime import datetime
+from app import db
+
+
+class RevokedToken(db.Model):
+    """
+    JWT revoked before its expiry (logout).
+    Rows are only needed until expires_at; `flask purge-revoked-tokens`
+    deletes the older ones.
+    """
+    __tablename__ = 'revoked_tokens'
+
+    jti = db.Column(db.String(36), primary_key=True)
+    expires_at = db.Column(db.DateTime, nullable=False)
+    # Lets each worker pick up the revocations made by the others
+    revoked_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow,
+                           index=True)
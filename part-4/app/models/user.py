@@ -1,4 +1,5 @@
 import re
+from flask import current_app
 from app import db, bcrypt
 from app.models.BaseModel import BaseModel
 
@@ -57,6 +58,14 @@ class User(BaseModel):
         """Verify the provided password against the stored hash."""
         return bcrypt.check_password_hash(self.password, password)
 
+    def password_needs_rehash(self):
+        """True if the stored hash does not use the configured bcrypt cost."""
+        try:
+            cost = int(self.password.split('$')[2])  # $2b$<cost>$<salt+hash>
+        except (IndexError, ValueError):
+            return True
+        return cost != current_app.config.get('BCRYPT_LOG_ROUNDS', 12)
+
     def to_dict(self):
         """Return a dictionary representation of the user (excluding the password)."""
         return {
@@ -0,0 +1,120 @@
+"""
+Geohash helpers used to index Place coordinates.
+
+A geohash turns (latitude, longitude) into a base32 string where nearby
+points share a common prefix, so a radius search becomes a few range
+scans on an ordinary B-tree index instead of a full table scan.
+"""
+import math
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+# Stored precision: 12 characters is a cell of a few centimeters
+GEOHASH_PRECISION = 12
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+
+def encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """Encode a coordinate as a geohash of the given length."""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # even bits encode the longitude
+    while len(chars) < precision:
+        if even:
+            rng, value = lon_range, longitude
+        else:
+            rng, value = lat_range, latitude
+        mid = (rng[0] + rng[1]) / 2
+        bits <<= 1
+        if value >= mid:
+            bits |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """Return the (lat_degrees, lon_degrees) size of a geohash cell."""
+    total_bits = 5 * precision
+    lon_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lon_bits)
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two coordinates in kilometers."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = (math.sin(d_phi / 2) ** 2
+         + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Return (min_lat, max_lat, min_lon, max_lon) enclosing the circle.
+    Longitudes may fall outside [-180, 180] when the circle crosses
+    the antimeridian, covering_prefixes() wraps them.
+    """
+    d_lat = radius_km / KM_PER_DEGREE
+    cos_lat = math.cos(math.radians(latitude))
+    if cos_lat < 1e-6 or radius_km / (KM_PER_DEGREE * cos_lat) >= 180:
+        d_lon = 180.0
+    else:
+        d_lon = radius_km / (KM_PER_DEGREE * cos_lat)
+    return (max(-90.0, latitude - d_lat), min(90.0, latitude + d_lat),
+            longitude - d_lon, longitude + d_lon)
+
+
+def covering_prefixes(latitude, longitude, radius_km):
+    """
+    Geohash prefixes whose cells together cover the circle.
+    The precision is the finest one whose cells are still at least as
+    large as the radius, which keeps the number of prefixes small (<= 9).
+    """
+    min_lat, max_lat, min_lon, max_lon = bounding_box(
+        latitude, longitude, radius_km)
+
+    precision = 1
+    for candidate in range(GEOHASH_PRECISION, 0, -1):
+        lat_deg, lon_deg = cell_size(candidate)
+        if (lat_deg >= (max_lat - min_lat) / 2 and
+                lon_deg >= min(360.0, max_lon - min_lon) / 2):
+            precision = candidate
+            break
+
+    lat_step, lon_step = cell_size(precision)
+    if max_lon - min_lon >= 360.0:
+        min_lon, max_lon = -180.0, 180.0 - lon_step / 2
+
+    prefixes = set()
+    lat = min_lat
+    while True:
+        lon = min_lon
+        while True:
+            wrapped = ((lon + 180.0) % 360.0) - 180.0
+            prefixes.add(encode(min(lat, 90.0), wrapped, precision))
+            if lon >= max_lon:
+                break
+            lon = min(lon + lon_step, max_lon)
+        if lat >= max_lat:
+            break
+        lat = min(lat + lat_step, max_lat)
+    return sorted(prefixes)
+
+
+def prefix_upper_bound(prefix):
+    """Smallest string greater than every geohash starting with prefix."""
+    # '{' sorts right after 'z', the last base32 character
+    return prefix + '{'
@@ -0,0 +1,89 @@
+"""
+Primary key ids.
+
+Above the models an id is always the canonical UUID string
+('0190b3a2-...'), whatever the configuration:
+
+- ID_GENERATOR 'uuid4' draws random ids; 'uuid7' draws time-ordered
+  ones (RFC 9562), so new rows are appended at the right edge of the
+  primary key and foreign key B-trees instead of splitting random pages.
+- ID_STORAGE 'string' stores ids as VARCHAR(36); 'binary' stores the
+  16 raw bytes, less than half the size in every key and index entry.
+  UUIDString converts at the column boundary.
+
+The storage is fixed when the tables are created: switching it on an
+existing database does not convert the rows already there.
+"""
+import os
+import time
+import uuid
+
+from sqlalchemy.types import BINARY, LargeBinary, String, TypeDecorator
+
+GENERATORS = ('uuid4', 'uuid7')
+STORAGES = ('string', 'binary')
+
+_settings = {'generator': 'uuid4', 'storage': 'string'}
+
+
+def configure(app_config):
+    """Apply ID_GENERATOR and ID_STORAGE, before the first query."""
+    generator = app_config.get('ID_GENERATOR', 'uuid4')
+    storage = app_config.get('ID_STORAGE', 'string')
+    if generator not in GENERATORS:
+        raise ValueError(f"Unknown ID_GENERATOR: {generator}")
+    if storage not in STORAGES:
+        raise ValueError(f"Unknown ID_STORAGE: {storage}")
+    _settings.update(generator=generator, storage=storage)
+
+
+def uuid7():
+    """Time-ordered UUID: 48-bit Unix milliseconds, then 74 random bits."""
+    millis = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), 'big')
+    value = ((millis & 0xFFFF_FFFF_FFFF) << 80
+             | 0x7 << 76                         # version
+             | (rand >> 68) << 64                # rand_a, 12 bits
+             | 0b10 << 62                        # variant
+             | rand & ((1 << 62) - 1))           # rand_b, 62 bits
+    return uuid.UUID(int=value)
+
+
+def new_id():
+    """A new primary key, as a string."""
+    if _settings['generator'] == 'uuid7':
+        return str(uuid7())
+    return str(uuid.uuid4())
+
+
+def to_bytes(value):
+    """
+    16 bytes of a UUID string. Strings that are not UUIDs cannot be the
+    id of any row: they map to 17+ bytes, which match nothing.
+    """
+    try:
+        return uuid.UUID(value).bytes
+    except (ValueError, TypeError, AttributeError):
+        return str(value).encode().ljust(17, b'\0')
+
+
+class UUIDString(TypeDecorator):
+    """UUID column, a canonical string in Python, stored per ID_STORAGE."""
+    impl = String(36)
+    cache_ok = True
+
+    def load_dialect_impl(self, dialect):
+        if _settings['storage'] == 'binary':
+            binary = BINARY(16) if dialect.name == 'mysql' else LargeBinary(16)
+            return dialect.type_descriptor(binary)
+        return dialect.type_descriptor(String(36))
+
+    def process_bind_param(self, value, dialect):
+        if value is None or _settings['storage'] != 'binary':
+            return value
+        return to_bytes(value)
+
+    def process_result_value(self, value, dialect):
+        if isinstance(value, (bytes, memoryview)):
+            return str(uuid.UUID(bytes=bytes(value)))
+        return value
@@ -0,0 +1,73 @@
+"""
+Small versioned schema migration runner.
+
+Migrations are the modules of this package named vNNNN_<description>.py,
+each with an upgrade(connection) function; they run in version order,
+each in its own transaction, and the applied versions are recorded in
+the schema_migrations table.
+
+upgrade() first lets db.create_all() build the tables that do not exist
+yet with the current models, so a fresh database is already up to date
+and migrations must be idempotent: they only add what is missing
+(see ops.py).
+"""
+import importlib
+import pkgutil
+from collections import namedtuple
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table
+
+Migration = namedtuple('Migration', 'version name module')
+
+_metadata = MetaData()
+schema_migrations = Table(
+    'schema_migrations', _metadata,
+    Column('version', Integer, primary_key=True),
+    Column('name', String(100), nullable=False),
+    Column('applied_at', DateTime, nullable=False),
+)
+
+
+def discover():
+    """Migrations of this package, ordered by version."""
+    migrations = []
+    for info in pkgutil.iter_modules(__path__):
+        if info.name.startswith('v') and info.name[1:5].isdigit():
+            module = importlib.import_module(f'{__name__}.{info.name}')
+            migrations.append(Migration(int(info.name[1:5]), info.name[6:], module))
+    return sorted(migrations, key=lambda m: m.version)
+
+
+def applied_versions(engine):
+    """{version: applied_at} of the migrations already run."""
+    _metadata.create_all(engine)
+    with engine.connect() as conn:
+        return dict(conn.execute(schema_migrations.select().with_only_columns(
+            schema_migrations.c.version, schema_migrations.c.applied_at)).all())
+
+
+def upgrade(engine=None):
+    """Bring the database to the current schema, return the versions run."""
+    from app import db
+    engine = engine or db.engine
+    db.metadata.create_all(engine)
+    done = applied_versions(engine)
+    ran = []
+    for migration in discover():
+        if migration.version in done:
+            continue
+        with engine.begin() as conn:
+            migration.module.upgrade(conn)
+            conn.execute(schema_migrations.insert().values(
+                version=migration.version, name=migration.name,
+                applied_at=datetime.utcnow()))
+        ran.append(migration.version)
+    return ran
+
+
+def status(engine=None):
+    """[(version, name, applied_at or None)] of every migration."""
+    from app import db
+    done = applied_versions(engine or db.engine)
+    return [(m.version, m.name, done.get(m.version)) for m in discover()]
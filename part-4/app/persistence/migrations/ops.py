@@ -0,0 +1,34 @@
+"""Idempotent schema operations for migrations."""
+from sqlalchemy import inspect, text
+
+
+def has_column(conn, table, column):
+    return column in {c['name'] for c in inspect(conn).get_columns(table)}
+
+
+def column_type(conn, table, column):
+    """Declared type of a column as upper-case DDL, e.g. 'VARCHAR(36)'."""
+    for c in inspect(conn).get_columns(table):
+        if c['name'] == column:
+            return str(c['type']).upper()
+    raise KeyError(f'{table}.{column}')
+
+
+def add_column(conn, table, column, ddl):
+    """ALTER TABLE ... ADD COLUMN unless it exists; True if it was added."""
+    if has_column(conn, table, column):
+        return False
+    conn.execute(text(f'ALTER TABLE {table} ADD COLUMN {column} {ddl}'))
+    return True
+
+
+def has_index(conn, table, name):
+    return name in {i['name'] for i in inspect(conn).get_indexes(table)}
+
+
+def create_index(conn, name, table, *columns):
+    """CREATE INDEX unless an index of that name exists; True if created."""
+    if has_index(conn, table, name):
+        return False
+    conn.execute(text(f'CREATE INDEX {name} ON {table} ({", ".join(columns)})'))
+    return True
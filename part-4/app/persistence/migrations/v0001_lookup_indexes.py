@@ -0,0 +1,44 @@
+"""
+Indexes on the foreign keys and lookup columns, and the place columns
+added after the first schema (geohash, review_count, rating_sum) for
+databases created before them.
+"""
+from sqlalchemy import text
+
+from app.persistence import geo
+from app.persistence.migrations.ops import add_column, create_index
+
+INDEXES = [
+    ('ix_places_owner_id', 'places', 'owner_id'),
+    ('ix_reviews_user_id', 'reviews', 'user_id'),
+    ('ix_reviews_place_id', 'reviews', 'place_id'),
+    ('ix_amenities_owner_id', 'amenities', 'owner_id'),
+    ('ix_place_amenity_amenity_id', 'place_amenity', 'amenity_id'),
+    ('ix_places_created_at_id', 'places', 'created_at', 'id'),
+    ('ix_places_price', 'places', 'price'),
+    ('ix_places_latitude_longitude', 'places', 'latitude', 'longitude'),
+    ('ix_places_geohash', 'places', 'geohash'),
+]
+
+
+def upgrade(conn):
+    if add_column(conn, 'places', 'geohash', 'VARCHAR(12)'):
+        rows = conn.execute(text(
+            'SELECT id, latitude, longitude FROM places '
+            'WHERE latitude IS NOT NULL AND longitude IS NOT NULL')).all()
+        if rows:
+            conn.execute(text('UPDATE places SET geohash = :geohash WHERE id = :id'),
+                         [{'id': row.id, 'geohash': geo.encode(row.latitude, row.longitude)}
+                          for row in rows])
+
+    added_count = add_column(conn, 'places', 'review_count', 'INTEGER NOT NULL DEFAULT 0')
+    added_sum = add_column(conn, 'places', 'rating_sum', 'INTEGER NOT NULL DEFAULT 0')
+    if added_count or added_sum:
+        conn.execute(text(
+            'UPDATE places SET '
+            'review_count = (SELECT count(*) FROM reviews WHERE reviews.place_id = places.id), '
+            'rating_sum = (SELECT coalesce(sum(rating), 0) FROM reviews '
+            'WHERE reviews.place_id = places.id)'))
+
+    for name, table, *columns in INDEXES:
+        create_index(conn, name, table, *columns)
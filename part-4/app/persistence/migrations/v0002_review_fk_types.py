@@ -0,0 +1,52 @@
+"""
+reviews.user_id and reviews.place_id were created as INTEGER while they
+hold the VARCHAR(36) ids of users and places. On SQLite the INTEGER
+affinity wins the comparison in reviews JOIN users / places, so the
+primary key index of the joined table cannot be used and every joined
+row is a full scan of it.
+
+SQLite cannot change a column type in place: the table is rebuilt
+(create, copy, drop, rename) and its indexes created again.
+"""
+from sqlalchemy import text
+
+from app.persistence.migrations.ops import column_type, create_index
+
+COLUMNS = ('user_id', 'place_id')
+
+REVIEWS_DDL = """
+CREATE TABLE reviews_new (
+    text VARCHAR(500) NOT NULL,
+    rating INTEGER NOT NULL,
+    user_id VARCHAR(36) NOT NULL,
+    place_id VARCHAR(36) NOT NULL,
+    id VARCHAR(36) NOT NULL,
+    created_at DATETIME,
+    updated_at DATETIME,
+    PRIMARY KEY (id),
+    FOREIGN KEY(user_id) REFERENCES users (id),
+    FOREIGN KEY(place_id) REFERENCES places (id)
+)
+"""
+
+
+def upgrade(conn):
+    if not any(column_type(conn, 'reviews', c) == 'INTEGER' for c in COLUMNS):
+        return
+
+    if conn.dialect.name == 'sqlite':
+        conn.execute(text(REVIEWS_DDL))
+        conn.execute(text(
+            'INSERT INTO reviews_new '
+            '(text, rating, user_id, place_id, id, created_at, updated_at) '
+            'SELECT text, rating, CAST(user_id AS TEXT), CAST(place_id AS TEXT), '
+            'id, created_at, updated_at FROM reviews'))
+        conn.execute(text('DROP TABLE reviews'))
+        conn.execute(text('ALTER TABLE reviews_new RENAME TO reviews'))
+    else:
+        for column in COLUMNS:
+            conn.execute(text(
+                f'ALTER TABLE reviews ALTER COLUMN {column} TYPE VARCHAR(36)'))
+
+    create_index(conn, 'ix_reviews_user_id', 'reviews', 'user_id')
+    create_index(conn, 'ix_reviews_place_id', 'reviews', 'place_id')
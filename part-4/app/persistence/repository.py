@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
 from app import db
-from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import lazyload, load_only, scoped_session, sessionmaker
 from sqlalchemy.ext.declarative import as_declarative, declared_attr
-import uuid
+from app.persistence.ids import UUIDString, new_id
+import base64
+import json
 from datetime import datetime
 
 
@@ -16,8 +19,7 @@ class Base:
 class BaseModel(db.Model):
     __abstract__ = True  # SQLAlchemy ne crée pas de table pour BaseModel
 
-    id = db.Column(db.String(36), primary_key=True,
-                   default=lambda: str(uuid.uuid4()))
+    id = db.Column(UUIDString, primary_key=True, default=new_id)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(
         db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -32,6 +34,10 @@ class Repository(ABC):
     def get(self, obj_id):
         pass
 
+    @abstractmethod
+    def get_many(self, obj_ids):
+        pass
+
     @abstractmethod
     def get_all(self):
         pass
@@ -49,32 +55,242 @@ class Repository(ABC):
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+    @abstractmethod
+    def get_page(self, limit, cursor=None):
+        pass
+
+
+def _cursor_default(value):
+    if isinstance(value, datetime):
+        return {'$dt': value.isoformat()}
+    raise TypeError(f"Cannot encode {type(value).__name__} in a cursor")
+
+
+def _cursor_object_hook(obj):
+    if '$dt' in obj:
+        return datetime.fromisoformat(obj['$dt'])
+    return obj
+
+
+def encode_cursor(values, sort=None):
+    """Encode the sort key values of the last row of a page and its sort."""
+    raw = json.dumps({'sort': sort, 'after': list(values)}, default=_cursor_default)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def _cursor_value_fits(column, value):
+    """Whether a decoded cursor value has the type of its sort key."""
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = str
+    if issubclass(python_type, datetime):
+        return isinstance(value, datetime)
+    if issubclass(python_type, (int, float)):
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+    return isinstance(value, str)
+
+
+def decode_cursor(cursor, keys, sort=None):
+    """
+    Decode a cursor built by encode_cursor() for the sort keys `keys` of
+    the named sort `sort`, raise ValueError if invalid. A cursor issued
+    for another sort is rejected, and each value must have the type of
+    its key, so a tampered cursor never reaches the database.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii'))
+        payload = json.loads(raw, object_hook=_cursor_object_hook)
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Invalid 'cursor'.")
+    if not isinstance(payload, dict) or set(payload) != {'sort', 'after'}:
+        raise ValueError("Invalid 'cursor'.")
+    if payload['sort'] != sort:
+        raise ValueError("Invalid 'cursor': it was issued for another sort.")
+    values = payload['after']
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise ValueError("Invalid 'cursor'.")
+    if not all(_cursor_value_fits(column, value)
+               for (column, _), value in zip(keys, values)):
+        raise ValueError("Invalid 'cursor'.")
+    return values
+
+
+def keyset_after(keys, values):
+    """
+    WHERE clause selecting the rows strictly after `values` in the
+    order given by keys, a list of (column, descending).
+    """
+    clauses = []
+    for i, (column, descending) in enumerate(keys):
+        equal = [key == value for (key, _), value in zip(keys[:i], values[:i])]
+        after = column < values[i] if descending else column > values[i]
+        clauses.append(and_(*equal, after))
+    return or_(*clauses)
+
 
 class SQLAlchemyRepository(Repository):
+    # Named loader options, ex: {'list_view': lambda: [joinedload(...)]}
+    load_profiles = {}
+    # Serialized fields that do not read the column of the same name,
+    # ex: {'average_rating': ('review_count', 'rating_sum')}
+    field_columns = {}
+    # Relationships a fieldset may embed, ex: {'owner': lambda: joinedload(...)}
+    field_loaders = {}
+
     def __init__(self, model):
         self.model = model
 
+    def _query(self, profile=None, filters=None):
+        """
+        Base query with the profile's loader options and the filters applied.
+        profile is a load_profiles name or a list of loader options.
+        """
+        from app import db
+        query = db.session.query(self.model)
+        if isinstance(profile, str):
+            if profile not in self.load_profiles:
+                raise ValueError(f"Unknown load profile: {profile}")
+            query = query.options(*self.load_profiles[profile]())
+        elif profile is not None:
+            query = query.options(*profile)
+        if filters:
+            query = self._apply_filters(query, filters)
+        return query
+
+    def fieldset_profile(self, fields):
+        """
+        Loader options that read only what serializing `fields` needs: the
+        columns behind them (load_only) and the requested relationships,
+        nothing else. Usable wherever a profile is accepted.
+        """
+        columns, options = {self.model.id}, []
+        for name in fields:
+            if name in self.field_loaders:
+                options.append(self.field_loaders[name]())
+            else:
+                for column in self.field_columns.get(name, (name,)):
+                    columns.add(getattr(self.model, column))
+        # lazyload('*') also turns off relationships eager by default
+        return [load_only(*columns), lazyload('*')] + options
+
+    def _apply_filters(self, query, filters):
+        """Translate a dict of filters to SQL, overridden per repository."""
+        raise ValueError(f"Unsupported filters: {', '.join(filters)}")
+
+    # Writes only flush, the facade's transaction() commits once per operation
     def add(self, instance):
         from app import db
         db.session.add(instance)
-        db.session.commit()
+        db.session.flush()
 
-    def get(self, id):
-        from app import db
-        return db.session.query(self.model).get(id)
+    def get(self, id, profile=None):
+        return self._query(profile).get(id)
 
-    def get_all(self):
-        from app import db
-        return db.session.query(self.model).all()
+    def get_many(self, ids, profile=None):
+        """Return {id: instance} for the ids found, with one IN query."""
+        ids = set(ids)
+        if not ids:
+            return {}
+        return {obj.id: obj for obj in
+                self._query(profile).filter(self.model.id.in_(ids))}
+
+    def _sort_keys(self, sort=None):
+        """
+        Columns of a named sort order as [(column, descending)].
+        The default order is creation time, subclasses add their own.
+        """
+        if sort is None:
+            return [(self.model.created_at, False)]
+        raise ValueError(f"Invalid 'sort': {sort}")
+
+    def _order_by(self, sort=None):
+        # The primary key is always the last tiebreaker
+        return self._sort_keys(sort) + [(self.model.id, False)]
+
+    def get_all(self, profile=None, filters=None, sort=None):
+        query = self._query(profile, filters)
+        if sort is not None:
+            query = query.order_by(*[column.desc() if descending else column
+                                     for column, descending in self._order_by(sort)])
+        return query.all()
+
+    def iter_all(self, profile=None, filters=None, sort=None, batch_size=500):
+        """
+        Iterate over the matching rows, fetched batch_size at a time
+        (yield_per) instead of materializing the whole result. Loaded
+        instances are only weakly held by the session, so memory stays
+        flat as long as the caller does not keep them.
+        """
+        query = self._query(profile, filters).order_by(
+            *[column.desc() if descending else column
+              for column, descending in self._order_by(sort)])
+        return query.yield_per(batch_size)
+
+    def get_page(self, limit, cursor=None, profile=None, filters=None, sort=None):
+        """
+        Keyset pagination on the sort keys, (created_at, id) by default.
+        Returns (items, next_cursor), next_cursor is None on the last page.
+        """
+        keys = self._order_by(sort)
+        query = self._query(profile, filters).add_columns(
+            *[column for column, _ in keys]
+        ).order_by(*[column.desc() if descending else column
+                     for column, descending in keys])
+        if cursor:
+            query = query.filter(keyset_after(keys, decode_cursor(cursor, keys, sort)))
+        # One extra row tells us whether another page exists
+        rows = query.limit(limit + 1).all()
+        items = [row[0] for row in rows[:limit]]
+        if len(rows) > limit:
+            return items, encode_cursor(rows[limit - 1][1:], sort)
+        return items, None
+
+    def _version_query(self, ids=None, filters=None):
+        """Query of the ids of the rows a version covers."""
+        query = self._query(filters=filters).with_entities(self.model.id)
+        if ids is not None:
+            query = query.filter(self.model.id.in_(ids))
+        return query
+
+    def get_version(self, ids=None, filters=None):
+        """
+        (row count, latest updated_at) of the rows matching ids/filters,
+        computed by one aggregate query without loading any instance.
+        Used as HTTP validators (ETag / Last-Modified).
+        """
+        query = self._version_query(ids, filters).with_entities(
+            func.count(self.model.id), func.max(self.model.updated_at))
+        return tuple(query.one())
+
+    def version_of(self, instance):
+        """
+        get_version([instance.id]) of an instance already loaded, without
+        a query: what a cache entry is stored with.
+        """
+        return 1, instance.updated_at
 
     def update(self, instance):
         from app import db
-        db.session.commit()
+        db.session.flush()
 
     def delete(self, instance):
         from app import db
         db.session.delete(instance)
-        db.session.commit()
+        db.session.flush()
+
+    def expire(self, instance, *attributes):
+        """Reload attributes of instance (all by default) on next access."""
+        from app import db
+        db.session.expire(instance, attributes or None)
+
+    def bulk_add(self, mappings):
+        """
+        Insert plain dicts in one executemany, skipping the ORM unit of work.
+        Mapper events do not fire, subclasses fill derived columns first.
+        """
+        from app import db
+        db.session.bulk_insert_mappings(self.model, mappings)
 
     def get_by_attribute(self, attr_name, attr_value):
         from app import db
@@ -31,6 +31,12 @@ CREATE TABLE IF NOT EXISTS reviews (
     CONSTRAINT unique_review UNIQUE (user_id, place_id)
 );
 
+CREATE INDEX IF NOT EXISTS ix_reviews_place_id ON reviews (place_id);
+CREATE INDEX IF NOT EXISTS ix_reviews_user_id ON reviews (user_id);
+CREATE INDEX IF NOT EXISTS ix_places_owner_id ON places (owner_id);
+CREATE INDEX IF NOT EXISTS ix_places_price ON places (price);
+CREATE INDEX IF NOT EXISTS ix_places_latitude_longitude ON places (latitude, longitude);
+
 CREATE TABLE IF NOT EXISTS amenities (
     id CHAR(36) PRIMARY KEY,
     name VARCHAR(255) UNIQUE
@@ -44,6 +50,16 @@ CREATE TABLE IF NOT EXISTS place_amenity (
     FOREIGN KEY (amenity_id) REFERENCES amenities(id) ON DELETE CASCADE
 );
 
+CREATE INDEX IF NOT EXISTS ix_place_amenity_amenity_id ON place_amenity (amenity_id);
+
+CREATE TABLE IF NOT EXISTS revoked_tokens (
+    jti VARCHAR(36) PRIMARY KEY,
+    expires_at DATETIME NOT NULL,
+    revoked_at DATETIME NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_revoked_tokens_revoked_at ON revoked_tokens (revoked_at);
+
 INSERT INTO users (id, first_name, last_name, email, password, is_admin)
 VALUES ('36c9050e-ddd3-4c3b-9731-9f487208bbc1', 'Admin', 'HBnB', 'admin@hbnb.io', '$2a$12$KJpXZLhI9bB4DYoVfUJdujq/Vit6cm/DyZfC9g5W7lqAAyqWeFYie', TRUE);
 
@@ -0,0 +1,56 @@
+from contextlib import contextmanager
+from functools import wraps
+
+# Keys in Session.info holding the depth of nested transaction() blocks
+# and the callbacks to run once the outermost block has committed
+_DEPTH_KEY = 'unit_of_work_depth'
+_CALLBACKS_KEY = 'unit_of_work_after_commit'
+
+
+@contextmanager
+def transaction():
+    """
+    Unit of work around the current session.
+    Repositories only flush; the outermost transaction() block commits
+    once on success and rolls everything back on error. Nested blocks
+    join the enclosing one.
+    """
+    from app import db
+    session = db.session
+    depth = session.info.get(_DEPTH_KEY, 0)
+    session.info[_DEPTH_KEY] = depth + 1
+    try:
+        yield session
+        if depth == 0:
+            session.commit()
+            for callback in session.info.pop(_CALLBACKS_KEY, []):
+                callback()
+    except Exception:
+        if depth == 0:
+            session.rollback()
+            session.info.pop(_CALLBACKS_KEY, None)
+        raise
+    finally:
+        session.info[_DEPTH_KEY] = depth
+
+
+def after_commit(callback):
+    """
+    Run callback() after the enclosing transaction() commits, or right
+    away outside of any transaction. Dropped on rollback.
+    """
+    from app import db
+    session = db.session
+    if session.info.get(_DEPTH_KEY, 0):
+        session.info.setdefault(_CALLBACKS_KEY, []).append(callback)
+    else:
+        callback()
+
+
+def transactional(method):
+    """Run a facade method inside a single transaction()."""
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        with transaction():
+            return method(*args, **kwargs)
+    return wrapper
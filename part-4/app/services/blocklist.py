@@ -0,0 +1,152 @@
+"""
+Revoked JWT store consulted on every authenticated request.
+
+SQLBlocklist keeps the revocations in the revoked_tokens table and puts
+an in-memory bloom filter in front of it: a token that was never revoked
+(nearly every request) is answered without touching the database.
+"""
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app.models.revoked_token import RevokedToken
+
+# revoked_at is set at flush time, before the revoking transaction commits:
+# each sync re-reads this much history so late commits are not missed
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class BloomFilter:
+    """Set membership with false positives but no false negatives."""
+
+    def __init__(self, capacity=100000, error_rate=0.01):
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        # Double hashing: h1 + i * h2 stands in for hash_count hash functions
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, key):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self._bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(key))
+
+
+class Blocklist:
+    """Interface of the revoked token store."""
+
+    def revoke(self, jti, expires_at):
+        """Mark the token as revoked until expires_at (naive UTC)."""
+        raise NotImplementedError
+
+    def is_revoked(self, jti):
+        raise NotImplementedError
+
+    def purge_expired(self):
+        """Forget the tokens that expired anyway, return how many."""
+        raise NotImplementedError
+
+
+class MemoryBlocklist(Blocklist):
+    """Per-process blocklist, for tests and single-worker deployments."""
+
+    def __init__(self):
+        self._revoked = {}  # jti -> expires_at
+        self._lock = threading.Lock()
+
+    def revoke(self, jti, expires_at):
+        with self._lock:
+            self._revoked[jti] = expires_at
+
+    def is_revoked(self, jti):
+        return jti in self._revoked
+
+    def purge_expired(self):
+        now = datetime.utcnow()
+        with self._lock:
+            expired = [jti for jti, expires_at in self._revoked.items()
+                       if expires_at <= now]
+            for jti in expired:
+                del self._revoked[jti]
+        return len(expired)
+
+
+class SQLBlocklist(Blocklist):
+    """
+    revoked_tokens table behind a bloom filter. The filter is loaded on
+    first use and catches up with revocations made by other workers at
+    most every sync_seconds, which bounds how long a token revoked
+    elsewhere can still be used here.
+    """
+
+    def __init__(self, capacity=100000, error_rate=0.01, sync_seconds=5):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_seconds = sync_seconds
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._synced_at = None      # time.monotonic() of the last sync
+        self._synced_until = None   # latest revoked_at seen
+        self._lock = threading.Lock()
+
+    def _sync(self):
+        from app import db
+        with self._lock:
+            now = time.monotonic()
+            if self._synced_at is not None and now - self._synced_at < self.sync_seconds:
+                return
+            query = db.session.query(RevokedToken.jti, RevokedToken.revoked_at)
+            if self._synced_until is None:
+                query = query.filter(RevokedToken.expires_at > datetime.utcnow())
+            else:
+                query = query.filter(
+                    RevokedToken.revoked_at >= self._synced_until - SYNC_OVERLAP)
+            for jti, revoked_at in query:
+                self._bloom.add(jti)
+                if self._synced_until is None or revoked_at > self._synced_until:
+                    self._synced_until = revoked_at
+            if self._synced_until is None:
+                self._synced_until = datetime.utcnow()
+            self._synced_at = now
+
+    def revoke(self, jti, expires_at):
+        from app import db
+        if db.session.get(RevokedToken, jti) is None:
+            db.session.add(RevokedToken(jti=jti, expires_at=expires_at))
+            db.session.flush()
+        self._bloom.add(jti)
+
+    def is_revoked(self, jti):
+        from app import db
+        self._sync()
+        if jti not in self._bloom:
+            return False
+        return db.session.get(RevokedToken, jti) is not None
+
+    def purge_expired(self):
+        from app import db
+        return db.session.query(RevokedToken).filter(
+            RevokedToken.expires_at <= datetime.utcnow()
+        ).delete(synchronize_session=False)
+
+
+def create_blocklist(app_config):
+    """Build the blocklist selected by JWT_BLOCKLIST ('sql' or 'memory')."""
+    backend = app_config.get('JWT_BLOCKLIST', 'sql')
+    if backend == 'memory':
+        return MemoryBlocklist()
+    if backend == 'sql':
+        return SQLBlocklist(
+            capacity=app_config.get('JWT_BLOCKLIST_BLOOM_CAPACITY', 100000),
+            error_rate=app_config.get('JWT_BLOCKLIST_BLOOM_ERROR_RATE', 0.01),
+            sync_seconds=app_config.get('JWT_BLOCKLIST_SYNC_SECONDS', 5))
+    raise ValueError(f"Unknown JWT_BLOCKLIST: {backend}")
@@ -0,0 +1,138 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class Cache:
+    """
+    Interface of the facade read-through cache.
+    Values are serialized dicts ((version, dict) pairs for entities);
+    callers must not mutate what get() returns.
+    """
+
+    def get(self, key):
+        """Return the cached value or None."""
+        raise NotImplementedError
+
+    def set(self, key, value):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self):
+        """Return the hit/miss counters as a dict."""
+        raise NotImplementedError
+
+    def get_or_load(self, key, loader):
+        """Read-through: return the cached value or cache loader()'s result."""
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            if value is not None:
+                self.set(key, value)
+        return value
+
+
+class NullCache(Cache):
+    """Cache that stores nothing, used when caching is disabled."""
+
+    def __init__(self):
+        self.misses = 0
+
+    def get(self, key):
+        self.misses += 1
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self):
+        return {"backend": "null", "hits": 0, "misses": self.misses,
+                "hit_ratio": 0.0, "size": 0}
+
+
+class LRUCache(Cache):
+    """
+    In-process LRU cache with a time-to-live, safe to share between threads.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": "lru",
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+            }
+
+
+def create_cache(app_config, prefix='CACHE'):
+    """
+    Build the cache backend selected by <prefix>_TYPE ('lru' or 'null'),
+    sized by <prefix>_MAX_ENTRIES and <prefix>_TTL_SECONDS.
+    """
+    cache_type = app_config.get(f'{prefix}_TYPE', 'lru')
+    if cache_type == 'null':
+        return NullCache()
+    if cache_type == 'lru':
+        return LRUCache(maxsize=app_config.get(f'{prefix}_MAX_ENTRIES', 1024),
+                        ttl=app_config.get(f'{prefix}_TTL_SECONDS', 60))
+    raise ValueError(f"Unknown {prefix}_TYPE: {cache_type}")
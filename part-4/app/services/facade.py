@@ -1,3 +1,5 @@
+import math
+import time
 from app.services.repositories.user_repository import UserRepository
 from app.services.repositories.place_repository import PlaceRepository
 from app.services.repositories.review_repository import ReviewRepository
@@ -6,62 +8,183 @@ from app.models.user import User
 from app.models.place import Place
 from app.models.review import Review
 from app.models.amenity import Amenity
+from app.persistence.ids import new_id
+from app.persistence.unit_of_work import after_commit, transactional
+from app.services.cache import LRUCache
+from app.services.hashing import BoundedExecutor
+from app.services.metrics import PASSWORD_VERIFY
+from app.services.blocklist import MemoryBlocklist
+from app.services.serializers import (amenity_serializer, place_serializer,
+                                      review_serializer, user_serializer)
 
 class HBnBFacade:
+    # Largest array accepted by the bulk create operations
+    BULK_MAX_ITEMS = 1000
+
     def __init__(self):
         self.user_repo = UserRepository()
         self.place_repo = PlaceRepository()
         self.review_repo = ReviewRepository()
         self.amenity_repo = AmenityRepository()
-
-    def _user_to_dict(self, user_obj):
-        if not user_obj:
-            return None
-        return {
-            "id": user_obj.id,
-            "first_name": user_obj.first_name,
-            "last_name": user_obj.last_name,
-            "email": user_obj.email,
-            "is_admin": getattr(user_obj, 'is_admin', False)
-        }
-
-    def _amenity_to_dict(self, amenity_obj):
-        if not amenity_obj:
+        # Replaced by create_app() with the backend chosen in the config
+        self.cache = LRUCache()
+        self.principals = LRUCache(ttl=30)
+        self.blocklist = MemoryBlocklist()
+        self.hasher = BoundedExecutor()
+
+    # CACHE
+    def _invalidate(self, *keys):
+        """
+        Drop cache entries now and again once the transaction commits, so a
+        concurrent read cannot put back the pre-commit state.
+        """
+        def drop():
+            for key in keys:
+                self.cache.delete(key)
+                self.principals.delete(key)
+        drop()
+        after_commit(drop)
+
+    def get_principal(self, user_id):
+        """
+        {'id', 'is_admin'} of an existing user, or None. Read through the
+        principals cache so authenticated requests skip the user SELECT.
+        """
+        def load():
+            user = self.get_user(user_id)
+            return {"id": user.id, "is_admin": user.is_admin} if user else None
+        return self.principals.get_or_load(f"principal:{user_id}", load)
+
+    def get_entry(self, entity, entity_id, fields=None):
+        """
+        (version, data) of one entity ('user', 'amenity', 'place' or
+        'review'), or None if it does not exist. The cache holds the
+        default dicts with the version they were read at, and fields= is
+        applied on the way out, so a hit costs no query at all: writes of
+        this process invalidate the entry and those of other processes are
+        seen once its TTL runs out, the body always matching the version.
+        Fieldsets reaching beyond the defaults (include=) are read from the
+        database with just what they need and have no version.
+        """
+        serializer, repo, profile = {
+            'user': (user_serializer, self.user_repo, None),
+            'amenity': (amenity_serializer, self.amenity_repo, None),
+            'place': (place_serializer, self.place_repo, 'detail_view'),
+            'review': (review_serializer, self.review_repo, None),
+        }[entity]
+        if not serializer.covers(fields):
+            data = serializer.dump(
+                repo.get(entity_id, repo.fieldset_profile(fields)), fields)
+            return None if data is None else (None, data)
+        key = f"{entity}:{entity_id}"
+        entry = self.cache.get(key)
+        if entry is None:
+            instance = repo.get(entity_id, profile)
+            if instance is None:
+                return None
+            entry = (repo.version_of(instance), serializer.dump(instance))
+            self.cache.set(key, entry)
+        return entry[0], serializer.project(entry[1], fields)
+
+    def _get_data(self, entity, entity_id, fields):
+        entry = self.get_entry(entity, entity_id, fields)
+        return entry[1] if entry else None
+
+    def get_user_data(self, user_id, fields=None):
+        """Serialized user, read through the cache."""
+        return self._get_data("user", user_id, fields)
+
+    def get_amenity_data(self, amenity_id, fields=None):
+        """Serialized amenity, read through the cache."""
+        return self._get_data("amenity", amenity_id, fields)
+
+    def get_place_data(self, place_id, fields=None):
+        """Serialized place with its owner and amenities, read through the cache."""
+        return self._get_data("place", place_id, fields)
+
+    def get_review_data(self, review_id, fields=None):
+        """Serialized review, read through the cache."""
+        return self._get_data("review", review_id, fields)
+
+    # VERSIONS
+    def get_version(self, entity, entity_id=None, filters=None):
+        """
+        Version of one entity ('user', 'amenity', 'place' or 'review') or,
+        without entity_id, of the collection matching filters. Used for
+        conditional GETs; None if entity_id does not exist.
+        """
+        repo = {
+            'user': self.user_repo,
+            'amenity': self.amenity_repo,
+            'place': self.place_repo,
+            'review': self.review_repo,
+        }[entity]
+        ids = None if entity_id is None else [entity_id]
+        version = repo.get_version(ids, filters)
+        if entity_id is not None and not version[0]:
             return None
-        return {
-            "id": amenity_obj.id,
-            "name": amenity_obj.name
-        }
+        return version
 
-    def _place_to_dict(self, place_obj):
-        if not place_obj:
-            return None
-        return {
-            "id": place_obj.id,
-            "title": place_obj.title,
-            "description": place_obj.description,
-            "price": place_obj.price,
-            "latitude": place_obj.latitude,
-            "longitude": place_obj.longitude,
-            "owner_id": place_obj.owner.id,
-            "amenities": [a.id for a in place_obj.amenities] if hasattr(place_obj, "amenities") else []
-        }
-
-    def _review_to_dict(self, review_obj):
-        if not review_obj:
-            return None
-        return {
-            "id": review_obj.id,
-            "text": review_obj.text,
-            "rating": review_obj.rating,
-            "user_id": review_obj.user.id,
-            "place_id": review_obj.place.id
-        }
+    def _check_number(self, data, field):
+        value = data[field]
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            raise ValueError(f"Invalid '{field}': must be a number.")
+        return value
+
+    def _check_rating(self, rating):
+        """Ratings are integers from 1 to 5, they feed the place aggregates."""
+        if isinstance(rating, bool) or not isinstance(rating, int) or not (1 <= rating <= 5):
+            raise ValueError("Rating must be between 1 and 5.")
+
+    def _check_place_data(self, place_data):
+        """Validate a full place payload, raise ValueError on the first problem."""
+        for field in ("title", "price", "latitude", "longitude", "owner_id"):
+            if field not in place_data:
+                raise ValueError(f"Missing required field: {field}")
+        if not isinstance(place_data["owner_id"], str):
+            raise ValueError("Invalid 'owner_id': must be a string.")
+        title = place_data["title"]
+        if not isinstance(title, str) or not title or len(title) > 100:
+            raise ValueError("Invalid 'title': must be non-empty and ≤ 100 characters.")
+        if self._check_number(place_data, "price") < 0:
+            raise ValueError("Price must be a non-negative value.")
+        if not (-90 <= self._check_number(place_data, "latitude") <= 90):
+            raise ValueError("Latitude must be between -90 and 90.")
+        if not (-180 <= self._check_number(place_data, "longitude") <= 180):
+            raise ValueError("Longitude must be between -180 and 180.")
+        amenities = place_data.get("amenities", [])
+        if not isinstance(amenities, list) or not all(isinstance(a, str) for a in amenities):
+            raise ValueError("Invalid 'amenities': must be a list of IDs.")
+
+    def _check_bulk_items(self, items, check):
+        """
+        Run check(item) on every item of a bulk payload.
+        Returns (valid, errors): [(index, item)], [{"index", "message"}].
+        """
+        if not isinstance(items, list):
+            raise ValueError("Expected a JSON array.")
+        if len(items) > self.BULK_MAX_ITEMS:
+            raise ValueError(f"Too many items: at most {self.BULK_MAX_ITEMS} per request.")
+        valid, errors = [], []
+        for index, item in enumerate(items):
+            try:
+                if not isinstance(item, dict):
+                    raise ValueError("Item must be an object.")
+                check(item)
+            except ValueError as e:
+                errors.append({"index": index, "message": str(e)})
+            else:
+                valid.append((index, item))
+        return valid, errors
+
+    def _existing(self, repo, ids):
+        """{id: instance} of the ids found, loading nothing but the ids."""
+        return repo.get_many(ids, repo.fieldset_profile(()))
 
     # USERS
+    @transactional
     def create_user(self, user_data):
-        user = User(**user_data)
-        user.hash_password(user_data['password'])
+        user = User(**user_data)  # hashes the password
         self.user_repo.add(user)
         return user
 
@@ -74,10 +197,47 @@ class HBnBFacade:
     def get_user_by_email(self, email):
         return self.user_repo.get_user_by_email(email)
 
-    def get_all_users(self):
-        users = self.user_repo.get_all()
-        return [self._user_to_dict(user) for user in users]
+    @transactional
+    def authenticate(self, email, password):
+        """
+        Return the user matching the credentials, or None.
+        bcrypt runs on the bounded hasher (ExecutorBusy when saturated), and
+        a hash made with another cost than BCRYPT_LOG_ROUNDS is replaced.
+        """
+        user = self.get_user_by_email(email)
+        if not user:
+            return None
+        started = time.perf_counter()
+        verified = self.hasher.run(user.verify_password, password)
+        PASSWORD_VERIFY.observe(time.perf_counter() - started)
+        if not verified:
+            return None
+        if user.password_needs_rehash():
+            self.hasher.run(user.hash_password, password)
+            self.user_repo.update(user)
+        return user
 
+    # TOKENS
+    @transactional
+    def revoke_token(self, jti, expires_at):
+        """Revoke a JWT by its jti until it expires (naive UTC datetime)."""
+        self.blocklist.revoke(jti, expires_at)
+
+    def is_token_revoked(self, jti):
+        return self.blocklist.is_revoked(jti)
+
+    @transactional
+    def purge_revoked_tokens(self):
+        """Drop the revocations of tokens that have expired, return how many."""
+        return self.blocklist.purge_expired()
+
+    def get_all_users(self, fields=None):
+        """Serialized users, selecting only the columns fields needs."""
+        profile = None if fields is None else self.user_repo.fieldset_profile(fields)
+        users = self.user_repo.get_all(profile)
+        return user_serializer.dump_many(users, fields)
+
+    @transactional
     def update_user(self, user_id, user_data):
         user = self.get_user(user_id)
         if user:
@@ -87,24 +247,40 @@ class HBnBFacade:
             for key, value in user_data.items():
                 setattr(user, key, value)
             self.user_repo.update(user)
+            # Places embed their owner's name and email
+            self._invalidate(f"user:{user.id}", f"principal:{user.id}",
+                             *[f"place:{place.id}" for place in user.places])
             return user
         return None
 
+    @transactional
     def delete_user(self, user_id):
         user = self.get_user(user_id)
         if user:
+            self._invalidate(
+                f"user:{user.id}", f"principal:{user.id}",
+                *[f"place:{place.id}" for place in user.places],
+                # Reviews left by others go with the places
+                *[f"review:{review.id}" for place in user.places for review in place.reviews],
+                *[f"review:{review.id}" for review in user.reviews],
+                *[f"place:{review.place_id}" for review in user.reviews])
             # Supprime d'abord les places et critiques associées
+            place_ids = {place.id for place in user.places}
             for place in user.places:
-                self.place_repo.delete(place)
+                self.place_repo.delete(place)  # with all of its reviews
             for review in user.reviews:
-                self.review_repo.delete(review)
+                if review.place_id not in place_ids:
+                    self.place_repo.add_rating(review.place_id, -1, -review.rating)
 
-            # Puis supprime l'utilisateur
+            # Puis supprime l'utilisateur, et par cascade ses critiques
+            # restantes (celles de ses places sont déjà supprimées)
+            self.user_repo.expire(user, 'reviews')
             self.user_repo.delete(user)
             return True
         return False
 
     # AMENITIES
+    @transactional
     def create_amenity(self, amenity_data):
         name = amenity_data.get("name", "")
         if not name or len(name) > 50:
@@ -114,35 +290,69 @@ class HBnBFacade:
         self.amenity_repo.add(amenity_obj)
         return amenity_obj
 
+    @transactional
+    def create_amenities_bulk(self, items, owner_id=None):
+        """
+        Validate and insert many amenities in one transaction.
+        Returns (created, errors): [{"index", "id"}], [{"index", "message"}].
+        """
+        def check(item):
+            name = item.get("name", "")
+            if not isinstance(name, str) or not name or len(name) > 50:
+                raise ValueError("Invalid 'name': must be non-empty and ≤ 50 characters.")
+
+        valid, errors = self._check_bulk_items(items, check)
+        mappings, created = [], []
+        for index, item in valid:
+            amenity_id = new_id()
+            mappings.append({"id": amenity_id, "name": item["name"], "owner_id": owner_id})
+            created.append({"index": index, "id": amenity_id})
+        self.amenity_repo.bulk_add(mappings)
+        return created, errors
+
     def get_amenity(self, amenity_id):
         return self.amenity_repo.get(amenity_id)
 
     def get_all_amenities(self):
         return self.amenity_repo.get_all()
 
+    @transactional
     def update_amenity(self, amenity_id, data):
         amenity = self.amenity_repo.get(amenity_id)
         if not amenity:
             return None
         amenity.update(data)
         self.amenity_repo.add(amenity)
+        # Places embed the names of their amenities
+        self._invalidate(f"amenity:{amenity.id}",
+                         *[f"place:{place.id}" for place in amenity.places])
         return amenity
 
+    @transactional
     def delete_amenity(self, amenity_id):
         amenity = self.amenity_repo.get(amenity_id)
         if amenity:
+            self._invalidate(f"amenity:{amenity.id}",
+                             *[f"place:{place.id}" for place in amenity.places])
             self.amenity_repo.delete(amenity)
             return True
         return False
 
     # PLACES
+    def _get_amenities(self, amenity_ids):
+        """Resolve amenity ids with one IN query, raise ValueError on unknown ids."""
+        if not isinstance(amenity_ids, list) or not all(isinstance(a, str) for a in amenity_ids):
+            raise ValueError("Invalid 'amenities': must be a list of IDs.")
+        amenity_ids = list(dict.fromkeys(amenity_ids))
+        found = self.amenity_repo.get_many(amenity_ids)
+        unknown = [a for a in amenity_ids if a not in found]
+        if unknown:
+            raise ValueError(f"Amenities not found: {', '.join(unknown)}")
+        return [found[a] for a in amenity_ids]
+
+    @transactional
     def create_place(self, place_data):
-        if place_data["price"] < 0:
-            raise ValueError("Price must be a non-negative value.")
-        if not (-90 <= place_data["latitude"] <= 90):
-            raise ValueError("Latitude must be between -90 and 90.")
-        if not (-180 <= place_data["longitude"] <= 180):
-            raise ValueError("Longitude must be between -180 and 180.")
+        self._check_place_data(place_data)
 
         owner = self.user_repo.get(place_data["owner_id"])
         if not owner:
@@ -159,20 +369,100 @@ class HBnBFacade:
         place_obj.amenities = []
 
         if "amenities" in place_data:
-            for amenity_id in place_data["amenities"]:
-                amenity_obj = self.amenity_repo.get(amenity_id)
-                if amenity_obj:
-                    place_obj.amenities.append(amenity_obj)
+            place_obj.amenities = self._get_amenities(place_data["amenities"])
 
         self.place_repo.add(place_obj)
         return place_obj
 
-    def get_place(self, place_id):
-        return self.place_repo.get(place_id)
+    @transactional
+    def create_places_bulk(self, items):
+        """
+        Validate and insert many places in one transaction.
+        Owners and amenities of the whole batch are resolved with one IN
+        query each. Returns (created, errors) like create_amenities_bulk.
+        """
+        valid, errors = self._check_bulk_items(items, self._check_place_data)
+        owner_ids = self._existing(self.user_repo, (item["owner_id"] for _, item in valid))
+        amenity_ids = self._existing(
+            self.amenity_repo, (a for _, item in valid for a in item.get("amenities", [])))
+
+        mappings, links, created = [], [], []
+        for index, item in valid:
+            if item["owner_id"] not in owner_ids:
+                errors.append({"index": index, "message": "Owner not found."})
+                continue
+            amenities = list(dict.fromkeys(item.get("amenities", [])))
+            unknown = [a for a in amenities if a not in amenity_ids]
+            if unknown:
+                errors.append({"index": index,
+                               "message": f"Amenities not found: {', '.join(unknown)}"})
+                continue
+            place_id = new_id()
+            mappings.append({
+                "id": place_id,
+                "title": item["title"],
+                "description": item.get("description", ""),
+                "price": item["price"],
+                "latitude": item["latitude"],
+                "longitude": item["longitude"],
+                "owner_id": item["owner_id"]
+            })
+            links.extend((place_id, amenity_id) for amenity_id in amenities)
+            created.append({"index": index, "id": place_id})
+
+        self.place_repo.bulk_add(mappings)
+        self.place_repo.bulk_add_amenity_links(links)
+        errors.sort(key=lambda e: e["index"])
+        return created, errors
 
-    def get_all_places(self):
-        return self.place_repo.get_all()
+    def get_place(self, place_id):
+        return self.place_repo.get(place_id, profile='detail_view')
+
+    def _places_profile(self, fields):
+        """Full list_view, or only what a sparse fieldset reads."""
+        if fields is None:
+            return 'list_view'
+        return self.place_repo.fieldset_profile(fields)
+
+    def get_all_places(self, filters=None, sort=None, fields=None):
+        return self.place_repo.get_all(profile=self._places_profile(fields),
+                                       filters=filters, sort=sort)
+
+    def iter_places(self, filters=None, sort=None, fields=None):
+        """All matching places as a lazily fetched stream, for exports."""
+        return self.place_repo.iter_all(profile=self._places_profile(fields),
+                                        filters=filters, sort=sort)
+
+    def get_places_page(self, limit, cursor=None, filters=None, sort=None,
+                        fields=None):
+        """Return (places, next_cursor) for one keyset page of places."""
+        return self.place_repo.get_page(limit, cursor,
+                                        profile=self._places_profile(fields),
+                                        filters=filters, sort=sort)
+
+    @transactional
+    def recompute_place_ratings(self):
+        """Rebuild every place's review aggregates, returns the number of places."""
+        count = self.place_repo.recompute_ratings()
+        self.cache.clear()
+        after_commit(self.cache.clear)
+        return count
+
+    def get_places_nearby(self, latitude, longitude, radius_km, limit):
+        """Return [(place, distance_km)] within radius_km, nearest first."""
+        # NaN passes every range check below and never ends the cover loops
+        if not all(math.isfinite(v) for v in (latitude, longitude, radius_km)):
+            raise ValueError("Latitude, longitude and radius must be finite numbers.")
+        if not (-90 <= latitude <= 90):
+            raise ValueError("Latitude must be between -90 and 90.")
+        if not (-180 <= longitude <= 180):
+            raise ValueError("Longitude must be between -180 and 180.")
+        if radius_km <= 0:
+            raise ValueError("Radius must be a positive value.")
+        return self.place_repo.get_nearby(latitude, longitude, radius_km,
+                                          limit, profile='list_view')
 
+    @transactional
     def update_place(self, place_id, data):
         place = self.place_repo.get(place_id)
         if not place:
@@ -192,34 +482,33 @@ class HBnBFacade:
             data.pop("owner_id")
 
         if "amenities" in data:
-            new_amenities = []
-            for amenity_id in data["amenities"]:
-                amenity_obj = self.amenity_repo.get(amenity_id)
-                if amenity_obj:
-                    new_amenities.append(amenity_obj)
-            place.amenities = new_amenities
+            place.amenities = self._get_amenities(data["amenities"])
             data.pop("amenities")
 
         place.update(data)
         self.place_repo.add(place)
+        self._invalidate(f"place:{place.id}")
         return place
 
+    @transactional
     def delete_place(self, place_id):
         place = self.place_repo.get(place_id)
         if place:
+            self._invalidate(f"place:{place.id}",
+                             *[f"review:{review.id}" for review in place.reviews])
             self.place_repo.delete(place)
             return True
         return False
 
     # REVIEWS
+    @transactional
     def create_review(self, review_data):
         required = ["text", "rating", "user_id", "place_id"]
         for field in required:
             if field not in review_data:
                 raise ValueError(f"Missing required field: {field}")
 
-        if not (1 <= review_data["rating"] <= 5):
-            raise ValueError("Rating must be between 1 and 5.")
+        self._check_rating(review_data["rating"])
 
         user = self.user_repo.get(review_data["user_id"])
         if not user:
@@ -235,30 +524,103 @@ class HBnBFacade:
             place=place
         )
         self.review_repo.add(review_obj)
+        self.place_repo.add_rating(place.id, 1, review_obj.rating)
+        self._invalidate(f"place:{place.id}")
         return review_obj
 
+    @transactional
+    def create_reviews_bulk(self, items):
+        """
+        Validate and insert many reviews in one transaction.
+        Authors and places of the whole batch are resolved with one IN
+        query each. Returns (created, errors) like create_amenities_bulk.
+        """
+        def check(item):
+            for field in ("text", "rating", "user_id", "place_id"):
+                if field not in item:
+                    raise ValueError(f"Missing required field: {field}")
+            if not isinstance(item["place_id"], str):
+                raise ValueError("Invalid 'place_id': must be a string.")
+            if not isinstance(item["text"], str) or not item["text"]:
+                raise ValueError("Invalid 'text': must be non-empty.")
+            self._check_rating(item["rating"])
+
+        valid, errors = self._check_bulk_items(items, check)
+        user_ids = self._existing(self.user_repo, (item["user_id"] for _, item in valid))
+        place_ids = self._existing(self.place_repo, (item["place_id"] for _, item in valid))
+
+        mappings, created = [], []
+        for index, item in valid:
+            if item["user_id"] not in user_ids:
+                errors.append({"index": index, "message": "User not found."})
+                continue
+            if item["place_id"] not in place_ids:
+                errors.append({"index": index, "message": "Place not found."})
+                continue
+            review_id = new_id()
+            mappings.append({
+                "id": review_id,
+                "text": item["text"],
+                "rating": item["rating"],
+                "user_id": item["user_id"],
+                "place_id": item["place_id"]
+            })
+            created.append({"index": index, "id": review_id})
+
+        self.review_repo.bulk_add(mappings)
+
+        ratings = {}
+        for mapping in mappings:
+            count, total = ratings.get(mapping["place_id"], (0, 0))
+            ratings[mapping["place_id"]] = (count + 1, total + mapping["rating"])
+        for place_id, (count, total) in ratings.items():
+            self.place_repo.add_rating(place_id, count, total)
+        self._invalidate(*[f"place:{place_id}" for place_id in ratings])
+
+        errors.sort(key=lambda e: e["index"])
+        return created, errors
+
     def get_review(self, review_id):
         return self.review_repo.get(review_id)
 
-    def get_all_reviews(self):
-        return self.review_repo.get_all()
+    def get_all_reviews(self, fields=None):
+        profile = None if fields is None else self.review_repo.fieldset_profile(fields)
+        return self.review_repo.get_all(profile)
 
-    def get_reviews_by_place(self, place_id):
-        return [r for r in self.review_repo.get_all() if r.place.id == place_id]
+    def iter_reviews(self, fields=None):
+        """All reviews as a lazily fetched stream, for exports."""
+        profile = None if fields is None else self.review_repo.fieldset_profile(fields)
+        return self.review_repo.iter_all(profile)
 
+    def get_reviews_by_place(self, place_id, fields=None):
+        profile = None if fields is None else self.review_repo.fieldset_profile(fields)
+        return self.review_repo.get_by_place(place_id, profile)
+
+    @transactional
     def update_review(self, review_id, data):
         review = self.review_repo.get(review_id)
         if not review:
             return None
-        if "rating" in data and not (1 <= data["rating"] <= 5):
-            raise ValueError("Rating must be between 1 and 5.")
+        if "rating" in data:
+            self._check_rating(data["rating"])
+        old_place_id, old_rating = review.place_id, review.rating
         review.update(data)
         self.review_repo.add(review)
+        if review.place_id == old_place_id:
+            self.place_repo.add_rating(old_place_id, 0, review.rating - old_rating)
+        else:
+            self.place_repo.add_rating(old_place_id, -1, -old_rating)
+            self.place_repo.add_rating(review.place_id, 1, review.rating)
+        self._invalidate(f"review:{review.id}", f"place:{old_place_id}",
+                         f"place:{review.place_id}")
         return review
 
+    @transactional
     def delete_review(self, review_id):
         review = self.review_repo.get(review_id)
         if review:
+            self._invalidate(f"review:{review.id}", f"place:{review.place_id}")
+            self.place_repo.add_rating(review.place_id, -1, -review.rating)
             self.review_repo.delete(review)
             return True
         return False
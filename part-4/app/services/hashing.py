@@ -0,0 +1,43 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ExecutorBusy(RuntimeError):
+    """Raised when a BoundedExecutor has no free slot."""
+
+
+class BoundedExecutor:
+    """
+    Runs CPU-heavy calls (bcrypt hashes) on at most max_workers threads.
+    At most max_pending more calls wait in line; beyond that run() raises
+    ExecutorBusy right away instead of piling request threads up behind
+    the hashes.
+    """
+
+    def __init__(self, max_workers=4, max_pending=32):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers,
+                                        thread_name_prefix='password-hash')
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+
+    def run(self, fn, *args):
+        """Call fn(*args) on the pool and wait for its result."""
+        if not self._slots.acquire(blocking=False):
+            raise ExecutorBusy("Too many concurrent password checks, retry later.")
+        try:
+            future = self._pool.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future.result()
+
+    def shutdown(self, wait=False):
+        """Stop the threads once the calls already submitted are done."""
+        self._pool.shutdown(wait=wait)
+
+
+def create_hash_executor(app_config):
+    """Build the password hashing executor from PASSWORD_HASH_* settings."""
+    return BoundedExecutor(max_workers=app_config.get('PASSWORD_HASH_WORKERS', 4),
+                           max_pending=app_config.get('PASSWORD_HASH_QUEUE', 32))
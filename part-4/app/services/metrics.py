@@ -0,0 +1,298 @@
+"""
+Runtime metrics in the Prometheus text exposition format.
+
+Counters, gauges and histograms live in process memory behind one lock
+per metric, so recording a value costs a dict update.
+
+With several worker processes (gunicorn), a scrape reaches only one of
+them: when METRICS_DIR is set, every process writes a snapshot of its
+values to <METRICS_DIR>/metrics-<pid>-<token>.json at most every
+METRICS_FLUSH_SECONDS, and /metrics sums the snapshots of all of them.
+The token is drawn once per process, so a recycled worker that gets
+the pid of an exited one does not overwrite its file; it renames the
+older files of its pid to exited-<pid>-<token>.json instead. Counters
+and histograms of exited workers are kept so the totals never go down;
+gauges only count the processes still alive. Empty the directory when
+the server starts.
+"""
+import atexit
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def _sample_name(name, labels):
+    """'name{k="v",...}' as written in the exposition format."""
+    if not labels:
+        return name
+    return name + '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, description, labels=()):
+        self.name = name
+        self.description = description
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+        self._values = {}  # label values -> value
+
+    def reset(self):
+        with self._lock:
+            self._values = {}
+
+    def _labels(self, values):
+        if len(values) != len(self.labels):
+            raise ValueError(f"{self.name} expects labels {self.labels}")
+        return tuple(zip(self.labels, values))
+
+    def samples(self):
+        """{sample name: value} of every label set recorded so far."""
+        with self._lock:
+            return {_sample_name(self.name, self._labels(key)): value
+                    for key, value in self._values.items()}
+
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, *label_values, amount=1):
+        self.inc(*label_values, amount=-amount)
+
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, description, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, description, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, *label_values):
+        with self._lock:
+            state = self._values.get(label_values)
+            if state is None:
+                # [count per bucket..., count above the last bucket, sum]
+                state = self._values[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            else:
+                state[len(self.buckets)] += 1
+            state[-1] += value
+
+    def samples(self):
+        with self._lock:
+            values = {key: list(state) for key, state in self._values.items()}
+        samples = {}
+        for key, state in values.items():
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), state):
+                cumulative += count
+                samples[_sample_name(f'{self.name}_bucket',
+                                     labels + (('le', _format_value(bound)),))] = cumulative
+            samples[_sample_name(f'{self.name}_sum', labels)] = state[-1]
+            samples[_sample_name(f'{self.name}_count', labels)] = cumulative
+        return samples
+
+
+class Registry:
+    """The metrics of this process, and the snapshots of its siblings."""
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = {}
+        self.directory = None
+        self.flush_seconds = 1.0
+        self._flushed_at = 0.0
+        self._flush_lock = threading.Lock()
+        self._token = None  # drawn at the first flush of each process
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, description, labels=()):
+        return self.register(Counter(name, description, labels))
+
+    def gauge(self, name, description, labels=()):
+        return self.register(Gauge(name, description, labels))
+
+    def histogram(self, name, description, labels=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, description, labels, buckets))
+
+    def set_collector(self, key, collect):
+        """
+        collect() returns [(name, kind, description, {sample name: value})],
+        read at every snapshot. Setting a key again replaces its collector.
+        """
+        self._collectors[key] = collect
+
+    def configure(self, app_config):
+        """Apply METRICS_DIR and METRICS_FLUSH_SECONDS."""
+        self.directory = app_config.get('METRICS_DIR')
+        self.flush_seconds = app_config.get('METRICS_FLUSH_SECONDS', 1.0)
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+
+    def reset(self):
+        """Forget the values recorded so far (a forked child starts at zero)."""
+        for metric in self._metrics:
+            metric.reset()
+        self._flushed_at = 0.0
+        self._token = None
+
+    def snapshot(self):
+        """{name: {'kind', 'description', 'samples'}} of this process."""
+        families = {}
+        for metric in self._metrics:
+            families[metric.name] = {'kind': metric.kind, 'description': metric.description,
+                                     'samples': metric.samples()}
+        for collect in list(self._collectors.values()):
+            for name, kind, description, samples in collect():
+                family = families.setdefault(
+                    name, {'kind': kind, 'description': description, 'samples': {}})
+                family['samples'].update(samples)
+        return families
+
+    def _path(self, state, pid, token):
+        return os.path.join(self.directory, f'{state}-{pid}-{token}.json')
+
+    def _start_process(self, pid):
+        """Draw this process's token, retire the files left under its pid."""
+        self._token = uuid.uuid4().hex[:12]
+        for path in glob.glob(self._path('metrics', pid, '*')):
+            token = os.path.basename(path)[:-len('.json')].split('-', 2)[2]
+            os.replace(path, self._path('exited', pid, token))
+
+    def flush(self):
+        """Write this process's snapshot to METRICS_DIR (no-op without it)."""
+        if not self.directory:
+            return
+        with self._flush_lock:
+            pid = os.getpid()
+            if self._token is None:
+                self._start_process(pid)
+            path = self._path('metrics', pid, self._token)
+            tmp = f'{path}.tmp'
+            with open(tmp, 'w') as f:
+                json.dump(self.snapshot(), f)
+            os.replace(tmp, path)
+            self._flushed_at = time.monotonic()
+
+    def maybe_flush(self):
+        """flush() unless this process flushed less than flush_seconds ago."""
+        if self.directory and time.monotonic() - self._flushed_at >= self.flush_seconds:
+            self.flush()
+
+    def collect(self):
+        """Snapshot of this process, or the sum over every process."""
+        if not self.directory:
+            return self.snapshot()
+        self.flush()
+        merged = {}
+        paths = (glob.glob(self._path('metrics', '*', '*')) +
+                 glob.glob(self._path('exited', '*', '*')))
+        for path in sorted(paths):
+            state, pid, _ = os.path.basename(path)[:-len('.json')].split('-', 2)
+            try:
+                with open(path) as f:
+                    families = json.load(f)
+            except (OSError, ValueError):
+                continue
+            alive = state == 'metrics' and _pid_alive(int(pid))
+            for name, family in families.items():
+                if family['kind'] == 'gauge' and not alive:
+                    continue
+                target = merged.setdefault(name, {'kind': family['kind'],
+                                                  'description': family['description'],
+                                                  'samples': {}})
+                for sample, value in family['samples'].items():
+                    target['samples'][sample] = target['samples'].get(sample, 0) + value
+        return merged
+
+
+def _pid_alive(pid):
+    if pid == os.getpid():
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def add_hit_ratios(families, hits='hbnb_cache_hits_total',
+                   misses='hbnb_cache_misses_total', ratio='hbnb_cache_hit_ratio'):
+    """Derive hits / (hits + misses) per cache from the summed counters."""
+    if hits not in families:
+        return families
+    samples = {}
+    for sample, hit_count in families[hits]['samples'].items():
+        labels = sample[len(hits):]
+        lookups = hit_count + families.get(misses, {}).get('samples', {}).get(misses + labels, 0)
+        samples[ratio + labels] = hit_count / lookups if lookups else 0.0
+    families[ratio] = {'kind': 'gauge', 'description': 'Cache hits per lookup',
+                       'samples': samples}
+    return families
+
+
+def render(families):
+    """Prometheus text exposition of collect()'s result."""
+    lines = []
+    for name, family in families.items():
+        lines.append(f'# HELP {name} {family["description"]}')
+        lines.append(f'# TYPE {name} {family["kind"]}')
+        for sample, value in family['samples'].items():
+            lines.append(f'{sample} {_format_value(value)}')
+    return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+os.register_at_fork(after_in_child=registry.reset)
+atexit.register(lambda: registry.directory and registry.flush())
+
+HTTP_REQUESTS = registry.counter(
+    'hbnb_http_requests_total', 'HTTP requests served', ('method', 'route', 'status'))
+HTTP_LATENCY = registry.histogram(
+    'hbnb_http_request_duration_seconds', 'Time to serve an HTTP request',
+    ('method', 'route'))
+HTTP_IN_FLIGHT = registry.gauge(
+    'hbnb_http_requests_in_flight', 'HTTP requests being served')
+DB_POOL_CHECKOUT = registry.histogram(
+    'hbnb_db_pool_checkout_seconds', 'Time to get a connection from the pool',
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0))
+PASSWORD_VERIFY = registry.histogram(
+    'hbnb_password_verify_seconds',
+    'bcrypt password checks, including the wait for a free hasher thread')
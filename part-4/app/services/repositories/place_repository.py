@@ -1,7 +1,180 @@
-from app.models.place import Place
+from sqlalchemy import and_, func, or_
+from sqlalchemy.orm import joinedload, selectinload
+from app import db
+from app.models.amenity import Amenity
+from app.models.place import Place, place_amenity
+from app.models.user import User
+from app.persistence import geo
 from app.persistence.repository import SQLAlchemyRepository
 
 
 class PlaceRepository(SQLAlchemyRepository):
+    # Each endpoint picks a profile so serializing a place never lazy-loads
+    # its owner or amenities row by row
+    load_profiles = {
+        'list_view': lambda: [
+            joinedload(Place.owner),
+            selectinload(Place.amenities),
+        ],
+        'detail_view': lambda: [
+            joinedload(Place.owner),
+            selectinload(Place.amenities),
+        ],
+    }
+
+    field_columns = {
+        'average_rating': ('review_count', 'rating_sum'),
+    }
+    field_loaders = {
+        'owner': lambda: joinedload(Place.owner).load_only(
+            User.id, User.first_name, User.last_name, User.email),
+        'amenities': lambda: selectinload(Place.amenities).load_only(
+            Amenity.id, Amenity.name),
+    }
+
     def __init__(self):
         super().__init__(Place)
+
+    def _sort_keys(self, sort=None):
+        """
+        Named sort orders:
+          - average_rating / -average_rating: by average rating, places
+            without reviews count as 0
+        """
+        if sort in ('average_rating', '-average_rating'):
+            rating = func.coalesce(Place.average_rating, 0)
+            return [(rating, sort.startswith('-'))]
+        return super()._sort_keys(sort)
+
+    def get_version(self, ids=None, filters=None):
+        """
+        Place payloads embed the owner and the amenities, so their
+        updated_at is part of the version too.
+        """
+        count, places_updated = super().get_version(ids, filters)
+        scope = self._version_query(ids, filters).subquery()
+        owners_updated = db.session.query(func.max(User.updated_at)).join(
+            Place, Place.owner_id == User.id
+        ).filter(Place.id.in_(db.select(scope.c.id))).scalar()
+        amenities_updated = db.session.query(func.max(Amenity.updated_at)).join(
+            place_amenity, place_amenity.c.amenity_id == Amenity.id
+        ).filter(place_amenity.c.place_id.in_(db.select(scope.c.id))).scalar()
+        return count, places_updated, owners_updated, amenities_updated
+
+    def version_of(self, place):
+        """Same as get_version([place.id]), from the loaded owner and amenities."""
+        return (1, place.updated_at,
+                place.owner.updated_at if place.owner else None,
+                max((a.updated_at for a in place.amenities), default=None))
+
+    def add_rating(self, place_id, count_delta, sum_delta):
+        """
+        Shift the review aggregates of a place with an atomic
+        UPDATE ... SET review_count = review_count + ?.
+        """
+        if not count_delta and not sum_delta:
+            return
+        db.session.query(Place).filter(Place.id == place_id).update({
+            Place.review_count: Place.review_count + count_delta,
+            Place.rating_sum: Place.rating_sum + sum_delta
+        }, synchronize_session='evaluate')
+
+    def recompute_ratings(self):
+        """Rebuild review_count and rating_sum of every place from the reviews."""
+        from app.models.review import Review
+        count = db.session.query(func.count(Review.id)).filter(
+            Review.place_id == Place.id).scalar_subquery()
+        total = db.session.query(func.coalesce(func.sum(Review.rating), 0)).filter(
+            Review.place_id == Place.id).scalar_subquery()
+        return db.session.query(Place).update({
+            Place.review_count: count,
+            Place.rating_sum: total
+        }, synchronize_session=False)
+
+    def bulk_add(self, mappings):
+        # bulk inserts bypass the before_insert event that sets the geohash
+        for mapping in mappings:
+            mapping['geohash'] = geo.encode(mapping['latitude'], mapping['longitude'])
+            mapping.setdefault('review_count', 0)
+            mapping.setdefault('rating_sum', 0)
+        super().bulk_add(mappings)
+
+    def bulk_add_amenity_links(self, links):
+        """Insert (place_id, amenity_id) pairs into place_amenity."""
+        if links:
+            db.session.execute(place_amenity.insert(), [
+                {'place_id': place_id, 'amenity_id': amenity_id}
+                for place_id, amenity_id in links
+            ])
+
+    def _apply_filters(self, query, filters):
+        """
+        Supported filters:
+          - min_price / max_price: price range (ix_places_price)
+          - min_lat / max_lat / min_lon / max_lon: bounding box
+            (ix_places_latitude_longitude)
+          - amenities: list of amenity ids, the place must have all of them
+            (ix_place_amenity_amenity_id)
+        """
+        filters = dict(filters)
+        if 'min_price' in filters:
+            query = query.filter(Place.price >= filters.pop('min_price'))
+        if 'max_price' in filters:
+            query = query.filter(Place.price <= filters.pop('max_price'))
+        if 'min_lat' in filters:
+            query = query.filter(Place.latitude >= filters.pop('min_lat'))
+        if 'max_lat' in filters:
+            query = query.filter(Place.latitude <= filters.pop('max_lat'))
+        if 'min_lon' in filters:
+            query = query.filter(Place.longitude >= filters.pop('min_lon'))
+        if 'max_lon' in filters:
+            query = query.filter(Place.longitude <= filters.pop('max_lon'))
+        if 'amenities' in filters:
+            amenity_ids = set(filters.pop('amenities'))
+            if amenity_ids:
+                matching = (
+                    db.session.query(place_amenity.c.place_id)
+                    .filter(place_amenity.c.amenity_id.in_(amenity_ids))
+                    .group_by(place_amenity.c.place_id)
+                    .having(func.count(place_amenity.c.amenity_id) == len(amenity_ids))
+                )
+                query = query.filter(Place.id.in_(matching))
+        if filters:
+            return super()._apply_filters(query, filters)
+        return query
+
+    def get_nearby(self, latitude, longitude, radius_km, limit, profile=None):
+        """
+        Places within radius_km of a point, nearest first.
+        Returns a list of (place, distance_km).
+
+        Candidates come from range scans on ix_places_geohash over the
+        geohash cells covering the circle, then the exact haversine
+        distance filters and sorts them. Only (id, latitude, longitude)
+        is read for candidates, full rows are loaded for the results.
+        """
+        prefixes = geo.covering_prefixes(latitude, longitude, radius_km)
+        candidates = db.session.query(
+            Place.id, Place.latitude, Place.longitude
+        ).filter(or_(*[
+            and_(Place.geohash >= prefix,
+                 Place.geohash < geo.prefix_upper_bound(prefix))
+            for prefix in prefixes
+        ]))
+
+        distances = []
+        for place_id, lat, lon in candidates:
+            distance = geo.haversine_km(latitude, longitude, lat, lon)
+            if distance <= radius_km:
+                distances.append((distance, place_id))
+        distances.sort()
+        distances = distances[:limit]
+        if not distances:
+            return []
+
+        places = {
+            p.id: p for p in self._query(profile).filter(
+                Place.id.in_([place_id for _, place_id in distances]))
+        }
+        return [(places[place_id], distance)
+                for distance, place_id in distances if place_id in places]
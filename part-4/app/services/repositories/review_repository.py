@@ -1,7 +1,35 @@
+from sqlalchemy.orm import joinedload
+from app.models.place import Place
 from app.models.review import Review
+from app.models.user import User
 from app.persistence.repository import SQLAlchemyRepository
 
 
 class ReviewRepository(SQLAlchemyRepository):
+    field_loaders = {
+        'user': lambda: joinedload(Review.user).load_only(
+            User.id, User.first_name, User.last_name),
+        'place': lambda: joinedload(Review.place).load_only(Place.id, Place.title),
+    }
+
     def __init__(self):
         super().__init__(Review)
+
+    def _apply_filters(self, query, filters):
+        """Supported filters: place_id (ix_reviews_place_id)."""
+        filters = dict(filters)
+        if 'place_id' in filters:
+            query = query.filter(Review.place_id == filters.pop('place_id'))
+        if filters:
+            return super()._apply_filters(query, filters)
+        return query
+
+    def get_by_place(self, place_id, profile=None):
+        """Reviews of one place, served by the index on reviews.place_id."""
+        return self._query(profile).filter(
+            Review.place_id == place_id).order_by(Review.created_at).all()
+
+    def get_by_user(self, user_id, profile=None):
+        """Reviews written by one user, served by the index on reviews.user_id."""
+        return self._query(profile).filter(
+            Review.user_id == user_id).order_by(Review.created_at).all()
@@ -1,27 +1,16 @@
+from sqlalchemy.orm import selectinload
+from app.models.place import Place
 from app.models.user import User
-from app import db
+from app.persistence.repository import SQLAlchemyRepository
 
 
-class UserRepository:
-    def __init__(self):
-        self.model = User
-
-    def add(self, user):
-        db.session.add(user)
-        db.session.commit()
-
-    def get(self, user_id):
-        return self.model.query.get(user_id)
+class UserRepository(SQLAlchemyRepository):
+    field_loaders = {
+        'places': lambda: selectinload(User.places).load_only(Place.id, Place.title),
+    }
 
-    def get_all(self):
-        return self.model.query.all()
+    def __init__(self):
+        super().__init__(User)
 
     def get_user_by_email(self, email):
         return self.model.query.filter_by(email=email).first()
-
-    def update(self, user):
-        db.session.commit()
-
-    def delete(self, user):
-        db.session.delete(user)
-        db.session.commit()
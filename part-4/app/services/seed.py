@@ -0,0 +1,179 @@
+"""
+Synthetic dataset generator behind `flask seed`.
+
+Rows go through the repositories' bulk_add (one executemany per table
+and batch, no ORM unit of work), one transaction per batch. Every user
+gets the same password hash, computed once at the configured bcrypt
+cost, instead of one bcrypt call per user in User.__init__.
+"""
+import math
+import random
+import unicodedata
+import uuid
+
+from app import bcrypt
+from app.persistence.ids import new_id
+from app.persistence.unit_of_work import transaction
+
+# (name, latitude, longitude); places are scattered around these
+CITIES = [
+    ("Paris", 48.8566, 2.3522), ("London", 51.5074, -0.1278),
+    ("New York", 40.7128, -74.0060), ("Tokyo", 35.6762, 139.6503),
+    ("Barcelona", 41.3874, 2.1686), ("Rome", 41.9028, 12.4964),
+    ("Berlin", 52.5200, 13.4050), ("Amsterdam", 52.3676, 4.9041),
+    ("Lisbon", 38.7223, -9.1393), ("Istanbul", 41.0082, 28.9784),
+    ("Marrakesh", 31.6295, -7.9811), ("Cape Town", -33.9249, 18.4241),
+    ("Dubai", 25.2048, 55.2708), ("Mumbai", 19.0760, 72.8777),
+    ("Bangkok", 13.7563, 100.5018), ("Singapore", 1.3521, 103.8198),
+    ("Sydney", -33.8688, 151.2093), ("Auckland", -36.8485, 174.7633),
+    ("Los Angeles", 34.0522, -118.2437), ("San Francisco", 37.7749, -122.4194),
+    ("Mexico City", 19.4326, -99.1332), ("Buenos Aires", -34.6037, -58.3816),
+    ("Rio de Janeiro", -22.9068, -43.1729), ("Montreal", 45.5019, -73.5674),
+    ("Reykjavik", 64.1466, -21.9426), ("Seoul", 37.5665, 126.9780),
+]
+# Standard deviation of the distance to the city center, in degrees (~10 km)
+CITY_SPREAD = 0.09
+
+FIRST_NAMES = ["Alice", "Bruno", "Chloé", "David", "Emma", "Farid", "Giulia", "Hugo",
+               "Inès", "Jules", "Kenji", "Léa", "Mateo", "Nora", "Omar", "Paula",
+               "Quentin", "Rosa", "Samir", "Tess", "Ugo", "Vera", "Wen", "Yasmine"]
+LAST_NAMES = ["Martin", "Bernard", "Dubois", "Garcia", "Rossi", "Müller", "Smith",
+              "Silva", "Kowalski", "Nakamura", "Haddad", "Nguyen", "Johansson",
+              "Moreau", "Costa", "Fischer", "Lopez", "Kim", "Petit", "Novak"]
+AMENITY_NAMES = ["WiFi", "Swimming Pool", "Air Conditioning", "Kitchen", "Parking",
+                 "Washer", "Dryer", "Heating", "TV", "Workspace", "Balcony",
+                 "Garden", "Gym", "Hot Tub", "Fireplace", "Elevator", "Breakfast",
+                 "Pets Allowed", "Sea View", "Bike Rental", "Dishwasher",
+                 "Coffee Maker", "Baby Cot", "EV Charger", "Sauna", "BBQ Grill",
+                 "Crib", "Piano", "Game Console", "Rooftop Terrace"]
+ADJECTIVES = ["Cosy", "Sunny", "Quiet", "Bright", "Modern", "Charming", "Spacious",
+              "Rustic", "Elegant", "Tiny", "Stylish", "Central"]
+KINDS = ["studio", "loft", "apartment", "flat", "house", "room", "villa", "cabin",
+         "townhouse", "suite"]
+REVIEW_TEXTS = ["Great stay, would come back.", "Lovely host and a perfect location.",
+                "Clean and quiet, exactly as described.", "A bit noisy at night.",
+                "Good value for the price.", "The photos do not do it justice!",
+                "Check-in was easy and fast.", "Smaller than expected but comfortable.",
+                "Amazing view from the balcony.", "Would not recommend."]
+# Most reviews are good ones
+RATING_WEIGHTS = [1, 2, 5, 12, 15]
+
+
+def _ascii(text):
+    return unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode()
+
+
+class Seeder:
+    """Generates users, amenities, places, their amenity links and reviews."""
+
+    def __init__(self, facade, password, rng=None, batch_size=10000):
+        self.facade = facade
+        self.rng = rng or random.Random()
+        self.batch_size = batch_size
+        self.password_hash = bcrypt.generate_password_hash(password).decode('utf-8')
+        # Keeps the emails of successive runs apart
+        self.run_tag = uuid.uuid4().hex[:6]
+
+    def _batches(self, total):
+        for start in range(0, total, self.batch_size):
+            yield start, min(self.batch_size, total - start)
+
+    def seed_users(self, count, progress=None):
+        """Insert count users, return their ids."""
+        rng, user_ids = self.rng, []
+        for start, size in self._batches(count):
+            mappings = []
+            for i in range(start, start + size):
+                first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+                user_id = new_id()
+                user_ids.append(user_id)
+                mappings.append({
+                    "id": user_id, "first_name": first, "last_name": last,
+                    "email": _ascii(f"{first}.{last}.{self.run_tag}{i}@example.com").lower(),
+                    "password": self.password_hash, "is_admin": False,
+                })
+            with transaction():
+                self.facade.user_repo.bulk_add(mappings)
+            if progress:
+                progress("users", start + size, count)
+        return user_ids
+
+    def seed_amenities(self, count):
+        """Insert count amenities, return their ids."""
+        mappings = [{
+            "id": new_id(),
+            "name": AMENITY_NAMES[i % len(AMENITY_NAMES)]
+                    + (f" {i // len(AMENITY_NAMES) + 1}" if i >= len(AMENITY_NAMES) else ""),
+            "owner_id": None,
+        } for i in range(count)]
+        with transaction():
+            self.facade.amenity_repo.bulk_add(mappings)
+        return [m["id"] for m in mappings]
+
+    def _place(self, owner_id):
+        rng = self.rng
+        city, lat, lon = rng.choice(CITIES)
+        latitude = max(-90.0, min(90.0, rng.gauss(lat, CITY_SPREAD)))
+        # Same spread in km east-west as north-south
+        spread = CITY_SPREAD / max(0.1, math.cos(math.radians(lat)))
+        longitude = (rng.gauss(lon, spread) + 180.0) % 360.0 - 180.0
+        return {
+            "id": new_id(),
+            "title": f"{rng.choice(ADJECTIVES)} {rng.choice(KINDS)} in {city}",
+            "description": f"{rng.choice(KINDS).capitalize()} near the center of {city}.",
+            "price": round(rng.lognormvariate(4.5, 0.6), 2),
+            "latitude": latitude, "longitude": longitude, "owner_id": owner_id,
+        }
+
+    def seed_places(self, count, user_ids, amenity_ids, amenities_per_place=3,
+                    reviews_per_place=3, progress=None):
+        """
+        Insert count places with their amenity links and reviews.
+        Reviewers are distinct users other than the owner.
+        Returns (links, reviews) inserted.
+        """
+        if count and not user_ids:
+            raise ValueError("Places need at least one user to own them.")
+        rng = self.rng
+        amenities_per_place = min(amenities_per_place, len(amenity_ids))
+        reviews_per_place = min(reviews_per_place, len(user_ids) - 1)
+        total_links = total_reviews = 0
+        for start, size in self._batches(count):
+            places, links, reviews = [], [], []
+            for _ in range(size):
+                owner_id = rng.choice(user_ids)
+                place = self._place(owner_id)
+                place_id = place["id"]
+                links.extend((place_id, amenity_id) for amenity_id in
+                             rng.sample(amenity_ids, amenities_per_place))
+                reviewers = [u for u in rng.sample(user_ids, reviews_per_place + 1)
+                             if u != owner_id][:reviews_per_place]
+                ratings = rng.choices(range(1, 6), weights=RATING_WEIGHTS, k=len(reviewers))
+                reviews.extend({
+                    "id": new_id(), "text": rng.choice(REVIEW_TEXTS), "rating": rating,
+                    "user_id": user_id, "place_id": place_id,
+                } for user_id, rating in zip(reviewers, ratings))
+                place["review_count"] = len(ratings)
+                place["rating_sum"] = sum(ratings)
+                places.append(place)
+            with transaction():
+                self.facade.place_repo.bulk_add(places)
+                self.facade.place_repo.bulk_add_amenity_links(links)
+                self.facade.review_repo.bulk_add(reviews)
+            total_links += len(links)
+            total_reviews += len(reviews)
+            if progress:
+                progress("places", start + size, count)
+        return total_links, total_reviews
+
+    def run(self, places, users=None, amenities=30, amenities_per_place=3,
+            reviews_per_place=3, progress=None):
+        """Generate a whole dataset, return the number of rows per table."""
+        users = users if users is not None else max(2, places // 10)
+        user_ids = self.seed_users(users, progress)
+        amenity_ids = self.seed_amenities(amenities) if amenities else []
+        links, reviews = self.seed_places(places, user_ids, amenity_ids,
+                                          amenities_per_place, reviews_per_place, progress)
+        self.facade.cache.clear()
+        return {"users": users, "amenities": amenities, "places": places,
+                "place_amenity": links, "reviews": reviews}
@@ -0,0 +1,158 @@
+"""
+Serialization of the models into API dicts.
+
+Each Serializer precompiles one extractor per field (operator.attrgetter
+or a function of the instance), so dumping an object is a single pass
+over prebuilt callables. fields= selects a sparse fieldset, include=
+picks the embedded relations, and the compiled subsets are memoized.
+"""
+from operator import attrgetter
+
+# Upper bound on memoized fieldsets per serializer (they come from clients)
+MAX_FIELDSETS = 256
+
+
+class Serializer:
+    def __init__(self, fields, default=None, relations=()):
+        """
+        fields: name -> attribute path, or function(instance) -> value.
+        default: names serialized when no fieldset is requested (all fields
+        unless given).
+        relations: names of the embedded resources, chosen with include=.
+        """
+        self._extractors = {
+            name: attrgetter(spec) if isinstance(spec, str) else spec
+            for name, spec in fields.items()
+        }
+        self.field_names = tuple(fields)
+        self.default_fields = self.field_names if default is None else tuple(default)
+        self.relations = tuple(relations)
+        self._fieldsets = {}
+
+    def fieldset(self, fields=None):
+        """
+        (name, extractor) pairs of the requested fields, in declaration
+        order; the default fields when fields is None.
+        Raises ValueError on unknown field names.
+        """
+        key = frozenset(self.default_fields if fields is None else fields)
+        compiled = self._fieldsets.get(key)
+        if compiled is None:
+            unknown = key - self._extractors.keys()
+            if unknown:
+                raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}. "
+                                 f"Available: {', '.join(self.field_names)}.")
+            compiled = tuple((name, get) for name, get in self._extractors.items()
+                             if name in key)
+            if len(self._fieldsets) < MAX_FIELDSETS:
+                self._fieldsets[key] = compiled
+        return compiled
+
+    def covers(self, fields):
+        """True if fields is a subset of the default fields."""
+        return fields is None or set(fields) <= set(self.default_fields)
+
+    def dump(self, obj, fields=None):
+        """Serialize one instance, None stays None."""
+        if obj is None:
+            return None
+        return {name: get(obj) for name, get in self.fieldset(fields)}
+
+    def dump_many(self, objs, fields=None):
+        fieldset = self.fieldset(fields)
+        return [{name: get(obj) for name, get in fieldset} for obj in objs]
+
+    def parse_fields(self, value, include=None):
+        """
+        Fieldset of the fields= and include= query string values, None when
+        both are absent. include= replaces the embedded relations of the
+        fieldset: ?include=owner keeps the default columns plus owner.
+        Raises ValueError on unknown names and on an empty fieldset.
+        """
+        fields = _split(value) if value is not None else None
+        if include is not None:
+            included = _split(include)
+            unknown = set(included) - set(self.relations)
+            if unknown:
+                raise ValueError(f"Unknown include: {', '.join(sorted(unknown))}. "
+                                 f"Available: {', '.join(self.relations) or 'none'}.")
+            base = self.default_fields if fields is None else fields
+            fields = [name for name in base if name not in self.relations] + included
+        if fields is not None:
+            if not fields:
+                raise ValueError("Empty fieldset: name at least one field.")
+            self.fieldset(fields)
+        return fields
+
+    def project(self, data, fields=None):
+        """
+        Sparse fieldset of an already serialized default dict (e.g. a
+        cached one); fields must be covered by the defaults.
+        """
+        if data is None or fields is None:
+            return data
+        return {name: data[name] for name, _ in self.fieldset(fields)}
+
+
+def _split(value):
+    return [name.strip() for name in value.split(',') if name.strip()]
+
+
+# Public part of a user embedded in other resources
+owner_serializer = Serializer({
+    'id': 'id',
+    'first_name': 'first_name',
+    'last_name': 'last_name',
+    'email': 'email',
+})
+
+author_serializer = Serializer({
+    'id': 'id',
+    'first_name': 'first_name',
+    'last_name': 'last_name',
+})
+
+place_summary_serializer = Serializer({
+    'id': 'id',
+    'title': 'title',
+})
+
+user_serializer = Serializer({
+    'id': 'id',
+    'first_name': 'first_name',
+    'last_name': 'last_name',
+    'email': 'email',
+    'is_admin': lambda u: bool(u.is_admin),
+    'places': lambda u: place_summary_serializer.dump_many(u.places),
+}, default=('id', 'first_name', 'last_name', 'email', 'is_admin'),
+   relations=('places',))
+
+amenity_serializer = Serializer({
+    'id': 'id',
+    'name': 'name',
+})
+
+place_serializer = Serializer({
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'price': 'price',
+    'latitude': 'latitude',
+    'longitude': 'longitude',
+    'average_rating': 'average_rating',
+    'review_count': 'review_count',
+    'owner_id': 'owner_id',
+    'owner': lambda p: owner_serializer.dump(p.owner),
+    'amenities': lambda p: amenity_serializer.dump_many(p.amenities),
+}, relations=('owner', 'amenities'))
+
+review_serializer = Serializer({
+    'id': 'id',
+    'text': 'text',
+    'rating': 'rating',
+    'user_id': 'user_id',
+    'place_id': 'place_id',
+    'user': lambda r: author_serializer.dump(r.user),
+    'place': lambda r: place_summary_serializer.dump(r.place),
+}, default=('id', 'text', 'rating', 'user_id', 'place_id'),
+   relations=('user', 'place'))
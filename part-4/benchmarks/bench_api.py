@@ -0,0 +1,305 @@
+"""
+Load test of the v1 API and microbenchmarks of the facade.
+
+Seeds a temporary SQLite database with N places, their owners, amenity
+links and reviews (app/services/seed.py), then for every endpoint issues
+requests through the Flask test client and records the p50/p99 latency
+and the number of SQL statements per request (X-Query-Count). The facade
+methods behind them are timed on their own. The entity cache is
+cleared before every call unless --warm-cache is given, so the numbers
+are those of the database path.
+
+The results are written as JSON; --baseline compares them with an
+earlier run and exits with status 1 on a regression: a p50 slower by
+more than --threshold, or more queries per request.
+
+Usage (from part-4/):
+    python -m benchmarks.bench_api --sizes 10000 100000 --output after.json
+    python -m benchmarks.bench_api --sizes 10000 --baseline before.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import func
+
+from app import create_app, db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.services import facade
+from app.services.seed import CITIES, Seeder
+from app.services.serializers import place_serializer
+from benchmarks.bench_nearby import BATCH_SIZE, BenchConfig
+
+PLACES_PER_USER = 10
+AMENITIES = 50
+AMENITIES_PER_PLACE = 3
+REVIEWS_PER_PLACE = 2
+# bcrypt runs at full cost, so logins are few
+LOGIN_REQUESTS = 10
+PASSWORD = "bench-password"
+
+
+class ApiBenchConfig(BenchConfig):
+    SLOW_QUERY_MS = None
+    METRICS_ENABLED = False
+
+
+def seed(count, rng):
+    """Insert `count` places with the seeder of `flask seed`, return ids to query."""
+    Seeder(facade, PASSWORD, rng, BATCH_SIZE).run(
+        count, users=max(2, count // PLACES_PER_USER), amenities=AMENITIES,
+        amenities_per_place=AMENITIES_PER_PLACE, reviews_per_place=REVIEWS_PER_PLACE)
+    sample = func.random()
+    return {
+        "users": [row.id for row in db.session.query(User.id).order_by(sample).limit(1000)],
+        "email": db.session.query(User.email).first().email,
+        "amenities": [row.id for row in db.session.query(Amenity.id)],
+        "places": [row.id for row in db.session.query(Place.id).order_by(sample).limit(1000)],
+        "reviews": [row.id for row in db.session.query(Review.id).order_by(sample).limit(1000)],
+    }
+
+
+def city_point(rng):
+    """A point in one of the seeded cities, where the places are."""
+    _, lat, lon = rng.choice(CITIES)
+    return rng.gauss(lat, 0.05), rng.gauss(lon, 0.05)
+
+
+def endpoints(ids, rng, token):
+    """[(name, method, url(), json body(), headers, requests cap)]"""
+    auth = {"Authorization": f"Bearer {token}"}
+
+    def place():
+        return rng.choice(ids["places"])
+
+    def nearby():
+        lat, lon = city_point(rng)
+        return f"/api/v1/places/nearby?lat={lat}&lon={lon}&radius_km=2"
+
+    def bbox():
+        lat, lon = city_point(rng)
+        return (f"/api/v1/places/?limit=20&min_lat={lat - 0.05}&max_lat={lat + 0.05}"
+                f"&min_lon={lon - 0.05}&max_lon={lon + 0.05}")
+
+    def new_place():
+        lat, lon = city_point(rng)
+        return {"title": "Bench new place", "price": 100.0, "latitude": lat,
+                "longitude": lon, "owner_id": ids["users"][0],
+                "amenities": rng.sample(ids["amenities"], 2)}
+
+    return [
+        ("places_page", "GET", lambda: "/api/v1/places/?limit=20", None, {}, None),
+        ("places_page_sparse", "GET",
+         lambda: "/api/v1/places/?limit=20&fields=id,title,price", None, {}, None),
+        ("places_price_sorted", "GET",
+         lambda: "/api/v1/places/?limit=20&min_price=100&max_price=200"
+                 "&sort=-average_rating", None, {}, None),
+        ("places_bbox", "GET", bbox, None, {}, None),
+        ("places_nearby", "GET", nearby, None, {}, None),
+        ("place_detail", "GET", lambda: f"/api/v1/places/{place()}", None, {}, None),
+        ("place_reviews", "GET", lambda: f"/api/v1/places/{place()}/reviews",
+         None, {}, None),
+        ("review_detail", "GET",
+         lambda: f"/api/v1/reviews/{rng.choice(ids['reviews'])}", None, {}, None),
+        ("user_detail", "GET",
+         lambda: f"/api/v1/users/{rng.choice(ids['users'])}", None, {}, None),
+        ("amenities_list", "GET", lambda: "/api/v1/amenities/", None, {}, None),
+        ("place_create", "POST", lambda: "/api/v1/places/", new_place, auth, None),
+        ("login", "POST", lambda: "/api/v1/auth/login",
+         lambda: {"email": ids["email"], "password": PASSWORD}, {}, LOGIN_REQUESTS),
+    ]
+
+
+def percentiles(samples_ms):
+    ordered = sorted(samples_ms)
+    return {"p50_ms": round(statistics.median(ordered), 3),
+            "p99_ms": round(ordered[max(0, math.ceil(len(ordered) * 0.99) - 1)], 3)}
+
+
+def bench_endpoints(app, ids, requests, warm_cache, rng):
+    client = app.test_client()
+    with app.app_context():
+        token = create_access_token(identity={"id": ids["users"][0], "is_admin": False})
+    results = {}
+    for name, method, url, body, headers, cap in endpoints(ids, rng, token):
+        latencies, queries, statuses = [], [], {}
+        for _ in range(min(requests, cap or requests)):
+            if not warm_cache:
+                facade.cache.clear()
+            started = time.perf_counter()
+            response = client.open(url(), method=method,
+                                   json=body() if body else None, headers=headers)
+            response.get_data()
+            latencies.append((time.perf_counter() - started) * 1000)
+            queries.append(int(response.headers.get("X-Query-Count", 0)))
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        results[name] = {
+            "requests": len(latencies), **percentiles(latencies),
+            "queries_mean": round(statistics.mean(queries), 2),
+            "queries_max": max(queries),
+            "statuses": {str(code): n for code, n in sorted(statuses.items())},
+        }
+    return results
+
+
+def bench_facade(app, ids, repeat, warm_cache, rng):
+    """p50/p99 of the facade calls behind the endpoints."""
+    calls = {
+        "get_place_data": lambda: facade.get_place_data(rng.choice(ids["places"])),
+        "get_places_page": lambda: facade.get_places_page(20),
+        "get_places_page_sorted": lambda: facade.get_places_page(
+            20, filters={"min_price": 100.0, "max_price": 200.0}, sort="-average_rating"),
+        "get_places_nearby": lambda: facade.get_places_nearby(*city_point(rng), 2, 20),
+        "get_reviews_by_place": lambda: facade.get_reviews_by_place(rng.choice(ids["places"])),
+        "get_version_place": lambda: facade.get_version("place", rng.choice(ids["places"])),
+        "get_principal": lambda: facade.get_principal(rng.choice(ids["users"])),
+        "dump_places_page": lambda: place_serializer.dump_many(
+            facade.get_places_page(100)[0]),
+    }
+    results = {}
+    with app.app_context():
+        for name, call in calls.items():
+            latencies = []
+            for _ in range(repeat):
+                if not warm_cache:
+                    facade.cache.clear()
+                    facade.principals.clear()
+                started = time.perf_counter()
+                call()
+                latencies.append((time.perf_counter() - started) * 1000)
+                db.session.remove()
+            results[name] = percentiles(latencies)
+    return results
+
+
+def run_size(count, requests, repeat, warm_cache, rng):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    ApiBenchConfig.SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+    app = create_app(ApiBenchConfig)
+    try:
+        with app.app_context():
+            db.create_all()
+            started = time.perf_counter()
+            ids = seed(count, rng)
+            seed_seconds = time.perf_counter() - started
+            db.session.remove()
+        endpoint_results = bench_endpoints(app, ids, requests, warm_cache, rng)
+        facade_results = bench_facade(app, ids, repeat, warm_cache, rng)
+        with app.app_context():
+            db.engine.dispose()
+    finally:
+        os.remove(path)
+    return {
+        "places": count,
+        "reviews": count * REVIEWS_PER_PLACE,
+        "seed_seconds": round(seed_seconds, 2),
+        "endpoints": endpoint_results,
+        "facade": facade_results,
+    }
+
+
+def metadata(args):
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "date": datetime.utcnow().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "machine": platform.machine(),
+        "requests": args.requests,
+        "repeat": args.repeat,
+        "warm_cache": args.warm_cache,
+        "seed": args.seed,
+    }
+
+
+def compare(baseline, current, threshold):
+    """Print the p50 ratios against baseline, return the regressions."""
+    regressions = []
+    previous = {size["places"]: size for size in baseline["sizes"]}
+    for size in current["sizes"]:
+        before = previous.get(size["places"])
+        if before is None:
+            continue
+        for group in ("endpoints", "facade"):
+            for name, now in size[group].items():
+                then = before[group].get(name)
+                if then is None:
+                    continue
+                ratio = now["p50_ms"] / then["p50_ms"] if then["p50_ms"] else 1.0
+                flags = []
+                if ratio > threshold:
+                    flags.append("slower")
+                if now.get("queries_max", 0) > then.get("queries_max", 0):
+                    flags.append(f"queries {then['queries_max']} -> {now['queries_max']}")
+                print(f"{size['places']:>9} {group:<9} {name:<24} "
+                      f"{then['p50_ms']:>9.3f} -> {now['p50_ms']:>9.3f} ms  x{ratio:.2f}"
+                      f"{'  REGRESSION: ' + ', '.join(flags) if flags else ''}")
+                if flags:
+                    regressions.append((size["places"], group, name, flags))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000],
+                        help="Numbers of places, e.g. 10000 100000 1000000")
+    parser.add_argument("--requests", type=int, default=200,
+                        help="Requests per endpoint")
+    parser.add_argument("--repeat", type=int, default=200,
+                        help="Calls per facade method")
+    parser.add_argument("--warm-cache", action="store_true",
+                        help="Keep the entity cache between calls")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="Compare with the JSON of an earlier run")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="p50 ratio above which a result is a regression")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    report = {"meta": metadata(args), "sizes": []}
+    for count in args.sizes:
+        result = run_size(count, args.requests, args.repeat, args.warm_cache, rng)
+        report["sizes"].append(result)
+        print(f"{count} places, seeded in {result['seed_seconds']}s")
+        for group in ("endpoints", "facade"):
+            for name, stats in result[group].items():
+                queries = (f"  {stats['queries_mean']:.1f} queries"
+                           if "queries_mean" in stats else "")
+                print(f"  {group:<9} {name:<24} p50 {stats['p50_ms']:>9.3f} ms  "
+                      f"p99 {stats['p99_ms']:>9.3f} ms{queries}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.baseline}")
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""
+Benchmark of the geohash radius search (PlaceRepository.get_nearby).
+
+Seeds a temporary SQLite database with N places spread uniformly over
+the globe, then times /places/nearby style queries against a full scan
+of the table. The radius shrinks as N grows so every query returns
+about the same number of places: with the geohash index the query time
+stays roughly flat while the full scan grows linearly with N.
+
+Usage (from part-4/):
+    python -m benchmarks.bench_nearby --sizes 10000 100000 1000000
+"""
+import argparse
+import json
+import math
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from app import create_app, db
+from app.models.place import Place
+from app.models.user import User
+from app.persistence import geo
+from app.services.repositories.place_repository import PlaceRepository
+
+BATCH_SIZE = 10000
+# Expected number of places inside the search circle
+TARGET_HITS = 20
+EARTH_SURFACE_KM2 = 510072000
+
+
+class BenchConfig:
+    TESTING = True
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SECRET_KEY = "bench"
+
+
+def seed_places(count, rng):
+    """Insert `count` places with bulk core inserts, return the owner id."""
+    owner_id = str(uuid.uuid4())
+    now = datetime.utcnow()
+    db.session.execute(User.__table__.insert(), [{
+        "id": owner_id, "first_name": "Bench", "last_name": "Owner",
+        "email": f"{owner_id}@bench.io", "password": "x", "is_admin": False,
+        "created_at": now, "updated_at": now,
+    }])
+    for start in range(0, count, BATCH_SIZE):
+        rows = []
+        for _ in range(min(BATCH_SIZE, count - start)):
+            # Uniform on the sphere, not on the lat/lon rectangle
+            lat = math.degrees(math.asin(rng.uniform(-1, 1)))
+            lon = rng.uniform(-180, 180)
+            rows.append({
+                "id": str(uuid.uuid4()), "title": "Bench place",
+                "description": None, "price": rng.uniform(10, 500),
+                "latitude": lat, "longitude": lon,
+                "geohash": geo.encode(lat, lon), "owner_id": owner_id,
+                "created_at": now, "updated_at": now,
+            })
+        db.session.execute(Place.__table__.insert(), rows)
+    db.session.commit()
+    return owner_id
+
+
+def radius_for(count):
+    """Radius (km) whose circle holds TARGET_HITS places on average."""
+    return math.sqrt(TARGET_HITS * EARTH_SURFACE_KM2 / count / math.pi)
+
+
+def full_scan(lat, lon, radius_km):
+    """What a radius search costs without a spatial index."""
+    rows = db.session.query(Place.id, Place.latitude, Place.longitude).all()
+    return [r for r in rows
+            if geo.haversine_km(lat, lon, r.latitude, r.longitude) <= radius_km]
+
+
+def run_size(count, queries, scans, rng):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    BenchConfig.SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+    app = create_app(BenchConfig)
+    try:
+        with app.app_context():
+            db.create_all()
+            started = time.perf_counter()
+            seed_places(count, rng)
+            seed_seconds = time.perf_counter() - started
+
+            repo = PlaceRepository()
+            radius_km = radius_for(count)
+            points = [(math.degrees(math.asin(rng.uniform(-0.9, 0.9))),
+                       rng.uniform(-180, 180)) for _ in range(queries)]
+
+            nearby_ms, hits = [], []
+            for lat, lon in points:
+                started = time.perf_counter()
+                results = repo.get_nearby(lat, lon, radius_km, limit=100)
+                nearby_ms.append((time.perf_counter() - started) * 1000)
+                hits.append(len(results))
+                db.session.expunge_all()
+
+            scan_ms = []
+            for lat, lon in points[:scans]:
+                started = time.perf_counter()
+                full_scan(lat, lon, radius_km)
+                scan_ms.append((time.perf_counter() - started) * 1000)
+                db.session.expunge_all()
+
+            plan = db.session.execute(db.text(
+                "EXPLAIN QUERY PLAN SELECT id FROM places "
+                "WHERE geohash >= :lo AND geohash < :hi"),
+                {"lo": "u09", "hi": "u09{"}).fetchall()
+            db.session.remove()
+    finally:
+        os.remove(path)
+
+    return {
+        "places": count,
+        "radius_km": round(radius_km, 3),
+        "seed_seconds": round(seed_seconds, 2),
+        "mean_hits": round(statistics.mean(hits), 1),
+        "nearby_p50_ms": round(statistics.median(nearby_ms), 3),
+        "nearby_p99_ms": round(sorted(nearby_ms)[int(len(nearby_ms) * 0.99) - 1], 3),
+        "full_scan_p50_ms": round(statistics.median(scan_ms), 3),
+        "query_plan": [row[-1] for row in plan],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[10000, 100000, 1000000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--scans", type=int, default=3,
+                        help="Number of full-scan baseline queries per size")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    results = []
+    for count in args.sizes:
+        result = run_size(count, args.queries, args.scans, rng)
+        results.append(result)
+        print(json.dumps(result))
+
+    smallest, largest = results[0], results[-1]
+    growth = largest["places"] / smallest["places"]
+    print(f"x{growth:g} places: nearby p50 "
+          f"x{largest['nearby_p50_ms'] / smallest['nearby_p50_ms']:.2f}, "
+          f"full scan p50 "
+          f"x{largest['full_scan_p50_ms'] / smallest['full_scan_p50_ms']:.2f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
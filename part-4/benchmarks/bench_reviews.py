@@ -0,0 +1,172 @@
+"""
+Benchmark of the review lookups before and after migration 0002.
+
+Seeds a temporary SQLite database whose reviews table still has the
+legacy INTEGER user_id / place_id columns (already indexed by 0001),
+times review-by-place with their author and review-by-user with their
+place, runs the migrations, and times the same queries again. With the
+INTEGER affinity the joined users / places primary key cannot be used,
+so each query scans the joined table; after the migration it is an
+index lookup per review.
+
+Usage (from part-4/):
+    python -m benchmarks.bench_reviews --sizes 10000 100000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from sqlalchemy.orm import configure_mappers
+
+from app import create_app, db
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.persistence import migrations
+from app.services.repositories.review_repository import ReviewRepository
+from benchmarks.bench_nearby import BATCH_SIZE, BenchConfig
+
+REVIEWS_PER_USER = 10
+REVIEWS_PER_PLACE = 20
+
+LEGACY_REVIEWS = [
+    "DROP TABLE reviews",
+    "CREATE TABLE reviews (text VARCHAR(500) NOT NULL, rating INTEGER NOT NULL, "
+    "user_id INTEGER NOT NULL, place_id INTEGER NOT NULL, id VARCHAR(36) NOT NULL, "
+    "created_at DATETIME, updated_at DATETIME, PRIMARY KEY (id))",
+    "CREATE INDEX ix_reviews_user_id ON reviews (user_id)",
+    "CREATE INDEX ix_reviews_place_id ON reviews (place_id)",
+]
+
+
+def insert_batches(table, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        db.session.execute(table.insert(), rows[start:start + BATCH_SIZE])
+
+
+def seed_reviews(count, rng):
+    """Insert users, places and `count` reviews, return their user and place ids."""
+    now = datetime.utcnow()
+    user_ids = [str(uuid.uuid4()) for _ in range(max(1, count // REVIEWS_PER_USER))]
+    place_ids = [str(uuid.uuid4()) for _ in range(max(1, count // REVIEWS_PER_PLACE))]
+    insert_batches(User.__table__, [{
+        "id": user_id, "first_name": "Bench", "last_name": "User",
+        "email": f"{user_id}@bench.io", "password": "x", "is_admin": False,
+        "created_at": now, "updated_at": now,
+    } for user_id in user_ids])
+    insert_batches(Place.__table__, [{
+        "id": place_id, "title": "Bench place", "description": None,
+        "price": 100.0, "latitude": 0.0, "longitude": 0.0,
+        "owner_id": user_ids[0], "created_at": now, "updated_at": now,
+    } for place_id in place_ids])
+    insert_batches(Review.__table__, [{
+        "id": str(uuid.uuid4()), "text": "Bench review", "rating": rng.randint(1, 5),
+        "user_id": rng.choice(user_ids), "place_id": rng.choice(place_ids),
+        "created_at": now, "updated_at": now,
+    } for _ in range(count)])
+    db.session.commit()
+    return user_ids, place_ids
+
+
+def time_lookups(repo, user_ids, place_ids, queries, rng):
+    """p50 milliseconds of get_by_place(+user) and get_by_user(+place)."""
+    configure_mappers()  # creates the Review.user / Review.place backrefs
+    by_place = repo.fieldset_profile(['id', 'text', 'rating', 'user'])
+    by_user = repo.fieldset_profile(['id', 'text', 'rating', 'place'])
+    timings = {"by_place": [], "by_user": []}
+    for _ in range(queries):
+        for name, lookup, ids, profile in (
+                ("by_place", repo.get_by_place, place_ids, by_place),
+                ("by_user", repo.get_by_user, user_ids, by_user)):
+            key = rng.choice(ids)
+            started = time.perf_counter()
+            lookup(key, profile)
+            timings[name].append((time.perf_counter() - started) * 1000)
+            db.session.expunge_all()
+    return {name: round(statistics.median(ms), 3) for name, ms in timings.items()}
+
+
+def query_plans():
+    plans = {}
+    for name, sql in (
+            ("by_place", "SELECT * FROM reviews LEFT OUTER JOIN users "
+                         "ON users.id = reviews.user_id WHERE reviews.place_id = 'x'"),
+            ("by_user", "SELECT * FROM reviews LEFT OUTER JOIN places "
+                        "ON places.id = reviews.place_id WHERE reviews.user_id = 'x'")):
+        rows = db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        plans[name] = [row[-1] for row in rows]
+    return plans
+
+
+def run_size(count, queries, rng):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    BenchConfig.SQLALCHEMY_DATABASE_URI = f"sqlite:///{path}"
+    app = create_app(BenchConfig)
+    try:
+        with app.app_context():
+            db.create_all()
+            for statement in LEGACY_REVIEWS:
+                db.session.execute(db.text(statement))
+            db.session.commit()
+            user_ids, place_ids = seed_reviews(count, rng)
+
+            repo = ReviewRepository()
+            before = time_lookups(repo, user_ids, place_ids, queries, rng)
+            plans_before = query_plans()
+            db.session.remove()
+
+            started = time.perf_counter()
+            migrations.upgrade()
+            migrate_seconds = time.perf_counter() - started
+
+            after = time_lookups(repo, user_ids, place_ids, queries, rng)
+            plans_after = query_plans()
+            db.session.remove()
+    finally:
+        os.remove(path)
+
+    return {
+        "reviews": count,
+        "users": len(user_ids),
+        "places": len(place_ids),
+        "migrate_seconds": round(migrate_seconds, 2),
+        "by_place_p50_ms": {"before": before["by_place"], "after": after["by_place"]},
+        "by_user_p50_ms": {"before": before["by_user"], "after": after["by_user"]},
+        "query_plan": {"before": plans_before, "after": plans_after},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    results = []
+    for count in args.sizes:
+        result = run_size(count, args.queries, rng)
+        results.append(result)
+        print(json.dumps(result))
+        print(f"{count} reviews: by place "
+              f"x{result['by_place_p50_ms']['before'] / result['by_place_p50_ms']['after']:.1f}, "
+              f"by user "
+              f"x{result['by_user_p50_ms']['before'] / result['by_user_p50_ms']['after']:.1f} "
+              f"faster after the migration")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
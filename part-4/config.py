@@ -10,8 +10,54 @@ class Config:
     JWT_SECRET_KEY = SECRET_KEY
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(minutes=15)
     JWT_REFRESH_TOKEN_EXPIRES = timedelta(days=30)
+    # Revoked tokens: 'sql' (revoked_tokens table behind a bloom filter)
+    # or 'memory' (this process only)
+    JWT_BLOCKLIST = 'sql'
+    JWT_BLOCKLIST_BLOOM_CAPACITY = 100000
+    JWT_BLOCKLIST_BLOOM_ERROR_RATE = 0.01
+    # Longest delay before a token revoked on another worker is refused here
+    JWT_BLOCKLIST_SYNC_SECONDS = 5
 
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Primary keys: 'uuid4' (random) or 'uuid7' (time-ordered), stored as
+    # 'string' (VARCHAR(36)) or 'binary' (16 bytes). The storage only
+    # applies to new databases, existing rows are not converted.
+    ID_GENERATOR = 'uuid4'
+    ID_STORAGE = 'string'
+    # Statements slower than this are logged on 'app.sql' (None: never);
+    # X-Query-Count / Server-Timing response headers
+    SLOW_QUERY_MS = 200
+    QUERY_STATS_HEADERS = True
+    # Prometheus /metrics. With several worker processes, point METRICS_DIR
+    # at a directory shared by them (emptied at server start)
+    METRICS_ENABLED = True
+    METRICS_DIR = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+    METRICS_FLUSH_SECONDS = 1.0
+
+    # bcrypt work factor; hashes made with another cost are upgraded on login
+    BCRYPT_LOG_ROUNDS = 12
+    # Threads allowed to hash passwords at once, and calls allowed to wait
+    PASSWORD_HASH_WORKERS = 4
+    PASSWORD_HASH_QUEUE = 32
+
+    # Entity cache in front of the facade getters ('lru' or 'null')
+    CACHE_TYPE = 'lru'
+    CACHE_MAX_ENTRIES = 1024
+    CACHE_TTL_SECONDS = 60
+
+    # (id, is_admin) of token holders; deleting or demoting a user takes
+    # effect on other workers within AUTH_CACHE_TTL_SECONDS
+    AUTH_CACHE_TYPE = 'lru'
+    AUTH_CACHE_MAX_ENTRIES = 4096
+    AUTH_CACHE_TTL_SECONDS = 30
+
+    # Front-end origins allowed to call the API with credentials,
+    # comma-separated in the environment
+    CORS_ORIGINS = os.getenv(
+        'CORS_ORIGINS',
+        'http://localhost:5500,http://127.0.0.1:5500,'
+        'http://localhost:8000,http://127.0.0.1:8000'
+    ).split(',')
 
 class DevelopmentConfig(Config):
     DEBUG = True
@@ -20,13 +66,23 @@ class DevelopmentConfig(Config):
 
     SQLALCHEMY_DATABASE_URI = 'sqlite:///development.db'
 
+class ProductionConfig(Config):
+    # No built-in default: wsgi.py refuses to start without SECRET_KEY
+    SECRET_KEY = os.getenv('SECRET_KEY')
+    JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', SECRET_KEY)
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///production.db')
+    # Connections idle in a worker's pool may have been closed by the server
+    SQLALCHEMY_ENGINE_OPTIONS = {'pool_pre_ping': True}
+
 class TestConfig:
     TESTING = True
     SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SECRET_KEY = "secret_test_key"
+    BCRYPT_LOG_ROUNDS = 4
 
 config = {
     'development': DevelopmentConfig,
+    'production': ProductionConfig,
     'default': DevelopmentConfig
 }
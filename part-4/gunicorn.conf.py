@@ -0,0 +1,55 @@
+"""
+gunicorn settings of the production server:
+
+    SECRET_KEY=... gunicorn wsgi:app
+
+Each setting reads an environment variable, and command line flags
+override both.
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+bind = os.getenv('BIND', '0.0.0.0:8000')
+
+# bcrypt and JSON serialization are CPU bound: scale with processes,
+# and use threads to overlap the time spent waiting on the database
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv('GUNICORN_THREADS', 4))
+worker_class = 'gthread'
+
+# Import the app once in the master, the workers share its memory pages
+preload_app = os.getenv('GUNICORN_PRELOAD', '1') == '1'
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 30))
+# In-flight requests get this long to finish on SIGTERM
+graceful_timeout = int(os.getenv('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.getenv('GUNICORN_KEEPALIVE', 5))
+# Recycle workers after this many requests (0: never)
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = max_requests // 10
+
+accesslog = os.getenv('GUNICORN_ACCESS_LOG', '-')
+
+# Shared by the workers so /metrics sums all of them, see
+# app/services/metrics.py. Set before the app reads its configuration.
+metrics_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'hbnb-metrics'))
+
+
+def on_starting(server):
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir)
+    from wsgi import prepare_database
+    prepare_database()
+
+
+def post_fork(server, worker):
+    from wsgi import reset_after_fork
+    reset_after_fork()
+
+
+def worker_exit(server, worker):
+    from wsgi import shutdown
+    shutdown()
@@ -1,27 +1,11 @@
-from app import create_app, db
-from flask_cors import CORS
+from app import create_app
+from app.persistence import migrations
 
+# CORS (CORS_ORIGINS) and strict_slashes are set up by create_app()
 app = create_app()
 
-# /login et /login/ without 308
-app.url_map.strict_slashes = False
-
-# on autorise localhost:5500 et 127.0.0.1:5500
-CORS(
-    app,
-    origins=[
-        "http://localhost:5500",
-        "http://127.0.0.1:5500",
-        "http://localhost:8000",
-        "http://127.0.0.1:8000"
-    ],
-    supports_credentials=True,
-    allow_headers=["Content-Type", "Authorization"],
-    expose_headers=["Authorization"]
-)
-
-with app.app_context():
-    db.create_all()
-
 if __name__ == "__main__":
+    # Development server only, production runs wsgi:app under gunicorn
+    with app.app_context():
+        migrations.upgrade()
     app.run(host="127.0.0.1", port=5000, debug=True)
@@ -42,21 +42,33 @@ function initLogout() {
 
 /**
  * Affiche la liste des lieux et configure le filtre
+ * Les lieux sont chargés page par page (limit/cursor)
  */
-async function fetchPlaces() {
+const PLACES_PAGE_SIZE = 20;
+let nextPlacesCursor = null;
+let maxPriceFilter = "All";
+
+async function fetchPlaces(cursor = null) {
   try {
     const token = getCookie("token");
     const headers = { "Content-Type": "application/json" };
     if (token) headers["Authorization"] = "Bearer " + token;
 
-    const response = await fetch("http://127.0.0.1:5000/api/v1/places/", {
+    let url = `http://127.0.0.1:5000/api/v1/places/?limit=${PLACES_PAGE_SIZE}`;
+    if (cursor) url += `&cursor=${encodeURIComponent(cursor)}`;
+    if (maxPriceFilter !== "All") url += `&max_price=${maxPriceFilter}`;
+
+    const response = await fetch(url, {
       method: "GET",
       headers,
       credentials: "include",
     });
     if (response.ok) {
-      const places = await response.json();
-      displayPlaces(places);
+      const page = await response.json();
+      displayPlaces(page.places, cursor !== null);
+      nextPlacesCursor = page.next_cursor;
+      const loadMore = document.getElementById("load-more");
+      if (loadMore) loadMore.style.display = nextPlacesCursor ? "block" : "none";
     } else {
       console.error("Erreur fetchPlaces:", response.statusText);
     }
@@ -65,10 +77,19 @@ async function fetchPlaces() {
   }
 }
 
-function displayPlaces(places) {
+function initLoadMore() {
+  const loadMore = document.getElementById("load-more");
+  if (loadMore) {
+    loadMore.addEventListener("click", () => {
+      if (nextPlacesCursor) fetchPlaces(nextPlacesCursor);
+    });
+  }
+}
+
+function displayPlaces(places, append = false) {
   const list = document.getElementById("places-list");
   if (!list) return;
-  list.innerHTML = "";
+  if (!append) list.innerHTML = "";
 
   places.forEach((place) => {
     const card = document.createElement("div");
@@ -89,16 +110,15 @@ function viewDetails(placeId) {
   window.location.href = `place.html?id=${placeId}`;
 }
 
+/**
+ * Le filtrage par prix est fait par l'API (max_price)
+ */
 function initPriceFilter() {
   const filter = document.getElementById("price-filter");
   if (filter) {
     filter.addEventListener("change", (event) => {
-      const max = event.target.value;
-      document.querySelectorAll(".place-card").forEach((card) => {
-        const price = parseFloat(card.getAttribute("data-price"));
-        card.style.display =
-          max === "All" || price <= parseFloat(max) ? "block" : "none";
-      });
+      maxPriceFilter = event.target.value;
+      fetchPlaces();
     });
   }
 }
@@ -164,10 +184,11 @@ function displayPlaceDetails(place) {
 
 async function loadReviews(placeId) {
   try {
-    const res = await fetch("http://127.0.0.1:5000/api/v1/reviews/");
+    const res = await fetch(
+      `http://127.0.0.1:5000/api/v1/places/${placeId}/reviews`
+    );
     if (!res.ok) throw new Error(res.statusText);
-    const all = await res.json();
-    const reviews = all.filter((r) => r.place_id === placeId);
+    const reviews = await res.json();
 
     const container = document.getElementById("reviews");
     container.innerHTML = "<h3>Reviews</h3>";
@@ -270,6 +291,7 @@ document.addEventListener("DOMContentLoaded", () => {
 
   if (document.body.id === "index-page") {
     fetchPlaces();
+    initLoadMore();
     initPriceFilter();
   }
 
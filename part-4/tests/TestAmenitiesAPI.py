@@ -1,3 +1,5 @@
+import os
+import time
 import unittest
 import json
 import uuid
@@ -254,5 +256,96 @@ class AmenityAPITestCase(unittest.TestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+    def test_create_amenities_bulk(self):
+        """
+        Test bulk creation reports rejected items by index.
+        """
+        data = [{"name": "Sauna"}, {"name": ""}, {"name": "Garden"}]
+        response = self.client.post(
+            f"{self.base_url}/bulk",
+            data=json.dumps(data),
+            content_type="application/json",
+            headers={"Authorization": f"Bearer {self.owner_token}"}
+        )
+        self.assertEqual(response.status_code, 207)
+        resp_json = json.loads(response.data)
+        self.assertEqual([c["index"] for c in resp_json["created"]], [0, 2])
+        self.assertEqual([e["index"] for e in resp_json["errors"]], [1])
+
+        amenity = Amenity.query.filter_by(id=resp_json["created"][0]["id"]).first()
+        self.assertEqual(amenity.name, "Sauna")
+        self.assertEqual(amenity.owner_id, self.owner.id)
+
+    def test_conditional_get_amenities(self):
+        """
+        Test 304 responses for an amenity and the amenity list, and that
+        an update invalidates both ETags.
+        """
+        headers = {"Authorization": f"Bearer {self.owner_token}"}
+        amenity_id = self.client.post(f"{self.base_url}/", json={"name": "Pool"},
+                                      headers=headers).get_json()["id"]
+
+        item = self.client.get(f"{self.base_url}/{amenity_id}")
+        listing = self.client.get(f"{self.base_url}/")
+        for response in (item, listing):
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("ETag", response.headers)
+
+        response = self.client.get(f"{self.base_url}/{amenity_id}",
+                                   headers={"If-None-Match": item.headers["ETag"]})
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(f"{self.base_url}/",
+                                   headers={"If-None-Match": listing.headers["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+        self.client.put(f"{self.base_url}/{amenity_id}", json={"name": "Jacuzzi"},
+                        headers=headers)
+        response = self.client.get(f"{self.base_url}/{amenity_id}",
+                                   headers={"If-None-Match": item.headers["ETag"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["name"], "Jacuzzi")
+        response = self.client.get(f"{self.base_url}/",
+                                   headers={"If-None-Match": listing.headers["ETag"]})
+        self.assertEqual(response.status_code, 200)
+
+    def test_conditional_amenity_list_sees_older_rows(self):
+        """
+        Test the list ETag changes when an older amenity is updated (with a
+        local time zone behind UTC) or deleted, and that the list sends no
+        Last-Modified, which a deletion would not move.
+        """
+        previous_tz = os.environ.get("TZ")
+        os.environ["TZ"] = "America/New_York"
+        time.tzset()
+
+        def restore_tz():
+            if previous_tz is None:
+                os.environ.pop("TZ", None)
+            else:
+                os.environ["TZ"] = previous_tz
+            time.tzset()
+        self.addCleanup(restore_tz)
+
+        headers = {"Authorization": f"Bearer {self.owner_token}"}
+        ids = [self.client.post(f"{self.base_url}/", json={"name": name},
+                                headers=headers).get_json()["id"]
+               for name in ("Pool", "Sauna", "Gym")]
+
+        listing = self.client.get(f"{self.base_url}/")
+        self.assertNotIn("Last-Modified", listing.headers)
+        self.client.put(f"{self.base_url}/{ids[0]}", json={"name": "Jacuzzi"},
+                        headers=headers)
+        response = self.client.get(f"{self.base_url}/",
+                                   headers={"If-None-Match": listing.headers["ETag"]})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Jacuzzi", [a["name"] for a in response.get_json()])
+
+        etag = response.headers["ETag"]
+        self.client.delete(f"{self.base_url}/{ids[1]}",
+                           headers={"Authorization": f"Bearer {self.admin_token}"})
+        response = self.client.get(f"{self.base_url}/", headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()), 2)
+
 if __name__ == "__main__":
     unittest.main()
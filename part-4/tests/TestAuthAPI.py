@@ -1,9 +1,11 @@
 import unittest
 import json
 import uuid
-from app import create_app, db
+from app import create_app, db, bcrypt
 from app.models.user import User
 from flask_jwt_extended import decode_token
+from app.services import facade
+from app.services.hashing import BoundedExecutor
 
 class AuthAPITestCase(unittest.TestCase):
     """
@@ -96,6 +98,111 @@ class AuthAPITestCase(unittest.TestCase):
         self.assertIn("message", resp_json)
         self.assertEqual(resp_json["message"], "Invalid credentials")
 
+    def test_login_upgrades_password_cost(self):
+        """
+        Test a hash made with another bcrypt cost is replaced on login.
+        """
+        self.assertEqual(self.user.password.split("$")[2], "04")
+        self.user.password = bcrypt.generate_password_hash(
+            self.test_password, 5).decode("utf-8")
+        db.session.commit()
+
+        data = {"email": self.test_email, "password": self.test_password}
+        response = self.client.post(f"{self.base_url}/login", json=data)
+        self.assertEqual(response.status_code, 200)
+
+        db.session.expire_all()
+        user = User.query.filter_by(email=self.test_email).first()
+        self.assertEqual(user.password.split("$")[2], "04")
+        self.assertTrue(user.verify_password(self.test_password))
+
+    def test_login_busy_hasher(self):
+        """
+        Test logins are shed with 503 when every hashing slot is taken.
+        """
+        facade.hasher = BoundedExecutor(max_workers=1, max_pending=0)
+        facade.hasher._slots.acquire()  # a login already hashing
+
+        data = {"email": self.test_email, "password": self.test_password}
+        response = self.client.post(f"{self.base_url}/login", json=data)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers["Retry-After"], "1")
+
+        facade.hasher._slots.release()
+        response = self.client.post(f"{self.base_url}/login", json=data)
+        self.assertEqual(response.status_code, 200)
+
+    def test_new_app_stops_previous_hasher(self):
+        """
+        Test creating another app shuts the replaced hashing threads down.
+        """
+        previous = facade.hasher
+        previous.run(len, "warm up a thread")
+        create_app("config.TestConfig")
+        self.assertIsNot(facade.hasher, previous)
+        self.assertTrue(previous._pool._shutdown)
+        with self.assertRaises(RuntimeError):
+            previous.run(len, "too late")
+
+    def test_refresh_and_logout(self):
+        """
+        Test a refresh token yields new access tokens until logout revokes it.
+        """
+        data = {"email": self.test_email, "password": self.test_password}
+        tokens = self.client.post(f"{self.base_url}/login", json=data).get_json()
+        self.assertIn("refresh_token", tokens)
+        access = {"Authorization": f"Bearer {tokens['access_token']}"}
+        refresh = {"Authorization": f"Bearer {tokens['refresh_token']}"}
+
+        # Access tokens cannot be used to refresh
+        response = self.client.post(f"{self.base_url}/refresh", headers=access)
+        self.assertEqual(response.status_code, 422)
+
+        response = self.client.post(f"{self.base_url}/refresh", headers=refresh)
+        self.assertEqual(response.status_code, 200)
+        new_access = {"Authorization": f"Bearer {response.get_json()['access_token']}"}
+        response = self.client.get(f"{self.base_url}/protected", headers=new_access)
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.post(f"{self.base_url}/logout", headers=new_access,
+                                    json={"refresh_token": tokens["refresh_token"]})
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(f"{self.base_url}/protected", headers=new_access)
+        self.assertEqual(response.status_code, 401)
+        response = self.client.post(f"{self.base_url}/refresh", headers=refresh)
+        self.assertEqual(response.status_code, 401)
+        # Tokens not named in the logout stay valid
+        response = self.client.get(f"{self.base_url}/protected", headers=access)
+        self.assertEqual(response.status_code, 200)
+
+    def test_logout_rejects_foreign_refresh_token(self):
+        """
+        Test logout only revokes a refresh token of the caller, and not an
+        access token passed as one.
+        """
+        other = User(first_name="Other", last_name="Tester",
+                     email=f"{uuid.uuid4()}@example.com", password="other_password")
+        db.session.add(other)
+        db.session.commit()
+        mine = self.client.post(f"{self.base_url}/login", json={
+            "email": self.test_email, "password": self.test_password}).get_json()
+        theirs = self.client.post(f"{self.base_url}/login", json={
+            "email": other.email, "password": "other_password"}).get_json()
+        access = {"Authorization": f"Bearer {mine['access_token']}"}
+
+        for token in (theirs["refresh_token"], mine["access_token"]):
+            response = self.client.post(f"{self.base_url}/logout", headers=access,
+                                        json={"refresh_token": token})
+            self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(
+            f"{self.base_url}/refresh",
+            headers={"Authorization": f"Bearer {theirs['refresh_token']}"})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(f"{self.base_url}/protected", headers=access)
+        self.assertEqual(response.status_code, 200)
+
     def test_protected_with_valid_token(self):
         """
         Test accessing the protected endpoint with a valid JWT token returns 200.
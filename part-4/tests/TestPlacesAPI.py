@@ -1,8 +1,15 @@
+import base64
+import time
 import unittest
 import json
 import uuid
+from datetime import datetime, timedelta
+from unittest import mock
+from sqlalchemy import event
 from app import create_app, db
+from app.models.place import Place
 from app.models.user import User
+from app.services import facade
 from flask_jwt_extended import create_access_token
 
 class PlaceAPITestCase(unittest.TestCase):
@@ -224,6 +231,14 @@ class PlaceAPITestCase(unittest.TestCase):
         self.assertEqual(resp_json["title"], "New Title")
         self.assertEqual(resp_json["price"], 95)
 
+        for amenities in ([1], [[1]], "not-a-list"):
+            response = self.client.put(
+                f"{self.base_url}/{place_id}",
+                json={"amenities": amenities},
+                headers={"Authorization": f"Bearer {self.owner_token}"}
+            )
+            self.assertEqual(response.status_code, 400, amenities)
+
 
     def test_delete_place_non_owner(self):
         """
@@ -277,6 +292,623 @@ class PlaceAPITestCase(unittest.TestCase):
         )
         self.assertEqual(response.status_code, 200)
 
+    def test_get_places_paginated(self):
+        """
+        Test walking the place list with limit/cursor keyset pagination.
+        """
+        created = []
+        for i in range(5):
+            data = {
+                "title": f"Paged Place {i}",
+                "description": "Paged",
+                "price": 50 + i,
+                "latitude": 45.0,
+                "longitude": 10.0,
+                "owner_id": self.owner.id,
+                "amenities": []
+            }
+            post_resp = self.client.post(
+                f"{self.base_url}/",
+                json=data,
+                headers={"Authorization": f"Bearer {self.owner_token}"}
+            )
+            created.append(post_resp.get_json()["id"])
+
+        seen = []
+        cursor = None
+        while True:
+            url = f"{self.base_url}/?limit=2"
+            if cursor:
+                url += f"&cursor={cursor}"
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            resp_json = response.get_json()
+            self.assertLessEqual(len(resp_json["places"]), 2)
+            seen.extend(p["id"] for p in resp_json["places"])
+            cursor = resp_json["next_cursor"]
+            if cursor is None:
+                break
+
+        self.assertEqual(len(seen), 5)
+        self.assertEqual(set(seen), set(created))
+
+    def test_get_places_invalid_pagination(self):
+        """
+        Test that an invalid limit or cursor returns 400.
+        """
+        response = self.client.get(f"{self.base_url}/?limit=0")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(f"{self.base_url}/?limit=abc")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(f"{self.base_url}/?cursor=not-a-cursor")
+        self.assertEqual(response.status_code, 400)
+
+        # Well-formed cursors whose values do not have the sort key types
+        for sort, values in ((None, ["x", 1]),
+                             (None, [{"$dt": "2024-01-01T00:00:00"}, 1]),
+                             ("-average_rating", ["x", "id"]),
+                             ("-average_rating", [True, "id"])):
+            payload = json.dumps({"sort": sort, "after": values})
+            cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+            query = f"cursor={cursor}" + (f"&sort={sort}" if sort else "")
+            response = self.client.get(f"{self.base_url}/?{query}")
+            self.assertEqual(response.status_code, 400, values)
+
+    def test_cursor_is_bound_to_its_sort(self):
+        """
+        Test a next_cursor only continues the sort it was issued for.
+        """
+        headers = {"Authorization": f"Bearer {self.owner_token}"}
+        for title in ("First", "Second", "Third"):
+            self.client.post(f"{self.base_url}/", json={
+                "title": title, "price": 50, "latitude": 0.0, "longitude": 0.0,
+                "owner_id": self.owner.id, "amenities": []
+            }, headers=headers)
+
+        for issued, reused in (("", "&sort=-average_rating"),
+                               ("&sort=-average_rating", ""),
+                               ("&sort=-average_rating", "&sort=average_rating")):
+            cursor = self.client.get(
+                f"{self.base_url}/?limit=1{issued}").get_json()["next_cursor"]
+            response = self.client.get(
+                f"{self.base_url}/?limit=1&cursor={cursor}{reused}")
+            self.assertEqual(response.status_code, 400, (issued, reused))
+            response = self.client.get(
+                f"{self.base_url}/?limit=1&cursor={cursor}{issued}")
+            self.assertEqual(response.status_code, 200, issued)
+
+    def test_get_places_filtered(self):
+        """
+        Test price range, required amenities and bounding box filters.
+        """
+        amenity_ids = []
+        for name in ("Wifi", "Pool"):
+            resp = self.client.post(
+                "/api/v1/amenities/",
+                json={"name": name},
+                headers={"Authorization": f"Bearer {self.owner_token}"}
+            )
+            amenity_ids.append(resp.get_json()["id"])
+        wifi, pool = amenity_ids
+
+        specs = [
+            ("Cheap Paris", 50, 48.85, 2.35, [wifi]),
+            ("Mid Paris", 120, 48.86, 2.34, [wifi, pool]),
+            ("Pricey Marseille", 300, 43.29, 5.37, [wifi, pool]),
+        ]
+        for title, price, lat, lon, amenities in specs:
+            self.client.post(
+                f"{self.base_url}/",
+                json={
+                    "title": title,
+                    "description": "Filtered",
+                    "price": price,
+                    "latitude": lat,
+                    "longitude": lon,
+                    "owner_id": self.owner.id,
+                    "amenities": amenities
+                },
+                headers={"Authorization": f"Bearer {self.owner_token}"}
+            )
+
+        def titles(query):
+            response = self.client.get(f"{self.base_url}/?{query}")
+            self.assertEqual(response.status_code, 200)
+            return sorted(p["title"] for p in response.get_json())
+
+        self.assertEqual(titles("max_price=150"), ["Cheap Paris", "Mid Paris"])
+        self.assertEqual(titles("min_price=100&max_price=200"), ["Mid Paris"])
+        self.assertEqual(titles(f"amenities={wifi},{pool}"),
+                         ["Mid Paris", "Pricey Marseille"])
+        self.assertEqual(titles("min_lat=48&max_lat=49&min_lon=2&max_lon=3"),
+                         ["Cheap Paris", "Mid Paris"])
+        self.assertEqual(titles(f"amenities={pool}&max_price=200"), ["Mid Paris"])
+
+        response = self.client.get(f"{self.base_url}/?limit=1&max_price=150")
+        page = response.get_json()
+        self.assertEqual(len(page["places"]), 1)
+        self.assertIsNotNone(page["next_cursor"])
+
+        response = self.client.get(f"{self.base_url}/?min_price=cheap")
+        self.assertEqual(response.status_code, 400)
+        for query in ("min_price=nan", "max_price=inf", "min_lat=-inf"):
+            response = self.client.get(f"{self.base_url}/?{query}")
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_get_places_nearby(self):
+        """
+        Test the radius search returns only close places, nearest first.
+        """
+        specs = [
+            ("Louvre", 48.8606, 2.3376),
+            ("Eiffel Tower", 48.8584, 2.2945),
+            ("Versailles", 48.8049, 2.1204),
+            ("Marseille", 43.2965, 5.3698),
+        ]
+        for title, lat, lon in specs:
+            self.client.post(
+                f"{self.base_url}/",
+                json={
+                    "title": title,
+                    "description": "Landmark",
+                    "price": 100,
+                    "latitude": lat,
+                    "longitude": lon,
+                    "owner_id": self.owner.id,
+                    "amenities": []
+                },
+                headers={"Authorization": f"Bearer {self.owner_token}"}
+            )
+
+        # Notre-Dame de Paris
+        response = self.client.get(
+            f"{self.base_url}/nearby?lat=48.8530&lon=2.3499&radius_km=5")
+        self.assertEqual(response.status_code, 200)
+        resp_json = response.get_json()
+        self.assertEqual([p["title"] for p in resp_json], ["Louvre", "Eiffel Tower"])
+        self.assertLess(resp_json[0]["distance_km"], resp_json[1]["distance_km"])
+
+        response = self.client.get(
+            f"{self.base_url}/nearby?lat=48.8530&lon=2.3499&radius_km=30&limit=3")
+        self.assertEqual([p["title"] for p in response.get_json()],
+                         ["Louvre", "Eiffel Tower", "Versailles"])
+
+        response = self.client.get(f"{self.base_url}/nearby?lat=48.8530&lon=2.3499")
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(
+            f"{self.base_url}/nearby?lat=95&lon=2.3499&radius_km=5")
+        self.assertEqual(response.status_code, 400)
+        for query in ("lat=48&lon=2&radius_km=nan", "lat=48&lon=2&radius_km=inf",
+                      "lat=nan&lon=2&radius_km=5", "lat=48&lon=-inf&radius_km=5"):
+            response = self.client.get(f"{self.base_url}/nearby?{query}")
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_geohash_follows_updates(self):
+        """
+        Test that moving a place updates its geohash.
+        """
+        post_resp = self.client.post(
+            f"{self.base_url}/",
+            json={
+                "title": "Moving Place",
+                "description": "Moves",
+                "price": 100,
+                "latitude": 48.8606,
+                "longitude": 2.3376,
+                "owner_id": self.owner.id,
+                "amenities": []
+            },
+            headers={"Authorization": f"Bearer {self.owner_token}"}
+        )
+        place_id = post_resp.get_json()["id"]
+        self.client.put(
+            f"{self.base_url}/{place_id}",
+            json={"latitude": 43.2965, "longitude": 5.3698},
+            headers={"Authorization": f"Bearer {self.owner_token}"}
+        )
+
+        response = self.client.get(
+            f"{self.base_url}/nearby?lat=48.8530&lon=2.3499&radius_km=5")
+        self.assertEqual(response.get_json(), [])
+        response = self.client.get(
+            f"{self.base_url}/nearby?lat=43.30&lon=5.37&radius_km=5")
+        self.assertEqual([p["id"] for p in response.get_json()], [place_id])
+
+    def test_create_places_bulk(self):
+        """
+        Test bulk creation of places with per-item errors.
+        """
+        resp = self.client.post(
+            "/api/v1/amenities/",
+            json={"name": "Wifi"},
+            headers={"Authorization": f"Bearer {self.owner_token}"}
+        )
+        wifi = resp.get_json()["id"]
+
+        base = {
+            "description": "Bulk",
+            "price": 80,
+            "latitude": 48.8606,
+            "longitude": 2.3376
+        }
+        items = [
+            dict(base, title="Bulk One", amenities=[wifi]),
+            dict(base, title="Bulk Two", owner_id=self.non_owner.id),
+            dict(base, title="Bad Price", price=-1),
+            dict(base, title="Bad Owner", owner_id="unknown"),
+            dict(base, title="Bad Amenity", amenities=["unknown"]),
+        ]
+        response = self.client.post(
+            f"{self.base_url}/bulk",
+            json=items,
+            headers={"Authorization": f"Bearer {self.owner_token}"}
+        )
+        self.assertEqual(response.status_code, 207)
+        resp_json = response.get_json()
+        self.assertEqual([c["index"] for c in resp_json["created"]], [0, 1])
+        self.assertEqual([e["index"] for e in resp_json["errors"]], [2, 3, 4])
+
+        first = self.client.get(f"{self.base_url}/{resp_json['created'][0]['id']}").get_json()
+        self.assertEqual(first["owner_id"], self.owner.id)
+        self.assertEqual([a["id"] for a in first["amenities"]], [wifi])
+        second = self.client.get(f"{self.base_url}/{resp_json['created'][1]['id']}").get_json()
+        self.assertEqual(second["owner_id"], self.non_owner.id)
+
+        # Bulk inserts bypass mapper events, the geohash must still be set
+        nearby = self.client.get(
+            f"{self.base_url}/nearby?lat=48.8606&lon=2.3376&radius_km=1").get_json()
+        self.assertEqual(len(nearby), 2)
+
+        response = self.client.post(
+            f"{self.base_url}/bulk",
+            json={"title": "Not a list"},
+            headers={"Authorization": f"Bearer {self.owner_token}"}
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_sort_places_by_average_rating(self):
+        """
+        Test that places expose average_rating and can be sorted by it.
+        """
+        place_ids = {}
+        for title in ("Unrated", "Average", "Best"):
+            resp = self.client.post(
+                f"{self.base_url}/",
+                json={
+                    "title": title,
+                    "description": "Rated",
+                    "price": 100,
+                    "latitude": 45.0,
+                    "longitude": 10.0,
+                    "owner_id": self.owner.id,
+                    "amenities": []
+                },
+                headers={"Authorization": f"Bearer {self.owner_token}"}
+            )
+            place_ids[title] = resp.get_json()["id"]
+
+        for title, rating in (("Average", 3), ("Best", 5), ("Best", 4)):
+            self.client.post(
+                "/api/v1/reviews/",
+                json={"text": "Stay", "rating": rating, "place_id": place_ids[title]},
+                headers={"Authorization": f"Bearer {self.non_owner_token}"}
+            )
+
+        resp_json = self.client.get(f"{self.base_url}/{place_ids['Best']}").get_json()
+        self.assertEqual(resp_json["average_rating"], 4.5)
+        self.assertEqual(resp_json["review_count"], 2)
+
+        response = self.client.get(f"{self.base_url}/?sort=-average_rating")
+        self.assertEqual([p["title"] for p in response.get_json()],
+                         ["Best", "Average", "Unrated"])
+
+        titles, cursor = [], None
+        while True:
+            url = f"{self.base_url}/?sort=average_rating&limit=1"
+            if cursor:
+                url += f"&cursor={cursor}"
+            page = self.client.get(url).get_json()
+            titles.extend(p["title"] for p in page["places"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        self.assertEqual(titles, ["Unrated", "Average", "Best"])
+
+        response = self.client.get(f"{self.base_url}/?sort=price")
+        self.assertEqual(response.status_code, 400)
+
+    def test_cache_stats_admin_only(self):
+        """
+        Test that cached place reads show up in the admin cache stats.
+        """
+        post_resp = self.client.post(
+            f"{self.base_url}/",
+            json={
+                "title": "Cached",
+                "description": "Cached",
+                "price": 10,
+                "latitude": 45.0,
+                "longitude": 10.0,
+                "owner_id": self.owner.id,
+                "amenities": []
+            },
+            headers={"Authorization": f"Bearer {self.owner_token}"}
+        )
+        place_id = post_resp.get_json()["id"]
+        self.client.get(f"{self.base_url}/{place_id}")
+        self.client.get(f"{self.base_url}/{place_id}")
+
+        response = self.client.get(
+            "/api/v1/cache/stats",
+            headers={"Authorization": f"Bearer {self.admin_token}"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertGreaterEqual(response.get_json()["hits"], 1)
+
+        response = self.client.get(
+            "/api/v1/cache/stats",
+            headers={"Authorization": f"Bearer {self.owner_token}"}
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_conditional_get_place(self):
+        """
+        Test ETag / Last-Modified revalidation of a place, including changes
+        to the embedded amenities.
+        """
+        headers = {"Authorization": f"Bearer {self.owner_token}"}
+        amenity_id = self.client.post("/api/v1/amenities/", json={"name": "Wifi"},
+                                      headers=headers).get_json()["id"]
+        place_id = self.client.post(f"{self.base_url}/", json={
+            "title": "Cached Place", "price": 80, "latitude": 1.0,
+            "longitude": 2.0, "owner_id": self.owner.id, "amenities": [amenity_id]
+        }, headers=headers).get_json()["id"]
+
+        response = self.client.get(f"{self.base_url}/{place_id}")
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers["ETag"]
+        last_modified = response.headers["Last-Modified"]
+
+        response = self.client.get(f"{self.base_url}/{place_id}",
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        self.assertEqual(response.headers["ETag"], etag)
+
+        response = self.client.get(f"{self.base_url}/{place_id}",
+                                   headers={"If-Modified-Since": last_modified})
+        self.assertEqual(response.status_code, 304)
+
+        # Renaming an embedded amenity changes the place representation
+        self.client.put(f"/api/v1/amenities/{amenity_id}", json={"name": "Fiber"},
+                        headers=headers)
+        response = self.client.get(f"{self.base_url}/{place_id}",
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.get_json()["amenities"][0]["name"], "Fiber")
+
+        response = self.client.get(f"{self.base_url}/unknown",
+                                   headers={"If-None-Match": "*"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_cached_place_follows_writes_of_other_processes(self):
+        """
+        Test a cached place is served and revalidated without any query,
+        and that a change made behind the cache (by another worker) is
+        served with its new ETag once the entry expires, never paired with
+        the old body.
+        """
+        place_id = self.client.post(f"{self.base_url}/", json={
+            "title": "Old", "price": 80, "latitude": 1.0, "longitude": 2.0,
+            "owner_id": self.owner.id, "amenities": []
+        }, headers={"Authorization": f"Bearer {self.owner_token}"}).get_json()["id"]
+        response = self.client.get(f"{self.base_url}/{place_id}")
+        etag = response.headers["ETag"]
+
+        response = self.client.get(f"{self.base_url}/{place_id}")
+        self.assertEqual(response.headers["X-Query-Count"], "0")
+        response = self.client.get(f"{self.base_url}/{place_id}",
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["X-Query-Count"], "0")
+
+        # Another process: the row changes, this process's cache does not
+        db.session.execute(Place.__table__.update().where(Place.id == place_id).values(
+            title="New", updated_at=datetime.utcnow() + timedelta(seconds=1)))
+        db.session.commit()
+
+        response = self.client.get(f"{self.base_url}/{place_id}")
+        self.assertEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.get_json()["title"], "Old")
+
+        ttl = facade.cache.ttl
+        with mock.patch("app.services.cache.time.monotonic",
+                        return_value=time.monotonic() + ttl):
+            response = self.client.get(f"{self.base_url}/{place_id}")
+        self.assertNotEqual(response.headers["ETag"], etag)
+        self.assertEqual(response.get_json()["title"], "New")
+        response = self.client.get(f"{self.base_url}/{place_id}",
+                                   headers={"If-None-Match": response.headers["ETag"]})
+        self.assertEqual(response.status_code, 304)
+
+    def test_conditional_get_places_list(self):
+        """
+        Test the collection ETag changes when a place is added.
+        """
+        headers = {"Authorization": f"Bearer {self.owner_token}"}
+        place = {"title": "First", "price": 50, "latitude": 0.0, "longitude": 0.0,
+                 "owner_id": self.owner.id, "amenities": []}
+        self.client.post(f"{self.base_url}/", json=place, headers=headers)
+
+        response = self.client.get(f"{self.base_url}/?limit=10")
+        etag = response.headers["ETag"]
+        response = self.client.get(f"{self.base_url}/?limit=10",
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+
+        self.client.post(f"{self.base_url}/", json=dict(place, title="Second"),
+                         headers=headers)
+        response = self.client.get(f"{self.base_url}/?limit=10",
+                                   headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()["places"]), 2)
+
+        # Invalid parameters are rejected even when the ETag matches
+        etag = response.headers["ETag"]
+        for query in ("limit=0", "limit=10&sort=price"):
+            response = self.client.get(f"{self.base_url}/?{query}",
+                                       headers={"If-None-Match": etag})
+            self.assertEqual(response.status_code, 400, query)
+        response = self.client.get(f"{self.base_url}/?limit=10",
+                                   headers={"If-None-Match": "*"})
+        self.assertEqual(response.status_code, 304)
+
+    def test_get_places_sparse_fieldset(self):
+        """
+        Test fields= limits the keys of the list and detail responses.
+        """
+        place_id = self.client.post(f"{self.base_url}/", json={
+            "title": "Slim", "description": "A long description", "price": 70,
+            "latitude": 1.0, "longitude": 1.0, "owner_id": self.owner.id,
+            "amenities": []
+        }, headers={"Authorization": f"Bearer {self.owner_token}"}).get_json()["id"]
+
+        response = self.client.get(f"{self.base_url}/?fields=id,title,price")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json(),
+                         [{"id": place_id, "title": "Slim", "price": 70.0}])
+
+        response = self.client.get(f"{self.base_url}/{place_id}?fields=title")
+        self.assertEqual(response.get_json(), {"title": "Slim"})
+
+        response = self.client.get(f"{self.base_url}/?fields=id,secret")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("secret", response.get_json()["message"])
+
+        for url in (f"{self.base_url}/?fields=", f"{self.base_url}/{place_id}?fields=,"):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 400, url)
+
+    def test_stream_places_ndjson(self):
+        """
+        Test format=ndjson streams one place per line with the usual shape.
+        """
+        headers = {"Authorization": f"Bearer {self.owner_token}"}
+        amenity_id = self.client.post("/api/v1/amenities/", json={"name": "Wifi"},
+                                      headers=headers).get_json()["id"]
+        for i in range(5):
+            self.client.post(f"{self.base_url}/", json={
+                "title": f"Export {i}", "price": 10 + i, "latitude": 0.0,
+                "longitude": 0.0, "owner_id": self.owner.id, "amenities": [amenity_id]
+            }, headers=headers)
+
+        response = self.client.get(f"{self.base_url}/?format=ndjson&max_price=12")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        rows = [json.loads(line) for line in response.data.decode().splitlines()]
+        self.assertEqual([r["title"] for r in rows], ["Export 0", "Export 1", "Export 2"])
+        self.assertEqual(rows[0]["owner"]["id"], self.owner.id)
+        self.assertEqual(rows[0]["amenities"][0]["name"], "Wifi")
+
+        response = self.client.get(f"{self.base_url}/?fields=title",
+                                   headers={"Accept": "application/x-ndjson"})
+        self.assertEqual(response.data.decode().splitlines()[0], '{"title": "Export 0"}')
+
+    def _count_queries(self, url):
+        """
+        Issue a GET on url and return the number of SQL statements it ran.
+        """
+        return len(self._capture_queries(url))
+
+    def _capture_queries(self, url):
+        """
+        Issue a GET on url and return the SQL statements it ran.
+        """
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            response = self.client.get(url)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+        self.assertEqual(response.status_code, 200)
+        return statements
+
+    def test_sparse_list_single_narrow_select(self):
+        """
+        Test fields= reads the places with one SELECT of just the needed
+        columns, and include= loads only the requested relationships.
+        """
+        headers = {"Authorization": f"Bearer {self.owner_token}"}
+        amenity_id = self.client.post("/api/v1/amenities/", json={"name": "Wifi"},
+                                      headers=headers).get_json()["id"]
+        for i in range(3):
+            self.client.post(f"{self.base_url}/", json={
+                "title": f"Place {i}", "description": "long text", "price": 10 + i,
+                "latitude": 0.0, "longitude": 0.0, "owner_id": self.owner.id,
+                "amenities": [amenity_id]
+            }, headers=headers)
+
+        # Aggregates are the conditional GET validators
+        def reads(url):
+            return [st for st in self._capture_queries(url)
+                    if "count(" not in st and "max(" not in st]
+
+        statements = reads(f"{self.base_url}/?fields=id,title,price")
+        self.assertEqual(len(statements), 1)
+        self.assertNotIn("description", statements[0])
+        self.assertNotIn("users", statements[0])
+
+        statements = reads(f"{self.base_url}/?fields=id,title&include=owner")
+        self.assertEqual(len(statements), 1)
+        self.assertIn("JOIN users", statements[0])
+        self.assertNotIn("place_amenity", statements[0])
+
+        response = self.client.get(f"{self.base_url}/?fields=id&include=owner")
+        self.assertEqual(response.get_json()[0]["owner"]["id"], self.owner.id)
+        self.assertNotIn("amenities", response.get_json()[0])
+
+        response = self.client.get(f"/api/v1/reviews/?include=user,place")
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get(f"{self.base_url}/?include=reviews")
+        self.assertEqual(response.status_code, 400)
+
+    def test_list_places_constant_queries(self):
+        """
+        Test that listing places runs the same number of queries for 1 or N rows.
+        """
+        owner_ids = [self.owner.id, self.non_owner.id, self.admin.id]
+
+        def create_place(i):
+            self.client.post(
+                f"{self.base_url}/",
+                json={
+                    "title": f"Place {i}",
+                    "description": "Counted",
+                    "price": 10,
+                    "latitude": 45.0,
+                    "longitude": 10.0,
+                    "owner_id": owner_ids[i % len(owner_ids)],
+                    "amenities": []
+                },
+                headers={"Authorization": f"Bearer {self.owner_token}"}
+            )
+
+        create_place(0)
+        db.session.expunge_all()
+        single = self._count_queries(f"{self.base_url}/")
+
+        for i in range(1, 6):
+            create_place(i)
+        db.session.expunge_all()
+        many = self._count_queries(f"{self.base_url}/")
+
+        self.assertEqual(single, many)
+
 
 if __name__ == "__main__":
     unittest.main()
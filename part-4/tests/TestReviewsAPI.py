@@ -178,6 +178,71 @@ class ReviewAPITestCase(unittest.TestCase):
         self.assertIsInstance(reviews_list, list)
         self.assertGreaterEqual(len(reviews_list), 2)
 
+    def test_get_reviews_by_place(self):
+        """
+        Test retrieving only the reviews of one place.
+        """
+        other_place = self.client.post(
+            f"{self.place_base_url}/",
+            json={
+                "title": "Other Place",
+                "description": "Not reviewed",
+                "price": 50,
+                "latitude": 45.0,
+                "longitude": 10.0,
+                "owner_id": self.owner.id,
+                "amenities": []
+            },
+            headers={"Authorization": f"Bearer {self.owner_token}"}
+        )
+        other_place_id = other_place.get_json()["id"]
+
+        data = {"text": "Place review", "rating": 4, "place_id": self.place_id}
+        self.client.post(
+            f"{self.base_url}/",
+            json=data,
+            headers={"Authorization": f"Bearer {self.owner_token}"}
+        )
+
+        resp = self.client.get(f"{self.place_base_url}/{self.place_id}/reviews")
+        self.assertEqual(resp.status_code, 200)
+        reviews_list = resp.get_json()
+        self.assertEqual(len(reviews_list), 1)
+        self.assertEqual(reviews_list[0]["place_id"], self.place_id)
+        self.assertEqual(reviews_list[0]["user_id"], self.owner.id)
+
+        resp = self.client.get(f"{self.place_base_url}/{other_place_id}/reviews")
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.get_json(), [])
+
+        resp = self.client.get(f"{self.place_base_url}/unknown-id/reviews")
+        self.assertEqual(resp.status_code, 404)
+
+    def test_create_reviews_bulk(self):
+        """
+        Test bulk creation of reviews authored by the current user.
+        """
+        items = [
+            {"text": "Bulk one", "rating": 5, "place_id": self.place_id},
+            {"text": "Bulk two", "rating": 9, "place_id": self.place_id},
+            {"text": "Bulk three", "rating": 3, "place_id": "unknown"},
+            {"text": "Bulk four", "rating": 4, "place_id": self.place_id},
+        ]
+        resp = self.client.post(
+            f"{self.base_url}/bulk",
+            json=items,
+            headers={"Authorization": f"Bearer {self.non_owner_token}"}
+        )
+        self.assertEqual(resp.status_code, 207)
+        resp_json = resp.get_json()
+        self.assertEqual([c["index"] for c in resp_json["created"]], [0, 3])
+        self.assertEqual([e["index"] for e in resp_json["errors"]], [1, 2])
+
+        reviews_list = self.client.get(
+            f"{self.place_base_url}/{self.place_id}/reviews").get_json()
+        self.assertEqual(len(reviews_list), 2)
+        self.assertTrue(all(r["user_id"] == self.non_owner.id for r in reviews_list))
+
     def test_get_review_by_id(self):
         """
         Test retrieving a review by its ID.
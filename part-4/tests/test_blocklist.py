@@ -0,0 +1,59 @@
+import unittest
+import uuid
+from datetime import datetime, timedelta
+from app import create_app, db
+from app.models.revoked_token import RevokedToken
+from app.services.blocklist import BloomFilter, SQLBlocklist
+
+
+class TestBlocklist(unittest.TestCase):
+    """
+    This test case verifies the bloom filter and the SQL token blocklist.
+    """
+
+    def setUp(self):
+        self.app = create_app("config.TestConfig")
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_bloom_filter(self):
+        """
+        Test added keys are always found and unknown keys rarely are.
+        """
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        added = [str(uuid.uuid4()) for _ in range(1000)]
+        for key in added:
+            bloom.add(key)
+        self.assertTrue(all(key in bloom for key in added))
+        false_positives = sum(str(uuid.uuid4()) in bloom for _ in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_sql_blocklist(self):
+        """
+        Test revocations are stored, seen by other workers after a sync,
+        and purged once expired.
+        """
+        expires_at = datetime.utcnow() + timedelta(minutes=15)
+        blocklist = SQLBlocklist(capacity=1000, sync_seconds=0)
+        other_worker = SQLBlocklist(capacity=1000, sync_seconds=0)
+        self.assertFalse(other_worker.is_revoked("a"))
+
+        blocklist.revoke("a", expires_at)
+        blocklist.revoke("b", datetime.utcnow() - timedelta(seconds=1))
+        db.session.commit()
+        self.assertTrue(blocklist.is_revoked("a"))
+        self.assertTrue(other_worker.is_revoked("a"))
+        self.assertFalse(other_worker.is_revoked("c"))
+
+        self.assertEqual(blocklist.purge_expired(), 1)
+        db.session.commit()
+        self.assertEqual([t.jti for t in RevokedToken.query.all()], ["a"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import unittest
+from unittest import mock
+from app.services.cache import LRUCache, NullCache, create_cache
+
+class LRUCacheTestCase(unittest.TestCase):
+    """
+    This test case verifies the LRU/TTL behavior and counters of the entity cache.
+    """
+
+    def test_get_set_counters(self):
+        """
+        Test hits and misses are counted.
+        """
+        cache = LRUCache(maxsize=10, ttl=60)
+        self.assertIsNone(cache.get("place:1"))
+        cache.set("place:1", {"id": "1"})
+        self.assertEqual(cache.get("place:1"), {"id": "1"})
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_least_recently_used_is_evicted(self):
+        """
+        Test the least recently read entry is evicted first.
+        """
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.get("c"), 3)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_entries_expire(self):
+        """
+        Test entries older than the TTL are dropped.
+        """
+        cache = LRUCache(maxsize=10, ttl=5)
+        with mock.patch("app.services.cache.time.monotonic", return_value=100.0):
+            cache.set("a", 1)
+        with mock.patch("app.services.cache.time.monotonic", return_value=104.0):
+            self.assertEqual(cache.get("a"), 1)
+        with mock.patch("app.services.cache.time.monotonic", return_value=105.0):
+            self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+    def test_get_or_load_skips_none(self):
+        """
+        Test read-through does not cache missing entities.
+        """
+        cache = LRUCache()
+        loader = mock.Mock(return_value=None)
+        self.assertIsNone(cache.get_or_load("user:x", loader))
+        self.assertIsNone(cache.get_or_load("user:x", loader))
+        self.assertEqual(loader.call_count, 2)
+
+    def test_create_cache(self):
+        """
+        Test the backend is picked from the configuration.
+        """
+        self.assertIsInstance(create_cache({"CACHE_TYPE": "null"}), NullCache)
+        cache = create_cache({"CACHE_MAX_ENTRIES": 3, "CACHE_TTL_SECONDS": 7})
+        self.assertEqual((cache.maxsize, cache.ttl), (3, 7))
+        with self.assertRaises(ValueError):
+            create_cache({"CACHE_TYPE": "redis"})
+
+if __name__ == "__main__":
+    unittest.main()
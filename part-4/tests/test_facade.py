@@ -1,10 +1,12 @@
 import unittest
+from sqlalchemy import event
 from app import create_app, db
 from app.services.facade import HBnBFacade
 from app.models.user import User
 from app.models.amenity import Amenity
-from app.models.place import Place
+from app.models.place import Place, place_amenity
 from app.models.review import Review
+from app.persistence import geo
 
 class TestHBnBFacade(unittest.TestCase):
     """
@@ -189,6 +191,48 @@ class TestHBnBFacade(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.facade.create_place(place_data)
 
+    def test_create_place_amenities_single_query(self):
+        """
+        Test that amenities are resolved with one query and unknown ids are reported.
+        """
+        owner = self.facade.create_user({
+            "first_name": "Amenity",
+            "last_name": "Owner",
+            "email": "amenityowner@example.com",
+            "password": "pass"
+        })
+        amenity_ids = [self.facade.create_amenity({"name": f"Amenity {i}"}).id
+                       for i in range(4)]
+        place_data = {
+            "title": "Equipped Place",
+            "description": "desc",
+            "price": 100,
+            "latitude": 45.0,
+            "longitude": 10.0,
+            "owner_id": owner.id,
+            "amenities": amenity_ids
+        }
+
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            if "FROM amenities" in statement:
+                statements.append(statement)
+
+        db.session.expire_all()
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            place = self.facade.create_place(place_data)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+        self.assertEqual(len(statements), 1)
+        self.assertEqual({a.id for a in place.amenities}, set(amenity_ids))
+
+        place_data["amenities"] = [amenity_ids[0], "unknown-amenity"]
+        with self.assertRaises(ValueError) as ctx:
+            self.facade.create_place(place_data)
+        self.assertIn("unknown-amenity", str(ctx.exception))
+
     def test_update_place_success(self):
         """
         Test updating an existing place.
@@ -369,5 +413,323 @@ class TestHBnBFacade(unittest.TestCase):
         self.assertTrue(result)
         self.assertIsNone(self.facade.get_review(review.id))
 
+    def test_place_rating_aggregates(self):
+        """
+        Test that review writes keep review_count/rating_sum in sync.
+        """
+        user = self.facade.create_user({
+            "first_name": "Rating",
+            "last_name": "User",
+            "email": "rating@example.com",
+            "password": "pass"
+        })
+        place = self.facade.create_place({
+            "title": "Rated Place",
+            "description": "desc",
+            "price": 50,
+            "latitude": 45.0,
+            "longitude": 10.0,
+            "owner_id": user.id
+        })
+        self.assertIsNone(place.average_rating)
+
+        first = self.facade.create_review({
+            "text": "Good", "rating": 4, "user_id": user.id, "place_id": place.id})
+        self.facade.create_review({
+            "text": "Great", "rating": 5, "user_id": user.id, "place_id": place.id})
+        place = self.facade.get_place(place.id)
+        self.assertEqual((place.review_count, place.rating_sum), (2, 9))
+        self.assertEqual(place.average_rating, 4.5)
+
+        self.facade.update_review(first.id, {"rating": 2})
+        self.assertEqual(self.facade.get_place(place.id).rating_sum, 7)
+
+        # Only integer ratings reach the aggregates
+        for rating in (4.5, True, "5"):
+            with self.assertRaises(ValueError):
+                self.facade.create_review({"text": "Odd", "rating": rating,
+                                           "user_id": user.id, "place_id": place.id})
+            with self.assertRaises(ValueError):
+                self.facade.update_review(first.id, {"rating": rating})
+        place = self.facade.get_place(place.id)
+        self.assertEqual((place.review_count, place.rating_sum), (2, 7))
+
+        self.facade.delete_review(first.id)
+        place = self.facade.get_place(place.id)
+        self.assertEqual((place.review_count, place.rating_sum), (1, 5))
+
+    def test_recompute_place_ratings(self):
+        """
+        Test that the maintenance recompute repairs drifted aggregates.
+        """
+        user = self.facade.create_user({
+            "first_name": "Drift",
+            "last_name": "User",
+            "email": "drift@example.com",
+            "password": "pass"
+        })
+        place = self.facade.create_place({
+            "title": "Drifted Place",
+            "description": "desc",
+            "price": 50,
+            "latitude": 45.0,
+            "longitude": 10.0,
+            "owner_id": user.id
+        })
+        self.facade.create_review({
+            "text": "Fine", "rating": 3, "user_id": user.id, "place_id": place.id})
+
+        place = self.facade.get_place(place.id)
+        place.review_count, place.rating_sum = 10, 12
+        db.session.commit()
+
+        result = self.app.test_cli_runner().invoke(args=["recompute-ratings"])
+        self.assertIn("1 places", result.output)
+        db.session.expire_all()
+        place = self.facade.get_place(place.id)
+        self.assertEqual((place.review_count, place.rating_sum), (1, 3))
+
+    def test_seed_command(self):
+        """
+        Test flask seed inserts the requested rows with consistent rating
+        aggregates, and the generated users can log in.
+        """
+        result = self.app.test_cli_runner().invoke(args=[
+            "seed", "--places", "40", "--users", "8", "--amenities", "5",
+            "--reviews-per-place", "2", "--password", "seeded", "--batch-size", "15"])
+        self.assertIn("Seeded", result.output, result.output)
+
+        self.assertEqual(User.query.count(), 8)
+        self.assertEqual(Place.query.count(), 40)
+        self.assertEqual(Review.query.count(), 80)
+        self.assertEqual(len(db.session.execute(place_amenity.select()).all()), 120)
+        for place in Place.query:
+            reviews = [r for r in Review.query.filter_by(place_id=place.id)]
+            self.assertEqual(place.review_count, len(reviews))
+            self.assertEqual(place.rating_sum, sum(r.rating for r in reviews))
+            self.assertNotIn(place.owner_id, [r.user_id for r in reviews])
+            self.assertEqual(place.geohash, geo.encode(place.latitude, place.longitude))
+
+        user = User.query.first()
+        self.assertIsNotNone(self.facade.authenticate(user.email, "seeded"))
+
+    def test_seed_command_rejects_impossible_counts(self):
+        """
+        Test places without users and negative counts are usage errors.
+        """
+        runner = self.app.test_cli_runner()
+        for args in (["--places", "10", "--users", "0"], ["--places", "-1"],
+                     ["--reviews-per-place", "-2"], ["--batch-size", "0"]):
+            result = runner.invoke(args=["seed", *args])
+            self.assertEqual(result.exit_code, 2, result.output)
+        self.assertEqual(Place.query.count(), 0)
+
+    # ------------------ CACHE TESTS ------------------
+
+    def test_place_data_is_cached_and_invalidated(self):
+        """
+        Test read-through caching of places and invalidation by related writes.
+        """
+        owner = self.facade.create_user({
+            "first_name": "Cached",
+            "last_name": "Owner",
+            "email": "cached@example.com",
+            "password": "pass"
+        })
+        amenity = self.facade.create_amenity({"name": "Wifi"})
+        place = self.facade.create_place({
+            "title": "Cached Place",
+            "description": "desc",
+            "price": 50,
+            "latitude": 45.0,
+            "longitude": 10.0,
+            "owner_id": owner.id,
+            "amenities": [amenity.id]
+        })
+
+        self.assertEqual(self.facade.get_place_data(place.id)["title"], "Cached Place")
+        self.facade.get_place_data(place.id)
+        self.assertEqual(self.facade.cache.stats()["hits"], 1)
+
+        self.facade.update_place(place.id, {"title": "Renamed"})
+        self.assertEqual(self.facade.get_place_data(place.id)["title"], "Renamed")
+
+        self.facade.update_user(owner.id, {"first_name": "Changed"})
+        self.assertEqual(self.facade.get_place_data(place.id)["owner"]["first_name"], "Changed")
+
+        self.facade.update_amenity(amenity.id, {"name": "Fiber"})
+        self.assertEqual(self.facade.get_place_data(place.id)["amenities"][0]["name"], "Fiber")
+
+        review = self.facade.create_review({
+            "text": "Nice", "rating": 4, "user_id": owner.id, "place_id": place.id})
+        self.assertEqual(self.facade.get_place_data(place.id)["average_rating"], 4)
+
+        self.facade.delete_review(review.id)
+        self.assertIsNone(self.facade.get_place_data(place.id)["average_rating"])
+
+        self.facade.delete_place(place.id)
+        self.assertIsNone(self.facade.get_place_data(place.id))
+
+    def test_delete_user_invalidates_reviews_of_their_places(self):
+        """
+        Test that reviews left by others on a deleted user's places leave the cache.
+        """
+        owner = self.facade.create_user({
+            "first_name": "Leaving",
+            "last_name": "Owner",
+            "email": "leaving@example.com",
+            "password": "pass"
+        })
+        guest = self.facade.create_user({
+            "first_name": "Staying",
+            "last_name": "Guest",
+            "email": "staying@example.com",
+            "password": "pass"
+        })
+        place = self.facade.create_place({
+            "title": "Gone Place",
+            "description": "desc",
+            "price": 50,
+            "latitude": 45.0,
+            "longitude": 10.0,
+            "owner_id": owner.id
+        })
+        review = self.facade.create_review({
+            "text": "Nice", "rating": 4, "user_id": guest.id, "place_id": place.id})
+        self.facade.get_review_data(review.id)
+        self.assertIsNotNone(self.facade.cache.get(f"review:{review.id}"))
+
+        self.facade.delete_user(owner.id)
+        self.assertIsNone(self.facade.cache.get(f"review:{review.id}"))
+
+    def test_principal_is_cached_and_invalidated(self):
+        """
+        Test token holders are resolved without a SELECT once cached, and
+        that demoting or deleting the user is seen by the next request.
+        """
+        user = self.facade.create_user({
+            "first_name": "Token",
+            "last_name": "Holder",
+            "email": "token@example.com",
+            "password": "pass",
+            "is_admin": True
+        })
+        self.assertEqual(self.facade.get_principal(user.id),
+                         {"id": user.id, "is_admin": True})
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement)
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            self.facade.get_principal(user.id)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
+        self.assertEqual(statements, [])
+
+        self.facade.update_user(user.id, {"is_admin": False})
+        self.assertFalse(self.facade.get_principal(user.id)["is_admin"])
+
+        self.facade.delete_user(user.id)
+        self.assertIsNone(self.facade.get_principal(user.id))
+
+    # ------------------ UNIT OF WORK TESTS ------------------
+
+    def _count_commits(self, operation):
+        """
+        Run operation() and return how many times the session committed.
+        """
+        commits = []
+        session = db.session()
+
+        def after_commit(session):
+            commits.append(session)
+
+        event.listen(session, "after_commit", after_commit)
+        try:
+            operation()
+        finally:
+            event.remove(session, "after_commit", after_commit)
+        return len(commits)
+
+    def test_delete_user_commits_once(self):
+        """
+        Test that deleting a user with places and reviews is a single transaction.
+        """
+        user = self.facade.create_user({
+            "first_name": "Uow",
+            "last_name": "User",
+            "email": "uow@example.com",
+            "password": "pass"
+        })
+        other = self.facade.create_user({
+            "first_name": "Other",
+            "last_name": "Owner",
+            "email": "uow-other@example.com",
+            "password": "pass"
+        })
+        other_place = self.facade.create_place({
+            "title": "Other Place",
+            "description": "desc",
+            "price": 50,
+            "latitude": 45.0,
+            "longitude": 10.0,
+            "owner_id": other.id
+        })
+        for i in range(3):
+            self.facade.create_place({
+                "title": f"Uow Place {i}",
+                "description": "desc",
+                "price": 50,
+                "latitude": 45.0,
+                "longitude": 10.0,
+                "owner_id": user.id
+            })
+            self.facade.create_review({
+                "text": "Mine",
+                "rating": 4,
+                "user_id": user.id,
+                "place_id": other_place.id
+            })
+
+        user_id = user.id
+        self.assertEqual(self._count_commits(lambda: self.facade.delete_user(user_id)), 1)
+        self.assertIsNone(self.facade.get_user(user_id))
+
+    def test_failed_operation_rolls_back(self):
+        """
+        Test that an error inside a facade operation leaves nothing behind.
+        """
+        user = self.facade.create_user({
+            "first_name": "Rollback",
+            "last_name": "User",
+            "email": "rollback@example.com",
+            "password": "pass"
+        })
+        place = self.facade.create_place({
+            "title": "Rollback Place",
+            "description": "desc",
+            "price": 50,
+            "latitude": 45.0,
+            "longitude": 10.0,
+            "owner_id": user.id
+        })
+        other = self.facade.create_user({
+            "first_name": "Other",
+            "last_name": "Owner",
+            "email": "rollback-other@example.com",
+            "password": "pass"
+        })
+        flushed = []
+        event.listen(db.session(), "after_flush", lambda session, context: flushed.append(1))
+        # The new owner is flushed by the amenity lookup, which then fails
+        with self.assertRaises(ValueError):
+            self.facade.update_place(place.id, {"owner_id": other.id,
+                                                "amenities": ["missing"]})
+        self.assertTrue(flushed)
+        owner_id = db.session.execute(
+            db.select(Place.owner_id).where(Place.id == place.id)).scalar_one()
+        self.assertEqual(owner_id, user.id)
+        self.assertEqual(self.facade.get_place(place.id).owner_id, user.id)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from unittest import mock
+import uuid
+from app import create_app, db
+from app.models.user import User
+from app.persistence import ids
+from app.services import facade
+from flask_jwt_extended import create_access_token
+from config import TestConfig
+
+
+class UUID7TestCase(unittest.TestCase):
+    """
+    This test case verifies the time-ordered id generator.
+    """
+
+    def test_uuid7_layout(self):
+        """
+        Test the version and variant bits of uuid7().
+        """
+        value = ids.uuid7()
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+
+    def test_uuid7_follow_the_clock(self):
+        """
+        Test ids drawn in later milliseconds sort after earlier ones.
+        """
+        first = ids.uuid7()
+        with mock.patch("time.time_ns", return_value=(
+                (first.int >> 80) + 1) * 1_000_000):
+            second = ids.uuid7()
+        self.assertLess(str(first), str(second))
+        self.assertLess(first.bytes, second.bytes)
+
+
+class BinaryConfig(TestConfig):
+    ID_STORAGE = "binary"
+    ID_GENERATOR = "uuid7"
+
+
+class BinaryIdsTestCase(unittest.TestCase):
+    """
+    This test case verifies the 16-byte id storage behind the API.
+    """
+
+    def setUp(self):
+        self.app = create_app(BinaryConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        User.existing_emails.clear()
+        facade.cache.clear()
+        self.owner = User(first_name="Owner", last_name="User",
+                          email="owner@bin.io", password="pass")
+        db.session.add(self.owner)
+        db.session.commit()
+        token = create_access_token(identity={"id": self.owner.id, "is_admin": False})
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+        ids.configure({})
+
+    def test_ids_are_stored_as_16_bytes(self):
+        """
+        Test primary and foreign keys are 16-byte blobs in the database and
+        canonical strings in the API.
+        """
+        response = self.client.post("/api/v1/places/", headers=self.headers, json={
+            "title": "Loft", "price": 80, "latitude": 1.0, "longitude": 2.0,
+            "owner_id": self.owner.id, "amenities": []})
+        self.assertEqual(response.status_code, 201)
+        place_id = response.get_json()["id"]
+        self.assertEqual(uuid.UUID(place_id).version, 7)
+        self.assertEqual(str(uuid.UUID(place_id)), place_id)
+
+        row = db.session.execute(db.text(
+            "SELECT typeof(id), length(id), typeof(owner_id), length(owner_id) "
+            "FROM places")).one()
+        self.assertEqual(tuple(row), ("blob", 16, "blob", 16))
+
+        data = self.client.get(f"/api/v1/places/{place_id}").get_json()
+        self.assertEqual(data["id"], place_id)
+        self.assertEqual(data["owner"]["id"], self.owner.id)
+
+    def test_malformed_id_matches_nothing(self):
+        """
+        Test an id that is not a UUID is a plain 404.
+        """
+        response = self.client.get("/api/v1/places/not-a-uuid")
+        self.assertEqual(response.status_code, 404)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from sqlalchemy import event
+from app import create_app, db
+from config import TestConfig
+
+
+class QueryStatsTestCase(unittest.TestCase):
+    """
+    This test case verifies the per-request query counter, its response
+    headers and the slow-query log.
+    """
+
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_headers_count_the_request_queries(self):
+        """
+        Test X-Query-Count matches the statements run and Server-Timing
+        reports the db and app durations.
+        """
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            response = self.client.get("/api/v1/places/?sort=-average_rating")
+        finally:
+            event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(len(statements), 0)
+        self.assertEqual(response.headers["X-Query-Count"], str(len(statements)))
+        self.assertRegex(response.headers["Server-Timing"],
+                         rf'^db;dur=[\d.]+;desc="{len(statements)} queries", app;dur=[\d.]+$')
+
+    def test_slow_queries_are_logged_with_the_endpoint(self):
+        """
+        Test statements over SLOW_QUERY_MS are logged with the request.
+        """
+        # Only around this request: create_all/drop_all would log too
+        self.app.config["SLOW_QUERY_MS"] = 0
+        with self.assertLogs("app.sql", level="WARNING") as logs:
+            self.client.get("/api/v1/amenities/")
+        self.app.config["SLOW_QUERY_MS"] = None
+        self.assertIn("GET /api/v1/amenities/", logs.output[0])
+        self.assertIn("SELECT", logs.output[0])
+
+    def test_count_is_per_request(self):
+        """
+        Test each request starts from zero, whatever ran before it.
+        """
+        db.session.execute(db.text("SELECT 1"))
+        first = self.client.get("/api/v1/amenities/").headers["X-Query-Count"]
+        second = self.client.get("/api/v1/amenities/").headers["X-Query-Count"]
+        self.assertEqual(first, second)
+
+if __name__ == "__main__":
+    unittest.main()
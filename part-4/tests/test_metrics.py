@@ -0,0 +1,161 @@
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from app import create_app, db
+from app.models.user import User
+from app.services.metrics import Registry, add_hit_ratios, render, registry
+from config import TestConfig
+
+
+class RegistryTestCase(unittest.TestCase):
+    """
+    This test case verifies the metric types, the exposition format and the
+    aggregation of the snapshots of several processes.
+    """
+
+    def setUp(self):
+        self.registry = Registry()
+        self.requests = self.registry.counter("t_requests_total", "Requests", ("route",))
+        self.latency = self.registry.histogram("t_seconds", "Latency", buckets=(0.1, 1.0))
+
+    def test_render(self):
+        """
+        Test counters and cumulative histogram buckets in the text format.
+        """
+        self.requests.inc("/a")
+        self.requests.inc("/a")
+        self.latency.observe(0.05)
+        self.latency.observe(0.5)
+        self.latency.observe(5)
+        text = render(self.registry.collect())
+        self.assertIn("# TYPE t_requests_total counter", text)
+        self.assertIn('t_requests_total{route="/a"} 2', text)
+        self.assertIn('t_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('t_seconds_bucket{le="1.0"} 2', text)
+        self.assertIn('t_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn("t_seconds_count 3", text)
+
+    def test_counter_is_thread_safe(self):
+        """
+        Test no increment is lost between threads.
+        """
+        def work():
+            for _ in range(5000):
+                self.requests.inc("/a")
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.requests.samples(), {'t_requests_total{route="/a"}': 40000})
+
+    def test_processes_are_summed(self):
+        """
+        Test the snapshots of every worker are summed, and the gauges of
+        exited workers are left out.
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.registry.configure({"METRICS_DIR": directory})
+        in_flight = self.registry.gauge("t_in_flight", "In flight")
+        self.requests.inc("/a", amount=3)
+        in_flight.inc()
+
+        # Snapshot left by a worker that has exited
+        dead_pid = 2 ** 22 + 1
+        with open(os.path.join(directory, f"metrics-{dead_pid}-0ld.json"), "w") as f:
+            json.dump({
+                "t_requests_total": {"kind": "counter", "description": "Requests",
+                                     "samples": {'t_requests_total{route="/a"}': 4}},
+                "t_in_flight": {"kind": "gauge", "description": "In flight",
+                                "samples": {"t_in_flight": 7}},
+            }, f)
+
+        families = self.registry.collect()
+        self.assertEqual(families["t_requests_total"]["samples"],
+                         {'t_requests_total{route="/a"}': 7})
+        self.assertEqual(families["t_in_flight"]["samples"], {"t_in_flight": 1})
+
+    def test_reused_pid_keeps_the_exited_counters(self):
+        """
+        Test a worker that gets the pid of an exited one does not replace
+        its snapshot: the totals do not go down.
+        """
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.registry.configure({"METRICS_DIR": directory})
+        in_flight = self.registry.gauge("t_in_flight", "In flight")
+        self.requests.inc("/a", amount=5)
+        in_flight.inc()
+        self.registry.flush()
+
+        # A recycled worker starts from zero under the same pid
+        self.registry.reset()
+        self.requests.inc("/a")
+        families = self.registry.collect()
+        self.assertEqual(families["t_requests_total"]["samples"],
+                         {'t_requests_total{route="/a"}': 6})
+        self.assertEqual(families["t_in_flight"]["samples"], {})
+        self.assertEqual(len(os.listdir(directory)), 2)
+
+    def test_hit_ratio(self):
+        """
+        Test the hit ratio is derived from the summed hit and miss counters.
+        """
+        families = add_hit_ratios({
+            "hbnb_cache_hits_total": {"kind": "counter", "description": "",
+                                      "samples": {'hbnb_cache_hits_total{cache="entity"}': 3}},
+            "hbnb_cache_misses_total": {"kind": "counter", "description": "",
+                                        "samples": {'hbnb_cache_misses_total{cache="entity"}': 1}},
+        })
+        self.assertEqual(families["hbnb_cache_hit_ratio"]["samples"],
+                         {'hbnb_cache_hit_ratio{cache="entity"}': 0.75})
+
+
+class MetricsEndpointTestCase(unittest.TestCase):
+    """
+    This test case verifies the /metrics endpoint of the app.
+    """
+
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+        User.existing_emails.clear()
+        registry.reset()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
+
+    def test_metrics_endpoint(self):
+        """
+        Test per-route requests, latency, pool, cache and bcrypt metrics.
+        """
+        db.session.add(User(first_name="M", last_name="T", email="m@t.io", password="pw"))
+        db.session.commit()
+        self.client.post("/api/v1/auth/login", json={"email": "m@t.io", "password": "pw"})
+        self.client.get("/api/v1/places/")
+
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.content_type.startswith("text/plain"))
+        text = response.get_data(as_text=True)
+        self.assertIn('hbnb_http_requests_total{method="GET",route="/api/v1/places/",'
+                      'status="200"} 1', text)
+        self.assertIn('hbnb_http_request_duration_seconds_count{method="POST",'
+                      'route="/api/v1/auth/login"} 1', text)
+        self.assertIn("hbnb_http_requests_in_flight 1", text)
+        self.assertIn("hbnb_db_pool_checkout_seconds_count", text)
+        self.assertIn("hbnb_password_verify_seconds_count 1", text)
+        self.assertIn('hbnb_cache_hit_ratio{cache="entity"}', text)
+
+if __name__ == "__main__":
+    unittest.main()
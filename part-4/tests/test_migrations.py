@@ -0,0 +1,130 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from app import create_app, db
+from app.persistence import geo, migrations
+
+# Schema of databases created before the indexes and the place aggregates
+LEGACY_SCHEMA = """
+CREATE TABLE users (first_name VARCHAR(50) NOT NULL, last_name VARCHAR(50) NOT NULL,
+    email VARCHAR(120) NOT NULL, password VARCHAR(128) NOT NULL, is_admin BOOLEAN,
+    id VARCHAR(36) NOT NULL, created_at DATETIME, updated_at DATETIME,
+    PRIMARY KEY (id), UNIQUE (email));
+CREATE TABLE places (title VARCHAR(100) NOT NULL, description VARCHAR(500),
+    price FLOAT NOT NULL, latitude FLOAT NOT NULL, longitude FLOAT NOT NULL,
+    owner_id VARCHAR NOT NULL, id VARCHAR(36) NOT NULL, created_at DATETIME,
+    updated_at DATETIME, PRIMARY KEY (id), FOREIGN KEY(owner_id) REFERENCES users (id));
+CREATE TABLE amenities (name VARCHAR(50) NOT NULL, owner_id VARCHAR(36),
+    id VARCHAR(36) NOT NULL, created_at DATETIME, updated_at DATETIME,
+    PRIMARY KEY (id), FOREIGN KEY(owner_id) REFERENCES users (id));
+CREATE TABLE place_amenity (place_id VARCHAR(36) NOT NULL, amenity_id VARCHAR(36) NOT NULL,
+    PRIMARY KEY (place_id, amenity_id));
+CREATE TABLE reviews (text VARCHAR(500) NOT NULL, rating INTEGER NOT NULL,
+    user_id INTEGER NOT NULL, place_id INTEGER NOT NULL, id VARCHAR(36) NOT NULL,
+    created_at DATETIME, updated_at DATETIME, PRIMARY KEY (id));
+INSERT INTO users VALUES ('A', 'B', 'a@b.io', 'x', 0, 'u1', NULL, NULL);
+INSERT INTO places VALUES ('Flat', NULL, 50, 48.85, 2.35, 'u1', 'p1', NULL, NULL);
+INSERT INTO reviews VALUES ('Nice', 4, 'u1', 'p1', 'r1', NULL, NULL);
+INSERT INTO reviews VALUES ('Good', 5, 'u1', 'p1', 'r2', NULL, NULL);
+"""
+
+HOT_LOOKUPS = [
+    "SELECT * FROM reviews WHERE place_id = 'p1'",
+    "SELECT * FROM reviews WHERE user_id = 'u1'",
+    "SELECT * FROM places WHERE owner_id = 'u1'",
+    "SELECT * FROM amenities WHERE owner_id = 'u1'",
+    "SELECT * FROM place_amenity WHERE amenity_id = 'a1'",
+    "SELECT * FROM users WHERE email = 'a@b.io'",
+]
+
+# Reviews joined to their author / place, the joined side must be a SEARCH
+REVIEW_JOINS = [
+    "SELECT * FROM reviews JOIN users ON users.id = reviews.user_id "
+    "WHERE reviews.place_id = 'p1'",
+    "SELECT * FROM reviews JOIN places ON places.id = reviews.place_id "
+    "WHERE reviews.user_id = 'u1'",
+]
+
+
+class TestMigrations(unittest.TestCase):
+    """
+    This test case verifies the schema migration runner on a legacy
+    database and the query plans of the hot lookups afterwards.
+    """
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        with sqlite3.connect(self.path) as conn:
+            conn.executescript(LEGACY_SCHEMA)
+
+        class LegacyConfig:
+            TESTING = True
+            SECRET_KEY = "test"
+            SQLALCHEMY_DATABASE_URI = f"sqlite:///{self.path}"
+
+        self.app = create_app(LegacyConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+
+    def tearDown(self):
+        db.session.remove()
+        db.engine.dispose()
+        self.app_context.pop()
+        os.remove(self.path)
+
+    def _plan(self, sql):
+        rows = db.session.execute(db.text(f"EXPLAIN QUERY PLAN {sql}")).all()
+        return " / ".join(row[-1] for row in rows)
+
+    def test_upgrade_legacy_database(self):
+        """
+        Test the migration adds the missing columns with their data and
+        runs only once.
+        """
+        self.assertIn("SCAN", self._plan(HOT_LOOKUPS[0]))
+
+        self.assertEqual(migrations.upgrade(), [1, 2])
+        self.assertEqual(migrations.upgrade(), [])
+        self.assertIsNotNone(migrations.status()[0][2])
+
+        row = db.session.execute(db.text(
+            "SELECT geohash, review_count, rating_sum FROM places")).one()
+        self.assertEqual(tuple(row), (geo.encode(48.85, 2.35), 2, 9))
+
+    def test_hot_lookups_use_indexes(self):
+        """
+        Test every foreign key and lookup column is searched through an index.
+        """
+        migrations.upgrade()
+        for sql in HOT_LOOKUPS:
+            plan = self._plan(sql)
+            self.assertRegex(plan, r"SEARCH \w+ USING (COVERING )?INDEX", sql)
+            self.assertNotIn("SCAN", plan, sql)
+
+    def test_review_foreign_keys_are_strings(self):
+        """
+        Test the review foreign keys become VARCHAR(36) with their data
+        and indexes, so joins to users and places use the primary keys.
+        """
+        self.assertIn("SCAN users", self._plan(REVIEW_JOINS[0]))
+        db.session.remove()
+
+        migrations.upgrade()
+        columns = {c['name']: str(c['type'])
+                   for c in db.inspect(db.engine).get_columns('reviews')}
+        self.assertEqual(columns['user_id'], 'VARCHAR(36)')
+        self.assertEqual(columns['place_id'], 'VARCHAR(36)')
+        rows = db.session.execute(db.text(
+            "SELECT id, text, rating, user_id, place_id FROM reviews ORDER BY id")).all()
+        self.assertEqual([tuple(r) for r in rows],
+                         [('r1', 'Nice', 4, 'u1', 'p1'), ('r2', 'Good', 5, 'u1', 'p1')])
+
+        for sql in REVIEW_JOINS:
+            plan = self._plan(sql)
+            self.assertNotIn("SCAN", plan, sql)
+            self.assertRegex(plan, r"SEARCH (users|places) USING INDEX sqlite_autoindex", sql)
+
+if __name__ == "__main__":
+    unittest.main()
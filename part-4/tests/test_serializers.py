@@ -0,0 +1,60 @@
+import unittest
+from types import SimpleNamespace
+from app.services.serializers import Serializer, place_serializer, review_serializer
+
+
+class TestSerializer(unittest.TestCase):
+    """
+    This test case verifies the shared serializers and sparse fieldsets.
+    """
+
+    def setUp(self):
+        self.serializer = Serializer({
+            'id': 'id',
+            'name': 'name',
+            'owner_name': 'owner.name',
+            'upper': lambda obj: obj.name.upper(),
+        })
+        self.obj = SimpleNamespace(id="1", name="pool",
+                                   owner=SimpleNamespace(name="ann"))
+
+    def test_dump_all_fields(self):
+        self.assertEqual(self.serializer.dump(self.obj), {
+            "id": "1", "name": "pool", "owner_name": "ann", "upper": "POOL"})
+        self.assertIsNone(self.serializer.dump(None))
+
+    def test_sparse_fieldset_keeps_declaration_order(self):
+        data = self.serializer.dump(self.obj, ["upper", "id"])
+        self.assertEqual(list(data), ["id", "upper"])
+        self.assertEqual(self.serializer.dump_many([self.obj], ["name"]),
+                         [{"name": "pool"}])
+
+    def test_project_cached_dict(self):
+        full = self.serializer.dump(self.obj)
+        self.assertEqual(self.serializer.project(full, ["id"]), {"id": "1"})
+        self.assertIs(self.serializer.project(full), full)
+
+    def test_parse_fields(self):
+        self.assertIsNone(place_serializer.parse_fields(None))
+        self.assertEqual(place_serializer.parse_fields("id, title,,price"),
+                         ["id", "title", "price"])
+        with self.assertRaises(ValueError):
+            place_serializer.parse_fields("id,password")
+        for value in ("", ",", " , "):
+            with self.assertRaises(ValueError):
+                place_serializer.parse_fields(value)
+        with self.assertRaises(ValueError):
+            review_serializer.parse_fields("", "")
+
+    def test_parse_include(self):
+        fields = place_serializer.parse_fields(None, "owner")
+        self.assertIn("title", fields)
+        self.assertIn("owner", fields)
+        self.assertNotIn("amenities", fields)
+        self.assertEqual(review_serializer.parse_fields("id", "user"), ["id", "user"])
+        self.assertFalse(review_serializer.covers(["id", "user"]))
+        with self.assertRaises(ValueError):
+            review_serializer.parse_fields(None, "text")
+
+if __name__ == "__main__":
+    unittest.main()
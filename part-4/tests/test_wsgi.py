@@ -0,0 +1,85 @@
+import importlib
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+from app import db
+from app.persistence import migrations
+from config import ProductionConfig, TestConfig
+
+
+class WsgiConfig(TestConfig):
+    SQLALCHEMY_DATABASE_URI = None  # set in setUp
+    CORS_ORIGINS = ["https://hbnb.example"]
+
+
+class WsgiTestCase(unittest.TestCase):
+    """
+    This test case verifies the production entry point leaves the schema
+    to prepare_database() and hands clean pools to forked workers.
+    """
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        WsgiConfig.SQLALCHEMY_DATABASE_URI = f"sqlite:///{self.path}"
+        sys.modules.pop("wsgi", None)
+        with mock.patch.dict(os.environ, {"HBNB_CONFIG": "tests.test_wsgi.WsgiConfig"}):
+            self.wsgi = importlib.import_module("wsgi")
+
+    def tearDown(self):
+        self.wsgi.shutdown()
+        sys.modules.pop("wsgi", None)
+        os.remove(self.path)
+
+    def test_import_does_not_touch_the_database(self):
+        """
+        Test importing wsgi creates no table, prepare_database() does.
+        """
+        self.assertEqual(os.path.getsize(self.path), 0)
+
+        self.wsgi.prepare_database()
+        with self.wsgi.app.app_context():
+            self.assertIn("places", db.inspect(db.engine).get_table_names())
+            self.assertTrue(all(applied for _, _, applied in migrations.status()))
+
+    def test_reset_after_fork_replaces_the_pool(self):
+        """
+        Test a worker gets a new, empty pool and can still query.
+        """
+        self.wsgi.prepare_database()
+        with self.wsgi.app.app_context():
+            pool = db.engine.pool
+            self.wsgi.reset_after_fork()
+            self.assertIsNot(db.engine.pool, pool)
+            self.assertEqual(self.wsgi.app.test_client().get("/api/v1/places/").status_code, 200)
+
+    def test_cors_allows_the_configured_origins(self):
+        """
+        Test the production app answers browsers of the configured front-end only.
+        """
+        self.wsgi.prepare_database()
+        client = self.wsgi.app.test_client()
+        response = client.get("/api/v1/places/", headers={"Origin": "https://hbnb.example"})
+        self.assertEqual(response.headers["Access-Control-Allow-Origin"],
+                         "https://hbnb.example")
+        self.assertIn("X-Query-Count", response.headers["Access-Control-Expose-Headers"])
+
+        response = client.get("/api/v1/places/", headers={"Origin": "https://evil.example"})
+        self.assertNotIn("Access-Control-Allow-Origin", response.headers)
+
+    def test_refuses_to_start_without_secret_keys(self):
+        """
+        Test the production config has no default secret key to sign tokens with.
+        """
+        sys.modules.pop("wsgi", None)
+        with mock.patch.object(ProductionConfig, "SECRET_KEY", None), \
+                mock.patch.object(ProductionConfig, "JWT_SECRET_KEY", None), \
+                mock.patch.dict(os.environ, {"HBNB_CONFIG": "production"}):
+            with self.assertRaisesRegex(RuntimeError, "Set SECRET_KEY"):
+                importlib.import_module("wsgi")
+        sys.modules["wsgi"] = self.wsgi
+
+if __name__ == "__main__":
+    unittest.main()
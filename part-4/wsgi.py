@@ -0,0 +1,55 @@
+"""
+Production WSGI entry point:
+
+    gunicorn wsgi:app
+
+with the server settings of gunicorn.conf.py. HBNB_CONFIG selects the
+configuration ('production' by default, DATABASE_URL sets its database,
+SECRET_KEY and optionally JWT_SECRET_KEY its keys: there is no default;
+CORS_ORIGINS the front-end origins allowed to call the API).
+
+Importing this module does not touch the database. prepare_database()
+brings the schema up to date once, from the gunicorn master before the
+workers are forked (or run `flask db-upgrade` beforehand).
+"""
+import os
+
+from app import create_app, db
+from app.persistence import migrations
+
+app = create_app(os.getenv('HBNB_CONFIG', 'production'))
+
+# Tokens signed with a public default key could be forged by anyone;
+# JWTs are signed with JWT_SECRET_KEY, or SECRET_KEY when it is unset
+if not app.config.get('SECRET_KEY'):
+    raise RuntimeError("Set SECRET_KEY (and optionally JWT_SECRET_KEY) in the "
+                       "environment before starting the server.")
+
+
+def _dispose_engines(close=True):
+    with app.app_context():
+        for engine in db.engines.values():
+            engine.dispose(close=close)
+
+
+def prepare_database():
+    """Create the missing tables and run the pending migrations."""
+    with app.app_context():
+        migrations.upgrade()
+    # Workers must not inherit the connections opened here
+    _dispose_engines()
+
+
+def reset_after_fork():
+    """
+    Forget the pooled connections copied from the parent process,
+    without closing them under the parent's feet.
+    """
+    _dispose_engines(close=False)
+
+
+def shutdown():
+    """Close this worker's connections and write its last metrics."""
+    from app.services.metrics import registry
+    _dispose_engines()
+    registry.flush()